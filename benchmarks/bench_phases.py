@@ -0,0 +1,130 @@
+import gzip
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from core.eclat import frequent_itemsets, get_tidlists, hierarchy_rule, iter_rules, rule_batches
+from core.RuleSet import RuleSet
+from core.Taxonomy import Taxonomy
+from core.VerticalData import VerticalData
+from utils.data_io import load_dataframe, load_mapped, load_vertical
+from utils.rule_writer import RuleWriter
+from utils.synthetic import quest_transactions, random_taxonomy, write_transactions
+
+
+# name: (parameters of quest_transactions, min_sup as a fraction of transactions)
+DATASETS = {
+    'sparse': (dict(n_transactions=20000, n_items=1000, avg_len=10), 0.01),
+    'dense': (dict(n_transactions=2000, n_items=100, density=0.2), 0.02),
+}
+
+
+@pytest.fixture(scope='module', params=list(DATASETS))
+def dataset(request, tmp_path_factory):
+    params, relative_sup = DATASETS[request.param]
+    transactions = quest_transactions(**params, seed=0)
+    filepath = str(tmp_path_factory.mktemp('data') / f'{request.param}.txt')
+    write_transactions(transactions, filepath)
+    data = VerticalData.from_transactions(transactions)
+    return filepath, data, int(relative_sup * len(transactions))
+
+
+@pytest.fixture(scope='module')
+def frequent(dataset):
+    _, data, min_sup = dataset
+    return frequent_itemsets(data, min_sup, search='dfs')
+
+
+@pytest.mark.benchmark(group='load')
+@pytest.mark.parametrize('loader', ['pandas', 'stream', 'mmap'])
+def test_load(benchmark, dataset, loader):
+    filepath, _, min_sup = dataset
+    if loader == 'pandas':
+        benchmark(load_dataframe, filepath)
+    elif loader == 'stream':
+        benchmark(load_vertical, filepath, min_sup)
+    else:
+        # the binary file is built once, rounds measure mapping it
+        load_mapped(filepath)
+        benchmark(load_mapped, filepath, min_sup)
+
+
+@pytest.mark.benchmark(group='load')
+@pytest.mark.parametrize('input_format', ['txt.gz', 'csv'])
+def test_load_format(benchmark, dataset, tmp_path, input_format):
+    filepath, data, min_sup = dataset
+    if input_format == 'csv':
+        pytest.importorskip('pyarrow')
+        path = tmp_path / 'orders.csv'
+        path.write_text('transaction_id,item\n' + ''.join(f'{tid},{item}\n' for item, tids in data.tidlists.items()
+                                                          for tid in tids))
+        benchmark(load_vertical, str(path), min_sup, 'csv')
+    else:
+        path = tmp_path / 'transactions.txt.gz'
+        with gzip.open(path, 'wb') as f, open(filepath, 'rb') as src:
+            f.write(src.read())
+        benchmark(load_vertical, str(path), min_sup)
+
+
+@pytest.mark.benchmark(group='tidlists')
+@pytest.mark.parametrize('tidlist', ['set', 'bitset', 'array'])
+def test_tidlists(benchmark, dataset, tidlist):
+    _, data, min_sup = dataset
+    benchmark(get_tidlists, data, min_sup, tidlist)
+
+
+@pytest.mark.benchmark(group='mining')
+@pytest.mark.parametrize('search, tidlist, diffset', [
+    ('bfs', 'set', 'off'),
+    ('dfs', 'set', 'off'),
+    ('dfs', 'bitset', 'off'),
+    ('dfs', 'array', 'off'),
+    ('dfs', 'set', 'auto'),
+])
+def test_mining(benchmark, dataset, search, tidlist, diffset):
+    _, data, min_sup = dataset
+    benchmark(frequent_itemsets, data, min_sup, search, tidlist, diffset)
+
+
+@pytest.mark.benchmark(group='pruning')
+@pytest.mark.parametrize('tidlist', ['set', 'bitset', 'array'])
+@pytest.mark.parametrize('pair_counts', [False, True])
+def test_pair_counts(benchmark, dataset, tidlist, pair_counts):
+    _, data, min_sup = dataset
+    benchmark(frequent_itemsets, data, min_sup, 'dfs', tidlist, pair_counts=pair_counts)
+
+
+@pytest.mark.benchmark(group='rules')
+def test_rule_gen(benchmark, frequent):
+    benchmark(lambda: RuleSet(iter_rules(*frequent, min_conf=0.5, min_len=1)))
+
+
+@pytest.mark.benchmark(group='rules')
+@pytest.mark.parametrize('min_measures', [{}, {'lift': 1.5}])
+def test_rule_batches(benchmark, dataset, frequent, min_measures):
+    _, data, _ = dataset
+    benchmark(lambda: RuleSet.concat(rule_batches(*frequent, min_conf=0.5, min_len=1, n_transactions=len(data),
+                                                  min_measures=min_measures)))
+
+
+@pytest.mark.benchmark(group='hierarchy')
+@pytest.mark.parametrize('depth', [1, 3])
+def test_hierarchy(benchmark, dataset, frequent, depth):
+    _, data, _ = dataset
+    taxonomy = Taxonomy.from_dataframe(random_taxonomy(data.items(), fanout=5, depth=depth))
+    itemsets, sup_dict = frequent
+    # a fresh ancestor cache every round, so ancestors are looked up in the taxonomy as in a single run
+    benchmark(lambda: hierarchy_rule(itemsets, taxonomy.parents, sup_dict, {}))
+
+
+@pytest.mark.benchmark(group='save')
+@pytest.mark.parametrize('output_format', ['csv', 'csv.gz'])
+def test_save(benchmark, frequent, tmp_path, output_format):
+    rules = RuleSet(iter_rules(*frequent, min_conf=0.5, min_len=1))
+    filepath = str(tmp_path / f'rules.{output_format}')
+
+    def save():
+        with RuleWriter(filepath, output_format) as writer:
+            return writer.write(rules)
+
+    assert benchmark(save) == len(rules)
@@ -1,4 +1,6 @@
 class AssociationRule:
+    __slots__ = ('_pred', '_suc', '_sup', '_conf')
+
     def __init__(self, pred: tuple, suc: tuple, sup: int, conf: float):
         self._pred = pred
         self._suc = suc
@@ -11,7 +13,7 @@ class AssociationRule:
         return NotImplemented
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash((self._pred, self._suc))
 
     def __str__(self):
         p = set(self._pred)
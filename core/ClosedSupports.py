@@ -0,0 +1,49 @@
+from collections.abc import Mapping
+from typing import Iterator
+
+
+CACHE_SIZE = 65536
+
+
+class ClosedSupports(Mapping):
+    """
+    Supports of all frequent itemsets derived on demand from the closed ones.
+
+    The support of a frequent itemset is the largest support of a closed itemset that contains it,
+    an itemset contained in no closed itemset is not frequent. Iteration and len cover the closed itemsets only.
+    """
+    def __init__(self, closed: dict):
+        self.closed = closed
+        self._sups = list(closed.values())
+        self._index = {}
+        for i, itemset in enumerate(closed):
+            for item in itemset:
+                self._index.setdefault(item, set()).add(i)
+        self._cache = {}
+
+    def __getitem__(self, itemset: tuple) -> int:
+        sup = self.closed.get(itemset)
+        if sup is None:
+            sup = self._cache.get(itemset)
+        if sup is None:
+            sup = self._derive(itemset)
+        if sup == 0:
+            raise KeyError(itemset)
+        return sup
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.closed)
+
+    def __len__(self):
+        return len(self.closed)
+
+    def _derive(self, itemset: tuple) -> int:
+        if len(itemset) == 0 or any(item not in self._index for item in itemset):
+            return 0
+        indices = sorted((self._index[item] for item in itemset), key=len)
+        supersets = indices[0].intersection(*indices[1:])
+        sup = max((self._sups[i] for i in supersets), default=0)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[itemset] = sup
+        return sup
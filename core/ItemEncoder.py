@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from collections import Counter
+from typing import Union
+
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+from core.VerticalData import VerticalData
+
+
+class ItemEncoder:
+    """
+    Re-encoding of frequent items to dense ids 0..n-1 in ascending order of their support.
+
+    Mining extends prefixes in the order of ids, so the least frequent items start the largest
+    equivalence classes and the smallest tidlists are intersected the most often.
+    Original ids are restored only for output.
+    """
+    def __init__(self, items: np.ndarray):
+        self.items = np.asarray(items, dtype=np.int64)
+        self._ids = self.items.tolist()
+        self.codes = {item: code for code, item in enumerate(self._ids)}
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def fit(cls, transactions: Union[pd.DataFrame, VerticalData], min_sup: int) -> 'ItemEncoder':
+        """
+        Encoder of items of transactions with support greater than min_sup.
+        """
+        if isinstance(transactions, VerticalData):
+            supports = {item: transactions.support(item) for item in transactions.items()}
+        else:
+            stacked = transactions.stack().dropna()
+            pairs = pd.DataFrame({'tid': stacked.index.get_level_values(0),
+                                  'item': stacked.values.astype(np.int64)}).drop_duplicates()
+            supports = pairs['item'].value_counts().to_dict()
+        items = [item for item, sup in supports.items() if sup > min_sup]
+        items.sort(key=lambda item: (supports[item], item))
+        return cls(np.array(items, dtype=np.int64))
+
+    def encode(self, transactions: Union[pd.DataFrame, VerticalData]) -> Union[pd.DataFrame, VerticalData]:
+        """
+        Transactions of the same type with items replaced by their codes and infrequent items dropped.
+        """
+        if isinstance(transactions, VerticalData):
+            tidlists = {code: transactions.tidlists[item] for item, code in self.codes.items()}
+            return VerticalData(tidlists, transactions.n_transactions)
+        encoded = transactions.stack().dropna().map(self.codes).dropna().astype(np.int64)
+        return encoded.unstack()
+
+    def decode(self, itemset: tuple) -> tuple:
+        return tuple(sorted(self._ids[code] for code in itemset))
+
+    def decode_rule(self, rule: AssociationRule) -> AssociationRule:
+        return AssociationRule(self.decode(rule._pred), self.decode(rule._suc), rule._sup, rule._conf)
+
+    def decode_rules(self, rules: RuleSet) -> RuleSet:
+        pred_items = _decode_segments(self.items, rules.pred_items, rules.pred_offsets)
+        suc_items = _decode_segments(self.items, rules.suc_items, rules.suc_offsets)
+        decoded = RuleSet.from_arrays(pred_items, rules.pred_offsets.copy(), suc_items, rules.suc_offsets.copy(),
+                                      rules.support.copy(), rules.confidence.copy())
+        decoded.set_measures(rules.measures)
+        return decoded
+
+    def decode_frequent(self, frequent: list[list[tuple]], sup_dict: dict, max_len: int) -> \
+            tuple[list[list[tuple]], dict]:
+        """
+        Frequent itemsets of length up to max_len and supports of them and of their items with original ids.
+        """
+        decoded_frequent = [[self.decode(itemset) for itemset in row] for row in frequent[:max_len]]
+        decoded_sup = {}
+        for row in frequent[:max_len]:
+            for itemset in row:
+                decoded_sup.update({self.decode(itemset): sup_dict[itemset]})
+                decoded_sup.update({(self._ids[code],): sup_dict[(code,)] for code in itemset})
+        return decoded_frequent, decoded_sup
+
+    def candidates(self, sup_dict: dict) -> tuple[int, int]:
+        """
+        Number of tidlist intersections of mining with the encoded and with the original order of items.
+
+        Each frequent itemset is a member of the equivalence class of its prefix in a given order
+        and a class of m members costs m(m-1)/2 intersections, so both counts follow from sup_dict.
+        """
+        encoded_classes = Counter()
+        original_classes = Counter()
+        for itemset in sup_dict:
+            encoded = tuple(sorted(itemset))
+            encoded_classes[encoded[:-1]] += 1
+            original = tuple(sorted(itemset, key=self._ids.__getitem__))
+            original_classes[original[:-1]] += 1
+        return _class_cost(encoded_classes), _class_cost(original_classes)
+
+
+def _class_cost(classes: Counter) -> int:
+    return sum(m*(m-1) // 2 for m in classes.values())
+
+
+def _decode_segments(items: np.ndarray, codes: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Decode codes and sort them within each segment codes[offsets[i]:offsets[i+1]].
+    """
+    decoded = items[codes]
+    segments = np.repeat(np.arange(len(offsets)-1), np.diff(offsets))
+    return decoded[np.lexsort((decoded, segments))]
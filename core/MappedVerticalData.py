@@ -0,0 +1,108 @@
+import numpy as np
+from collections import Counter
+from collections.abc import Mapping
+from typing import Callable, Iterable, Iterator
+
+from core.VerticalData import VerticalData
+
+
+MAGIC = b'ECLATVDB'
+HEADER_SIZE = len(MAGIC) + 3*8
+BUFFER_SIZE = 1 << 20
+
+
+class MappedVerticalData(VerticalData):
+    """
+    Vertical data stored in a binary file and read through numpy.memmap.
+
+    The file holds a header (magic, number of transactions, number of items, number of tids),
+    item ids (int64), offsets (int64) and ascending tids of all items (uint32), where tids of the i-th item
+    are tids[offsets[i]:offsets[i+1]]. Tidlists are zero-copy views of the file, so the OS page cache
+    decides what stays in memory.
+    """
+    def __init__(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'File "{filepath}" is not a vertical database.')
+        n_transactions, n_items, n_tids = np.frombuffer(header[len(MAGIC):], dtype=np.int64).tolist()
+        items = np.memmap(filepath, dtype=np.int64, mode='r', offset=HEADER_SIZE, shape=(n_items,))
+        offsets = np.memmap(filepath, dtype=np.int64, mode='r', offset=HEADER_SIZE + 8*n_items, shape=(n_items+1,))
+        tids = np.memmap(filepath, dtype=np.uint32, mode='r', offset=HEADER_SIZE + 8*(2*n_items+1),
+                         shape=(n_tids,)) if n_tids > 0 else np.empty(0, dtype=np.uint32)
+        super().__init__(_MappedTidlists(items, offsets, tids), n_transactions)
+        self.filepath = filepath
+
+    def support(self, item: int) -> int:
+        return self.tidlists.support(item)
+
+    @staticmethod
+    def write(transactions: Callable[[], Iterable[Iterable[int]]], filepath: str) -> None:
+        """
+        Build the binary file in two passes over transactions, without keeping tidlists in memory.
+
+        :param transactions: Function returning a new iterator over the same transactions for every pass.
+        :param filepath: Path of the binary file.
+        """
+        supports = Counter()
+        n_transactions = 0
+        for transaction in transactions():
+            supports.update(set(transaction))
+            n_transactions += 1
+        items = np.array(sorted(supports), dtype=np.int64)
+        offsets = np.zeros(len(items)+1, dtype=np.int64)
+        np.cumsum([supports[item] for item in items.tolist()], out=offsets[1:])
+        n_tids = int(offsets[-1])
+        with open(filepath, 'wb') as f:
+            f.write(MAGIC)
+            f.write(np.array([n_transactions, len(items), n_tids], dtype=np.int64).tobytes())
+            f.write(items.tobytes())
+            f.write(offsets.tobytes())
+            f.truncate(HEADER_SIZE + 8*(2*len(items)+1) + 4*n_tids)
+        if n_tids == 0:
+            return
+
+        tids = np.memmap(filepath, dtype=np.uint32, mode='r+', offset=HEADER_SIZE + 8*(2*len(items)+1),
+                         shape=(n_tids,))
+        index = {item: i for i, item in enumerate(items.tolist())}
+        cursors = offsets[:-1].copy()
+        buffer = {}
+        buffered = 0
+        for tid, transaction in enumerate(transactions()):
+            for item in set(transaction):
+                buffer.setdefault(index[item], []).append(tid)
+            buffered += len(transaction)
+            if buffered >= BUFFER_SIZE:
+                _flush(tids, cursors, buffer)
+                buffered = 0
+        _flush(tids, cursors, buffer)
+        tids.flush()
+        del tids
+
+
+class _MappedTidlists(Mapping):
+    def __init__(self, items: np.ndarray, offsets: np.ndarray, tids: np.ndarray):
+        self._offsets = offsets
+        self._tids = tids
+        self._index = {item: i for i, item in enumerate(items.tolist())}
+
+    def __getitem__(self, item: int) -> np.ndarray:
+        i = self._index[item]
+        return self._tids[self._offsets[i]:self._offsets[i+1]]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def support(self, item: int) -> int:
+        i = self._index[item]
+        return int(self._offsets[i+1] - self._offsets[i])
+
+
+def _flush(tids: np.memmap, cursors: np.ndarray, buffer: dict) -> None:
+    for i, item_tids in buffer.items():
+        tids[cursors[i]:cursors[i]+len(item_tids)] = item_tids
+        cursors[i] += len(item_tids)
+    buffer.clear()
@@ -0,0 +1,101 @@
+import os
+import pickle
+import hashlib
+import tempfile
+from typing import Optional
+
+
+DEFAULT_MAX_SIZE = 2**30
+CHUNK_SIZE = 2**20
+
+
+class MiningCache:
+    """
+    On-disk cache of frequent itemsets of a dataset for different min_sup, evicted least recently used first.
+
+    Entries are files <fingerprint>_<min_sup>.pkl in directory, their modification time is refreshed
+    on every hit and the oldest ones are removed once the directory exceeds max_size bytes.
+    Itemsets for min_sup are also served from an entry with lower min_sup by dropping less frequent itemsets.
+    """
+    def __init__(self, directory: str, fingerprint: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def for_file(cls, directory: str, filepath: str, max_size: int = DEFAULT_MAX_SIZE) -> 'MiningCache':
+        """
+        Cache of the dataset in filepath, keyed by a hash of its content.
+        """
+        return cls(directory, file_fingerprint(filepath), max_size)
+
+    def contains(self, min_sup: int) -> bool:
+        return any(sup <= min_sup for sup in self._entries())
+
+    def get(self, min_sup: int) -> Optional[tuple[list[list[tuple]], dict]]:
+        """
+        Frequent itemsets and their supports for min_sup or None if no entry with min_sup or lower is cached.
+        """
+        cached = [sup for sup in self._entries() if sup <= min_sup]
+        if len(cached) == 0:
+            return None
+        entry_sup = max(cached)
+        filepath = self._path(entry_sup)
+        with open(filepath, 'rb') as f:
+            frequent, sup_dict = pickle.load(f)
+        os.utime(filepath)
+        if entry_sup == min_sup:
+            return frequent, sup_dict
+        return filter_itemsets(frequent, sup_dict, min_sup)
+
+    def put(self, min_sup: int, frequent: list[list[tuple]], sup_dict: dict) -> None:
+        """
+        Write the entry to a temporary file in directory, which is renamed to its final path only once complete,
+        so that an interrupted or concurrent run never leaves a truncated entry.
+        """
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((frequent, sup_dict), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(min_sup))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _entries(self) -> list[int]:
+        prefix = self.fingerprint + '_'
+        return [int(name[len(prefix):-len('.pkl')]) for name in os.listdir(self.directory)
+                if name.startswith(prefix) and name.endswith('.pkl')]
+
+    def _path(self, min_sup: int) -> str:
+        return os.path.join(self.directory, f'{self.fingerprint}_{min_sup}.pkl')
+
+    def _evict(self) -> None:
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.pkl')]
+        stats = sorted(((os.path.getmtime(path), os.path.getsize(path), path) for path in paths), reverse=True)
+        total = 0
+        for _, size, path in stats:
+            total += size
+            if total > self.max_size:
+                os.remove(path)
+
+
+def file_fingerprint(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def filter_itemsets(frequent: list[list[tuple]], sup_dict: dict, min_sup: int) -> tuple[list[list[tuple]], dict]:
+    """
+    Keep only itemsets with support greater than min_sup.
+    """
+    sup_dict = {itemset: sup for itemset, sup in sup_dict.items() if sup > min_sup}
+    frequent = [[itemset for itemset in row if itemset in sup_dict] for row in frequent]
+    while frequent and len(frequent[-1]) == 0:
+        frequent.pop()
+    return frequent, sup_dict
@@ -0,0 +1,122 @@
+import sys
+import time
+import logging
+from typing import Callable, Iterable, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+logger = logging.getLogger('eclat')
+
+
+class MiningMonitor:
+    """
+    Observer of an eclat run, which collects statistics of its phases and of the levels of the search.
+
+    A phase record has keys phase, elapsed (sec.), peak_rss (bytes, None where unknown) and counts
+    specific to the phase, e.g. n_itemsets. A level record has keys phase, length (of mined itemsets),
+    candidates, pruned, bounded, intersections, aborted, avg_tidlist_length, elapsed and peak_rss, see LevelStats.
+    Records are kept in phases and levels, passed to every callback as they are made and logged
+    to the 'eclat' logger - phase messages at INFO, records at DEBUG level.
+    """
+    def __init__(self, callbacks: Iterable[Callable[[dict], None]] = ()):
+        self.callbacks = list(callbacks)
+        self.phases = []
+        self.levels = []
+
+    def phase(self, name: str, start_time: float, message: str, **counts) -> float:
+        """
+        Record a phase started at start_time which has just finished.
+
+        :param name: Name of the phase, e.g. 'mining'.
+        :param start_time: Value of time.time() when the phase started.
+        :param message: Summary of the phase logged with its elapsed time.
+        :param counts: Counts describing the result of the phase.
+        :return: End time of the phase, the start time of the next one.
+        """
+        end_time = time.time()
+        record = dict(phase=name, elapsed=end_time-start_time, peak_rss=peak_rss(), **counts)
+        self.phases.append(record)
+        logger.info(f'\n{message}\nCompleted in {record["elapsed"]:.4f} sec.')
+        self._notify(record)
+        return end_time
+
+    def level(self, name: str, stats: 'LevelStats') -> None:
+        """
+        Record statistics of all levels mined in phase name.
+        """
+        for record in stats.records():
+            record = dict(phase=name, **record)
+            self.levels.append(record)
+            self._notify(record)
+
+    def _notify(self, record: dict) -> None:
+        logger.debug(record)
+        for callback in self.callbacks:
+            callback(record)
+
+
+class LevelStats:
+    """
+    Counters of the search for frequent itemsets by their length.
+
+    For itemsets of a length: candidates - pairs of class members that could be joined,
+    pruned - candidates that did not give a frequent itemset, excluded pairs included,
+    bounded - candidates pruned by a support upper bound without an intersection,
+    intersections - tidlist intersections or differences computed, aborted - intersections given up early
+    once the itemset could no longer be frequent, avg_tidlist_length - average length of the resulting tidlists
+    or diffsets of the intersections that were not given up, elapsed - time spent joining, peak_rss - peak RSS
+    of the process when the length was first reached (of a worker process in parallel mining),
+    sampled once per length rather than on every update.
+    """
+    def __init__(self):
+        self.counters = {}
+
+    def add(self, length: int, candidates: int, intersections: int, n_frequent: int, tidlist_length: int,
+            elapsed: float, bounded: int = 0, aborted: int = 0) -> None:
+        counters = self.counters.get(length)
+        if counters is None:
+            counters = self.counters[length] = [0, 0, 0, 0, 0.0, 0, 0, peak_rss()]
+        counters[0] += candidates
+        counters[1] += intersections
+        counters[2] += n_frequent
+        counters[3] += tidlist_length
+        counters[4] += elapsed
+        counters[5] += bounded
+        counters[6] += aborted
+
+    def merge(self, other: 'LevelStats') -> None:
+        for length, counters in other.counters.items():
+            own = self.counters.setdefault(length, [0, 0, 0, 0, 0.0, 0, 0, None])
+            for j in range(7):
+                own[j] += counters[j]
+            own[7] = _max(own[7], counters[7])
+
+    def records(self) -> list[dict]:
+        records = []
+        for length in sorted(self.counters):
+            candidates, intersections, n_frequent, tidlist_length, elapsed, bounded, aborted, rss = \
+                self.counters[length]
+            completed = intersections - aborted
+            records.append(dict(length=length, candidates=candidates, pruned=candidates-n_frequent,
+                                bounded=bounded, intersections=intersections, aborted=aborted,
+                                avg_tidlist_length=tidlist_length/completed if completed else 0.0,
+                                elapsed=elapsed, peak_rss=rss))
+        return records
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Peak resident set size of the process in bytes or None if it is unknown on the platform.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _max(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return b if a is None else a if b is None else max(a, b)
@@ -0,0 +1,125 @@
+import pickle
+import numpy as np
+from array import array
+from typing import Iterable
+
+from core.VerticalData import VerticalData
+
+
+class MiningState:
+    """
+    Frequent itemsets of a growing dataset that can be updated with new transactions without mining it again.
+
+    Besides the vertical data of all items and the supports of frequent itemsets, the state keeps the supports
+    of the negative border - infrequent itemsets whose all subsets are frequent. Supports only grow when
+    transactions are appended, so an itemset can become frequent only if it is in the border or if one of
+    its subsets has just become frequent (FUP). Only supersets of newly frequent itemsets are counted
+    on the whole history, all other supports are updated from the new transactions alone.
+
+    An append still visits every frequent and border itemset once and save pickles the tidlists
+    of the whole history, so both grow with the state, not only with the appended batch.
+    """
+    def __init__(self, data: VerticalData, min_sup: int, sup_dict: dict, border: dict = None):
+        self.data = data
+        self.min_sup = min_sup
+        self.sup_dict = sup_dict
+        self.border = border
+        if border is None:
+            self.border = {(item,): data.support(item) for item in data.items() if data.support(item) <= min_sup}
+            self._expand(sup_dict)
+
+    def __len__(self):
+        return self.data.n_transactions
+
+    def frequent(self) -> list[list[tuple]]:
+        """
+        Frequent itemsets sorted by their length, as returned by frequent_itemsets.
+        """
+        frequent = []
+        for itemset in sorted(self.sup_dict, key=lambda itemset: (len(itemset), itemset)):
+            if len(frequent) < len(itemset):
+                frequent.append([])
+            frequent[-1].append(itemset)
+        return frequent
+
+    def append(self, transactions: Iterable[Iterable[int]]) -> int:
+        """
+        Add transactions to the state and update frequent itemsets.
+
+        :param transactions: New transactions, each an iterable of item ids.
+        :return: Number of itemsets that became frequent.
+        """
+        delta = VerticalData.from_transactions(transactions)
+        offset = self.data.n_transactions
+        delta_tids = {}
+        for item, tids in delta.tidlists.items():
+            delta_tids[item] = set(tids)
+            shifted = array('I', (tid + offset for tid in tids))
+            if item in self.data.tidlists:
+                self.data.tidlists[item].extend(shifted)
+            else:
+                self.data.tidlists[item] = shifted
+                self.border[(item,)] = 0
+        self.data.n_transactions += delta.n_transactions
+
+        for sups in (self.sup_dict, self.border):
+            for itemset in sups:
+                if all(item in delta_tids for item in itemset):
+                    parts = sorted((delta_tids[item] for item in itemset), key=len)
+                    sups[itemset] += len(parts[0].intersection(*parts[1:]))
+
+        promoted = {itemset: sup for itemset, sup in self.border.items() if sup > self.min_sup}
+        for itemset in promoted:
+            del self.border[itemset]
+        self.sup_dict.update(promoted)
+        return len(promoted) + self._expand(promoted)
+
+    def save(self, filepath: str) -> None:
+        with open(filepath, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'MiningState':
+        with open(filepath, 'rb') as f:
+            return pickle.load(f)
+
+    def _expand(self, new_itemsets: Iterable[tuple]) -> int:
+        """
+        Count supersets of newly frequent itemsets level by level and sort them into frequent ones and the border.
+
+        A candidate is an itemset one item longer than a new itemset, all of whose subsets are frequent.
+
+        :return: Number of frequent itemsets found.
+        """
+        levels = {}
+        for itemset in new_itemsets:
+            levels.setdefault(len(itemset), []).append(itemset)
+        items = [itemset[0] for itemset in self.sup_dict if len(itemset) == 1]
+        n_found = 0
+        length = min(levels, default=0)
+        while length in levels or any(k > length for k in levels):
+            for itemset in levels.pop(length, []):
+                for item in items:
+                    if item in itemset:
+                        continue
+                    candidate = tuple(sorted(itemset + (item,)))
+                    if candidate in self.sup_dict or candidate in self.border:
+                        continue
+                    if not all(candidate[:i] + candidate[i+1:] in self.sup_dict for i in range(len(candidate))):
+                        continue
+                    sup = self._support(candidate)
+                    if sup > self.min_sup:
+                        self.sup_dict[candidate] = sup
+                        levels.setdefault(length+1, []).append(candidate)
+                        n_found += 1
+                    else:
+                        self.border[candidate] = sup
+            length += 1
+        return n_found
+
+    def _support(self, itemset: tuple) -> int:
+        parts = sorted((np.asarray(self.data.tidlists[item]) for item in itemset), key=len)
+        tids = parts[0]
+        for part in parts[1:]:
+            tids = np.intersect1d(tids, part, assume_unique=True)
+        return len(tids)
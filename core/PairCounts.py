@@ -0,0 +1,94 @@
+import numpy as np
+from array import array
+from typing import Optional, Sequence
+
+
+MAX_PAIRS = 2**24
+CHUNK_PAIRS = 2**20
+CHUNK_TIDS = 2**18
+
+
+class PairCounts:
+    """
+    Supports of all 2-itemsets of frequent items in a triangular matrix, counted in one horizontal pass.
+
+    The pair of item ranks a < b out of k items is stored at a(2k-a-1)/2 + b-a-1 of a flat array
+    of k(k-1)/2 counts. The support of a pair XY bounds the support of every itemset containing both X and Y,
+    so a candidate PXY with sup(XY) not greater than min_sup is pruned without an intersection.
+    Counts are kept in an array.array, which is cheaper than numpy to index one pair at a time.
+    """
+    def __init__(self, items: Sequence[int], counts: np.ndarray):
+        self.ranks = {item: rank for rank, item in enumerate(items)}
+        self.n_items = len(items)
+        self.counts = array('q', counts.astype(np.int64).tobytes())
+
+    def __getitem__(self, pair: tuple[int, int]) -> int:
+        a, b = self.ranks[pair[0]], self.ranks[pair[1]]
+        if a > b:
+            a, b = b, a
+        return self.counts[a * (2*self.n_items - a - 1) // 2 + b - a - 1]
+
+    def supports(self, item: int, others: Sequence[int]) -> list[int]:
+        """
+        Supports of pairs of item with each of others.
+        """
+        a = self.ranks[item]
+        n = 2*self.n_items - 1
+        row_start = a * (n - a) // 2 - a - 1
+        counts, ranks = self.counts, self.ranks
+        supports = []
+        for other in others:
+            b = ranks[other]
+            supports.append(counts[row_start + b] if b > a else counts[b * (n - b) // 2 + a - b - 1])
+        return supports
+
+    @classmethod
+    def from_tidlists(cls, tid_dict: dict, backend, max_pairs: int = MAX_PAIRS) -> Optional['PairCounts']:
+        """
+        Count supports of pairs of the 1-itemsets of tid_dict.
+
+        Tidlists are read as arrays, zero-copy for the array backend including memory-mapped data,
+        and counted in ranges of transaction ids of about CHUNK_TIDS tids of all items, so memory does not grow
+        with the size of the data. Within a range tidlists are inverted to transactions of item ranks,
+        which are grouped by their length, so pairs of all transactions of a length are counted with one bincount.
+
+        :param tid_dict: Dictionary {(item,): tidlist} of frequent items.
+        :param backend: Tidlist representation from core.tidlist.
+        :param max_pairs: Pairs are not counted if there are more of them, None is returned then.
+        """
+        items = [itemset[0] for itemset in tid_dict]
+        k = len(items)
+        n_pairs = k * (k-1) // 2
+        if k < 2 or n_pairs > max_pairs:
+            return None
+        tidlists = [backend.to_array(tidlist) for tidlist in tid_dict.values()]
+        n_tids = sum(len(tids) for tids in tidlists)
+        n_transactions = max(int(tids[-1]) for tids in tidlists if len(tids) > 0) + 1
+        step = max(1, n_transactions * CHUNK_TIDS // n_tids)
+        ends = np.zeros(k, dtype=np.int64)
+        counts = np.zeros(n_pairs, dtype=np.int64)
+        for high in range(step, n_transactions + step, step):
+            starts = ends
+            ends = np.array([np.searchsorted(tids, high) for tids in tidlists], dtype=np.int64)
+            ranks = np.repeat(np.arange(k, dtype=np.int64), ends - starts)
+            tids = np.concatenate([tids[start:end] for tids, start, end in zip(tidlists, starts, ends)])
+            cls._count_range(tids.astype(np.int64), ranks, k, counts)
+        return cls(items, counts)
+
+    @staticmethod
+    def _count_range(tids: np.ndarray, ranks: np.ndarray, k: int, counts: np.ndarray) -> None:
+        """
+        Add pairs of item ranks of the transactions of (tid, rank) entries to counts.
+        """
+        order = np.argsort(tids, kind='stable')
+        tids, ranks = tids[order], ranks[order]
+        starts = np.flatnonzero(np.r_[True, tids[1:] != tids[:-1]]) if len(tids) > 0 else np.empty(0, np.int64)
+        lengths = np.diff(np.r_[starts, len(tids)])
+        for length in np.unique(lengths[lengths > 1]).tolist():
+            first, second = np.triu_indices(length, 1)
+            length_starts = starts[lengths == length]
+            chunk = max(1, CHUNK_PAIRS // len(first))
+            for i in range(0, len(length_starts), chunk):
+                rows = ranks[length_starts[i:i+chunk, None] + np.arange(length)]
+                a, b = rows[:, first].ravel(), rows[:, second].ravel()
+                counts += np.bincount(a * (2*k - a - 1) // 2 + b - a - 1, minlength=len(counts))
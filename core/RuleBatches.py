@@ -0,0 +1,30 @@
+from typing import Iterable, Iterator
+
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+
+
+class RuleBatches:
+    """
+    Lazy stream of rules generated in columnar batches.
+
+    Iterating gives AssociationRule objects one by one, while writers take whole RuleSet batches
+    with batches(), including their interestingness measures. Either way the stream is consumed once.
+    """
+    def __init__(self, batches: Iterable[RuleSet], measures: tuple = ()):
+        self.measures = measures
+        self._batches = iter(batches)
+        self._current = iter(())
+
+    def __iter__(self) -> Iterator[AssociationRule]:
+        return self
+
+    def __next__(self) -> AssociationRule:
+        while True:
+            rule = next(self._current, None)
+            if rule is not None:
+                return rule
+            self._current = iter(next(self._batches))
+
+    def batches(self) -> Iterator[RuleSet]:
+        return self._batches
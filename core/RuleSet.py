@@ -0,0 +1,295 @@
+import numpy as np
+from typing import Iterable, Iterator
+
+from core.AssociationRule import AssociationRule
+
+
+CSV_COLUMNS = ('predecessor', 'successor', 'support', 'confidence')
+CSV_HEADER = ';'.join(CSV_COLUMNS) + '\n'
+PENDING_SIZE = 65536
+
+
+class RuleSet:
+    """
+    Columnar container of association rules.
+
+    Items of predecessors and successors of all rules are stored in flat integer arrays,
+    rule i spans items[offsets[i]:offsets[i+1]]. Supports and confidences are stored in
+    separate arrays. Rules are materialised as AssociationRule views only when accessed.
+    Interestingness measures, see core.measures, are optional float columns in measures,
+    rules appended without them get NaN.
+    """
+    def __init__(self, rules: Iterable[AssociationRule] = ()):
+        self._size = 0
+        self._pred_items = np.empty(16, dtype=np.int64)
+        self._pred_offsets = np.zeros(17, dtype=np.int64)
+        self._suc_items = np.empty(16, dtype=np.int64)
+        self._suc_offsets = np.zeros(17, dtype=np.int64)
+        self._support = np.empty(16, dtype=np.int64)
+        self._confidence = np.empty(16, dtype=np.float64)
+        self._measures = {}
+        self._pending = _Pending()
+        self.extend(rules)
+
+    @classmethod
+    def from_arrays(cls, pred_items: np.ndarray, pred_offsets: np.ndarray, suc_items: np.ndarray,
+                    suc_offsets: np.ndarray, support: np.ndarray, confidence: np.ndarray) -> 'RuleSet':
+        rules = cls()
+        rules._size = len(support)
+        rules._pred_items = np.asarray(pred_items, dtype=np.int64)
+        rules._pred_offsets = np.asarray(pred_offsets, dtype=np.int64)
+        rules._suc_items = np.asarray(suc_items, dtype=np.int64)
+        rules._suc_offsets = np.asarray(suc_offsets, dtype=np.int64)
+        rules._support = np.asarray(support, dtype=np.int64)
+        rules._confidence = np.asarray(confidence, dtype=np.float64)
+        return rules
+
+    @classmethod
+    def concat(cls, rule_sets: Iterable['RuleSet']) -> 'RuleSet':
+        """
+        New RuleSet with rules of all rule_sets in order, each array is concatenated once.
+        """
+        rule_sets = [rules for rules in rule_sets if len(rules) > 0]
+        if len(rule_sets) == 0:
+            return cls()
+        names = []
+        for rules in rule_sets:
+            names.extend(name for name in rules.measures if name not in names)
+        pred_offsets = _concat_offsets([rules.pred_offsets for rules in rule_sets])
+        suc_offsets = _concat_offsets([rules.suc_offsets for rules in rule_sets])
+        concatenated = cls.from_arrays(np.concatenate([rules.pred_items for rules in rule_sets]), pred_offsets,
+                                       np.concatenate([rules.suc_items for rules in rule_sets]), suc_offsets,
+                                       np.concatenate([rules.support for rules in rule_sets]),
+                                       np.concatenate([rules.confidence for rules in rule_sets]))
+        concatenated._measures = {name: np.concatenate([rules.measures.get(name, np.full(len(rules), np.nan))
+                                                        for rules in rule_sets])
+                                  for name in names}
+        return concatenated
+
+    def __len__(self):
+        return self._size + len(self._pending.support)
+
+    def __iter__(self) -> Iterator[AssociationRule]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> AssociationRule:
+        self._flush()
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError('RuleSet index out of range')
+        return AssociationRule(self.pred(i), self.suc(i), int(self._support[i]), float(self._confidence[i]))
+
+    def pred(self, i: int) -> tuple:
+        self._flush()
+        return tuple(self._pred_items[self._pred_offsets[i]:self._pred_offsets[i+1]].tolist())
+
+    def suc(self, i: int) -> tuple:
+        self._flush()
+        return tuple(self._suc_items[self._suc_offsets[i]:self._suc_offsets[i+1]].tolist())
+
+    @property
+    def pred_items(self) -> np.ndarray:
+        self._flush()
+        return self._pred_items[:self._pred_offsets[self._size]]
+
+    @property
+    def pred_offsets(self) -> np.ndarray:
+        self._flush()
+        return self._pred_offsets[:self._size+1]
+
+    @property
+    def suc_items(self) -> np.ndarray:
+        self._flush()
+        return self._suc_items[:self._suc_offsets[self._size]]
+
+    @property
+    def suc_offsets(self) -> np.ndarray:
+        self._flush()
+        return self._suc_offsets[:self._size+1]
+
+    @property
+    def support(self) -> np.ndarray:
+        self._flush()
+        return self._support[:self._size]
+
+    @property
+    def confidence(self) -> np.ndarray:
+        self._flush()
+        return self._confidence[:self._size]
+
+    @property
+    def measures(self) -> dict[str, np.ndarray]:
+        self._flush()
+        return self._measures
+
+    def set_measures(self, measures: dict[str, np.ndarray]) -> None:
+        self._flush()
+        for name, values in measures.items():
+            if len(values) != self._size:
+                raise ValueError(f'Measure {name} should have {self._size} values but {len(values)} were passed.')
+        self._measures = {name: np.asarray(values, dtype=np.float64) for name, values in measures.items()}
+
+    def select_measures(self, names: tuple) -> 'RuleSet':
+        """
+        The same rules with exactly the measures in names, missing ones are NaN.
+        """
+        self._flush()
+        rules = RuleSet.from_arrays(self.pred_items, self.pred_offsets, self.suc_items, self.suc_offsets,
+                                    self.support, self.confidence)
+        rules._measures = {name: self._measures.get(name, np.full(self._size, np.nan)) for name in names}
+        return rules
+
+    def append(self, pred: tuple, suc: tuple, sup: int, conf: float) -> None:
+        pending = self._pending
+        pending.pred_items.extend(pred)
+        pending.pred_lengths.append(len(pred))
+        pending.suc_items.extend(suc)
+        pending.suc_lengths.append(len(suc))
+        pending.support.append(sup)
+        pending.confidence.append(conf)
+        if len(pending.support) == PENDING_SIZE:
+            self._flush()
+
+    def add(self, rule: AssociationRule) -> None:
+        self.append(rule._pred, rule._suc, rule._sup, rule._conf)
+
+    def extend(self, rules: Iterable[AssociationRule]) -> None:
+        if isinstance(rules, RuleSet):
+            rules = rules.take(np.arange(len(rules)))
+            self._concat(rules)
+            return
+        for rule in rules:
+            self.add(rule)
+
+    def take(self, indices: np.ndarray) -> 'RuleSet':
+        """
+        New RuleSet with rules at indices, in the order of indices.
+        """
+        self._flush()
+        indices = np.asarray(indices, dtype=np.int64)
+        pred_items, pred_offsets = _gather(self._pred_items, self._pred_offsets, indices)
+        suc_items, suc_offsets = _gather(self._suc_items, self._suc_offsets, indices)
+        rules = RuleSet.from_arrays(pred_items, pred_offsets, suc_items, suc_offsets,
+                                    self.support[indices], self.confidence[indices])
+        rules._measures = {name: values[indices] for name, values in self._measures.items()}
+        return rules
+
+    def filter(self, mask: np.ndarray) -> 'RuleSet':
+        """
+        New RuleSet with rules for which mask is True, e.g. rules.filter(rules.confidence > 0.8).
+        """
+        return self.take(np.flatnonzero(mask))
+
+    def sort_by_confidence(self, descending: bool = True) -> 'RuleSet':
+        order = np.argsort(-self.confidence if descending else self.confidence, kind='stable')
+        return self.take(order)
+
+    def to_csv(self, filepath: str) -> None:
+        with open(filepath, 'w') as f:
+            f.write(csv_header(self.measures))
+            f.writelines(self.csv_lines())
+
+    def csv_lines(self) -> Iterator[str]:
+        pred_items = list(map(str, self.pred_items.tolist()))
+        suc_items = list(map(str, self.suc_items.tolist()))
+        pred_offsets = self.pred_offsets.tolist()
+        suc_offsets = self.suc_offsets.tolist()
+        support = self.support.tolist()
+        confidence = self.confidence.tolist()
+        measures = [values.tolist() for values in self._measures.values()]
+        for i in range(self._size):
+            pred = ','.join(pred_items[pred_offsets[i]:pred_offsets[i+1]])
+            suc = ','.join(suc_items[suc_offsets[i]:suc_offsets[i+1]])
+            line = '%s;%s;%d;%.4f' % (pred, suc, support[i], confidence[i])
+            for values in measures:
+                line += ';%.4f' % values[i]
+            yield line + '\n'
+
+    def _concat(self, other: 'RuleSet') -> None:
+        self._flush()
+        n = self._size
+        pred_end = self._pred_offsets[n]
+        suc_end = self._suc_offsets[n]
+        self._pred_items = np.concatenate([self._pred_items[:pred_end], other._pred_items])
+        self._suc_items = np.concatenate([self._suc_items[:suc_end], other._suc_items])
+        self._pred_offsets = np.concatenate([self._pred_offsets[:n], other._pred_offsets + pred_end])
+        self._suc_offsets = np.concatenate([self._suc_offsets[:n], other._suc_offsets + suc_end])
+        self._support = np.concatenate([self._support[:n], other._support])
+        self._confidence = np.concatenate([self._confidence[:n], other._confidence])
+        names = list(self._measures) + [name for name in other._measures if name not in self._measures]
+        self._measures = {name: np.concatenate([self._measures.get(name, np.full(n, np.nan)),
+                                                other._measures.get(name, np.full(len(other), np.nan))])
+                          for name in names}
+        self._size = n + len(other)
+
+    def _flush(self) -> None:
+        """
+        Move rules appended since the last flush from Python lists to the arrays.
+        """
+        pending = self._pending
+        m = len(pending.support)
+        if m == 0:
+            return
+        n = self._size
+        if n + m > len(self._support):
+            capacity = max(2*len(self._support), n + m)
+            self._support = _grow(self._support, capacity)
+            self._confidence = _grow(self._confidence, capacity)
+            self._pred_offsets = _grow(self._pred_offsets, capacity + 1)
+            self._suc_offsets = _grow(self._suc_offsets, capacity + 1)
+        self._support[n:n+m] = pending.support
+        self._confidence[n:n+m] = pending.confidence
+        self._pred_items = _put(self._pred_items, self._pred_offsets, n, pending.pred_items, pending.pred_lengths)
+        self._suc_items = _put(self._suc_items, self._suc_offsets, n, pending.suc_items, pending.suc_lengths)
+        self._measures = {name: np.concatenate([values, np.full(m, np.nan)]) for name, values in self._measures.items()}
+        self._size = n + m
+        self._pending = _Pending()
+
+
+def csv_header(measures: Iterable[str] = ()) -> str:
+    return ';'.join(CSV_COLUMNS + tuple(measures)) + '\n'
+
+
+class _Pending:
+    __slots__ = ('pred_items', 'pred_lengths', 'suc_items', 'suc_lengths', 'support', 'confidence')
+
+    def __init__(self):
+        self.pred_items = []
+        self.pred_lengths = []
+        self.suc_items = []
+        self.suc_lengths = []
+        self.support = []
+        self.confidence = []
+
+
+def _grow(values: np.ndarray, size: int) -> np.ndarray:
+    grown = np.zeros(size, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+def _put(items: np.ndarray, offsets: np.ndarray, n: int, new_items: list, lengths: list) -> np.ndarray:
+    start = offsets[n]
+    end = start + len(new_items)
+    if end > len(items):
+        items = _grow(items, max(2*len(items), end))
+    items[start:end] = new_items
+    np.cumsum(lengths, out=offsets[n+1:n+1+len(lengths)])
+    offsets[n+1:n+1+len(lengths)] += start
+    return items
+
+
+def _concat_offsets(offsets: list[np.ndarray]) -> np.ndarray:
+    ends = np.cumsum([0] + [values[-1] for values in offsets[:-1]])
+    return np.concatenate([np.zeros(1, dtype=np.int64)] + [values[1:] + end for values, end in zip(offsets, ends)])
+
+
+def _gather(items: np.ndarray, offsets: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    starts = offsets[indices]
+    lengths = offsets[indices+1] - starts
+    new_offsets = np.zeros(len(indices)+1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    positions = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return items[positions], new_offsets
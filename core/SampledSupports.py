@@ -0,0 +1,53 @@
+import math
+from statistics import NormalDist
+from collections.abc import Mapping
+from typing import Iterator
+
+
+class SampledSupports(Mapping):
+    """
+    Supports of itemsets estimated from a uniform random sample of transactions.
+
+    The estimate of an itemset is its support in the sample scaled to all transactions.
+    interval gives a Wilson score interval of the support at the given confidence level, with a finite
+    population correction, clipped to the values possible given the sample: at least the support in the sample
+    and at most all transactions but the sampled ones without the itemset.
+    """
+    def __init__(self, sample_sups: dict, sample_size: int, n_transactions: int, confidence: float = 0.95):
+        if not 0.0 < confidence < 1.0:
+            raise ValueError(f'Parameter confidence should be in (0, 1) but {confidence} was passed.')
+        self.sample_sups = sample_sups
+        self.sample_size = sample_size
+        self.n_transactions = n_transactions
+        self.confidence = confidence
+        self._z = NormalDist().inv_cdf(1.0 - (1.0-confidence) / 2)
+        self._fpc = math.sqrt((n_transactions-sample_size) / (n_transactions-1)) if n_transactions > 1 else 0.0
+
+    def __getitem__(self, itemset: tuple) -> int:
+        return round(self.sample_sups[itemset] * self.n_transactions / self.sample_size)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.sample_sups)
+
+    def __len__(self):
+        return len(self.sample_sups)
+
+    def drop_infrequent(self, min_sup: int) -> None:
+        """
+        Drop itemsets whose estimated support is not greater than min_sup.
+        """
+        self.sample_sups = {itemset: sup for itemset, sup in self.sample_sups.items() if self[itemset] > min_sup}
+
+    def interval(self, itemset: tuple) -> tuple[int, int]:
+        """
+        Lower and upper bound of the support of itemset in all transactions.
+        """
+        sup = self.sample_sups[itemset]
+        n, z = self.sample_size, self._z
+        p = sup / n
+        center = (p + z*z / (2*n)) / (1 + z*z / n)
+        half_width = z / (1 + z*z / n) * math.sqrt(p*(1-p) / n + z*z / (4*n*n)) * self._fpc
+        estimate = self[itemset]
+        low = max(sup, min(estimate, math.floor((center-half_width) * self.n_transactions)))
+        high = min(self.n_transactions - (n-sup), max(estimate, math.ceil((center+half_width) * self.n_transactions)))
+        return low, high
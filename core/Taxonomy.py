@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from core.VerticalData import VerticalData
+
+
+class Taxonomy:
+    """
+    Hierarchy of items with the ancestors of every item precomputed once.
+    """
+    def __init__(self, parents: dict):
+        self.parents = parents
+        self.ancestor_dict = {}
+        for item in parents:
+            self._closure(item)
+
+    @classmethod
+    def from_dataframe(cls, taxonomy: pd.DataFrame) -> 'Taxonomy':
+        """
+        Taxonomy from a DataFrame with columns child and parent.
+        """
+        return cls(taxonomy.set_index('child')['parent'].to_dict())
+
+    def ancestors(self, item: int) -> set:
+        return self.ancestor_dict.get(item, set())
+
+    def generalize(self, data: VerticalData) -> VerticalData:
+        """
+        Extend data with ancestors of its items (Cumulate).
+
+        A transaction contains an ancestor if it contains any of its descendants,
+        so the tidlist of an ancestor is the union of tidlists of its descendants in data.
+        """
+        descendants = {}
+        for item in data.items():
+            for ancestor in self.ancestors(item):
+                descendants.setdefault(ancestor, []).append(data.tidlists[item])
+        tidlists = dict(data.tidlists)
+        for ancestor, parts in descendants.items():
+            if ancestor in tidlists:
+                parts.append(tidlists[ancestor])
+            tidlists[ancestor] = np.unique(np.concatenate(parts)).astype(np.uint32)
+        return VerticalData(tidlists, data.n_transactions)
+
+    def excluded_pairs(self, items) -> frozenset:
+        """
+        Pairs (item, ancestor) and (ancestor, item) of items, which never form a useful itemset together,
+        since an itemset with both has the same support as the one without the ancestor.
+        """
+        items = set(items)
+        pairs = set()
+        for item in items:
+            for ancestor in self.ancestors(item) & items:
+                pairs.add((item, ancestor))
+                pairs.add((ancestor, item))
+        return frozenset(pairs)
+
+    def _closure(self, item: int) -> set:
+        """
+        Walk up from item to the first ancestor with known closure and fill in the closures on the way down.
+        """
+        chain = []
+        while item in self.parents and item not in self.ancestor_dict:
+            chain.append(item)
+            item = self.parents[item]
+        ancestors = self.ancestor_dict.get(item, set())
+        for child in reversed(chain):
+            ancestors = ancestors | {self.parents[child]}
+            self.ancestor_dict[child] = ancestors
+        return ancestors
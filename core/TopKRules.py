@@ -0,0 +1,62 @@
+import math
+import heapq
+
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+
+
+RANK_BY = ('confidence', 'support')
+
+
+class TopKRules:
+    """
+    Bounded heap of the k best rules ranked by confidence or support, ties broken by the other measure
+    and then by the order in which rules were offered.
+
+    Once the heap is full, min_sup (rank_by='support') or min_conf (rank_by='confidence') is raised
+    to the level of the worst kept rule, so that the miner can prune everything that could not replace it.
+    Only the support threshold prunes mining of itemsets, confidence prunes rule generation only.
+    """
+    def __init__(self, k: int, rank_by: str = 'support', min_sup: int = 0, min_conf: float = 0.0):
+        if k < 1:
+            raise ValueError(f'Parameter top_k should be positive but {k} was passed.')
+        if rank_by not in RANK_BY:
+            raise ValueError(f'Parameter rank_by should be one of {RANK_BY} but "{rank_by}" was passed.')
+        self.k = k
+        self.rank_by = rank_by
+        self.min_sup = min_sup
+        self.min_conf = min_conf
+        self._heap = []
+        self._count = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def offer(self, rule: AssociationRule) -> None:
+        if self.rank_by == 'confidence':
+            key = (rule._conf, rule._sup)
+        else:
+            key = (rule._sup, rule._conf)
+        self._count += 1
+        entry = (key, -self._count, rule)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return
+        if len(self._heap) == self.k:
+            self._raise_threshold()
+
+    def rules(self) -> RuleSet:
+        """
+        Kept rules from the best to the worst.
+        """
+        return RuleSet(rule for _, _, rule in sorted(self._heap, reverse=True))
+
+    def _raise_threshold(self) -> None:
+        worst = self._heap[0][0][0]
+        if self.rank_by == 'support':
+            self.min_sup = max(self.min_sup, worst - 1)
+        else:
+            self.min_conf = max(self.min_conf, math.nextafter(worst, -math.inf))
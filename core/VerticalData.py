@@ -0,0 +1,103 @@
+import numpy as np
+from array import array
+from typing import Sequence
+
+
+class VerticalData:
+    """
+    Transactions in vertical format - for every item the ascending ids of transactions that contain it.
+    """
+    def __init__(self, tidlists: dict, n_transactions: int):
+        self.tidlists = tidlists
+        self.n_transactions = n_transactions
+
+    def __len__(self):
+        return self.n_transactions
+
+    def items(self) -> list[int]:
+        return sorted(self.tidlists.keys())
+
+    def support(self, item: int) -> int:
+        return len(self.tidlists[item])
+
+    def filter(self, min_sup: int) -> 'VerticalData':
+        """
+        Keep only items with support greater than min_sup.
+        """
+        tidlists = {item: tids for item, tids in self.tidlists.items() if len(tids) > min_sup}
+        return VerticalData(tidlists, self.n_transactions)
+
+    def sample(self, tids: Sequence[int]) -> 'VerticalData':
+        """
+        Keep only transactions with the given ascending ids, renumbered to 0..len(tids)-1.
+        """
+        positions = np.full(self.n_transactions, -1, dtype=np.int64)
+        positions[np.asarray(tids, dtype=np.int64)] = np.arange(len(tids))
+        tidlists = {}
+        for item, item_tids in self.tidlists.items():
+            kept = positions[np.asarray(item_tids, dtype=np.int64)]
+            kept = kept[kept >= 0]
+            if len(kept) > 0:
+                tidlists[item] = array('I', kept.tolist())
+        return VerticalData(tidlists, len(tids))
+
+    @classmethod
+    def from_dataframe(cls, transactions, min_sup: int = None) -> 'VerticalData':
+        """
+        Build vertical data from a DataFrame with one transaction per row, ids of transactions are row positions.
+        """
+        rows = ([int(item) for item in row if item == item] for row in transactions.itertuples(index=False))
+        return cls.from_transactions(rows, min_sup)
+
+    @classmethod
+    def from_pairs(cls, tids: np.ndarray, items: np.ndarray, min_sup: int = None) -> 'VerticalData':
+        """
+        Build vertical data from (transaction id, item) pairs in long format, e.g. order lines, with numpy.
+
+        Transaction ids may be of any sortable type and are renumbered to 0..n-1 in ascending order,
+        repeated pairs are counted once.
+
+        :param tids: Transaction id of every pair.
+        :param items: Integer item id of every pair.
+        :param min_sup: If given, items with support not greater than min_sup are dropped.
+        """
+        items = np.asarray(items)
+        if len(items) > 0 and not np.issubdtype(items.dtype, np.integer):
+            raise ValueError(f'Parameter items should be integer ids but {items.dtype} was passed.')
+        unique_tids, tids = np.unique(np.asarray(tids), return_inverse=True)
+        order = np.lexsort((tids, items))
+        tids, items = tids[order], items[order]
+        repeated = np.zeros(len(items), dtype=bool)
+        repeated[1:] = (items[1:] == items[:-1]) & (tids[1:] == tids[:-1])
+        tids, items = tids[~repeated].astype(np.uint32), items[~repeated]
+        starts = np.flatnonzero(np.r_[True, items[1:] != items[:-1]]) if len(items) > 0 else np.empty(0, np.int64)
+        tidlists = {}
+        for item, item_tids in zip(items[starts].tolist(), np.split(tids, starts[1:])):
+            tidlists[item] = array('I', item_tids.tobytes())
+        data = cls(tidlists, len(unique_tids))
+        if min_sup is not None:
+            data = data.filter(min_sup)
+        return data
+
+    @classmethod
+    def from_transactions(cls, transactions, min_sup: int = None) -> 'VerticalData':
+        """
+        Build vertical data from an iterable of transactions, each an iterable of item ids.
+
+        :param transactions: Transactions in horizontal format, consumed once.
+        :param min_sup: If given, items with support not greater than min_sup are dropped.
+        """
+        tidlists = {}
+        tid = -1
+        for tid, transaction in enumerate(transactions):
+            for item in transaction:
+                tids = tidlists.get(item)
+                if tids is None:
+                    tids = array('I')
+                    tidlists[item] = tids
+                if len(tids) == 0 or tids[-1] != tid:
+                    tids.append(tid)
+        data = cls(tidlists, tid+1)
+        if min_sup is not None:
+            data = data.filter(min_sup)
+        return data
@@ -1,53 +1,168 @@
+import os
+import math
 import time
+import numbers
+import itertools
+import numpy as np
 import pandas as pd
-from itertools import combinations
+from typing import Callable, Iterable, Iterator, Optional, Union
+from collections.abc import Mapping
+from operator import itemgetter
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 from core.AssociationRule import AssociationRule
+from core.ClosedSupports import ClosedSupports
+from core.ItemEncoder import ItemEncoder
+from core.MiningCache import MiningCache
+from core.MiningMonitor import LevelStats, MiningMonitor, logger
+from core.MiningState import MiningState
+from core.PairCounts import PairCounts
+from core.measures import MEASURES, check_thresholds, measure_mask, rule_measures
+from core.RuleBatches import RuleBatches
+from core.RuleSet import RuleSet
+from core.SampledSupports import SampledSupports
+from core.Taxonomy import Taxonomy
+from core.TopKRules import TopKRules
+from core.VerticalData import VerticalData
+from core.tidlist import get_tidlist
+
+
+DIFFSET_MODES = ('off', 'on', 'auto')
+ITEMSET_MODES = ('all', 'closed', 'maximal')
+SAMPLE_CONFIDENCE = 0.95
+RULE_BATCH_SIZE = 65536
+SUBSET_GETTERS = 2**14
 
 
 def get_dummies(transactions: pd.DataFrame) -> pd.DataFrame:
     return pd.get_dummies(transactions.stack()).groupby(level=0).max()
 
 
-def get_tidlists(transactions: pd.DataFrame, min_sup: int) -> tuple[dict, dict]:
+def get_tidlists(transactions: Union[pd.DataFrame, VerticalData], min_sup: int, tidlist: str = 'set') -> \
+        tuple[dict, dict]:
+    backend = get_tidlist(tidlist)
+    if isinstance(transactions, VerticalData):
+        return get_vertical_tidlists(transactions, min_sup, backend)
     dummies = get_dummies(transactions)
     dummies = dummies.loc[:, (dummies.sum(axis=0) > min_sup)]
+    n_transactions = int(dummies.index.max()) + 1 if len(dummies.index) > 0 else 0
     tid_dict = dict()
     sup_dict = dict()
     for item in dummies.columns:
-        tidlist = frozenset(dummies.index[dummies[item] == 1].tolist())
+        tidlist = backend.from_tids(dummies.index[dummies[item] == 1], n_transactions)
         key = (int(item),)
         tid_dict.update({key: tidlist})
-        sup_dict.update({key: len(tidlist)})
+        sup_dict.update({key: backend.support(tidlist)})
     return tid_dict, sup_dict
 
 
-def frequent_itemsets(transactions: pd.DataFrame, min_sup: int) -> tuple[list[list[tuple]], dict]:
-    if min_sup >= len(transactions.index):
+def get_vertical_tidlists(data: VerticalData, min_sup: int, backend) -> tuple[dict, dict]:
+    tid_dict = dict()
+    sup_dict = dict()
+    for item in data.items():
+        if data.support(item) <= min_sup:
+            continue
+        tidlist = backend.from_tids(data.tidlists[item], data.n_transactions)
+        key = (item,)
+        tid_dict.update({key: tidlist})
+        sup_dict.update({key: backend.support(tidlist)})
+    return tid_dict, sup_dict
+
+
+def frequent_itemsets(transactions: Union[pd.DataFrame, VerticalData], min_sup: int, search: str = 'bfs',
+                      tidlist: str = 'set', diffset: str = 'off', n_jobs: int = 1, itemsets: str = 'all',
+                      excluded: frozenset = frozenset(), stats: LevelStats = None, pair_counts: bool = True) -> \
+        tuple[list[list[tuple]], dict]:
+    """
+    Mine all itemsets with support greater than min_sup.
+
+    Candidates are pruned without an intersection when the support of the pair of their last two items,
+    counted once for all pairs, see PairCounts, is not greater than min_sup. Intersections are given up
+    as soon as too few transaction ids are left for the itemset to be frequent, see core.tidlist.
+
+    :param transactions: DataFrame with one transaction per row or transactions in vertical format.
+    :param min_sup: Itemsets with support greater than min_sup are frequent.
+    :param search: 'bfs' mines level by level keeping every tidlist until the end,
+        'dfs' mines prefix equivalence classes depth-first and releases the tidlists
+        of a class as soon as it is done, so memory scales with the depth of the search.
+    :param tidlist: Representation of tidlists - 'set' (frozensets of transaction ids)
+        or 'bitset' (packed bit vectors, intersection is a bitwise AND).
+    :param diffset: 'off', 'on' or 'auto' - store diffsets instead of tidlists (dEclat), only with search='dfs'.
+    :param n_jobs: Number of processes mining 1-item prefix classes in parallel, only with search='dfs'.
+    :param itemsets: 'all' - every frequent itemset, 'closed' - only itemsets without a superset of the same support,
+        mined depth-first with CHARM, 'maximal' - only itemsets without a frequent superset.
+        Closed and maximal itemsets are returned with a ClosedSupports mapping, which derives
+        the support of any frequent itemset from the closed ones.
+    :param excluded: Pairs of items (item1, item2) that are never extended into one itemset,
+        e.g. an item and its ancestor in generalized mining.
+    :param stats: If given, counters of candidates, intersections and tidlist lengths of every level
+        of the search are added to it, except for closed and maximal itemsets.
+    :param pair_counts: Whether to count supports of pairs of items to prune candidates, except for closed
+        and maximal itemsets.
+    :return: List L of lists li of frequent itemsets sorted by their length and dictionary of their supports.
+    """
+    if itemsets not in ITEMSET_MODES:
+        raise ValueError(f'Parameter itemsets should be one of {ITEMSET_MODES} but "{itemsets}" was passed.')
+    if itemsets != 'all' and (diffset != 'off' or n_jobs != 1 or excluded):
+        raise ValueError(f'Itemsets "{itemsets}" are mined with neither diffsets, parallel nor generalized mining.')
+    if search not in ('bfs', 'dfs'):
+        raise ValueError(f'Parameter search should be "bfs" or "dfs" but "{search}" was passed.')
+    if diffset != 'off' and search != 'dfs':
+        raise ValueError(f'Diffsets are mined depth-first only but search="{search}" was passed.')
+    if n_jobs != 1 and search != 'dfs':
+        raise ValueError(f'Parallel mining is depth-first only but search="{search}" was passed.')
+    if n_jobs == 0 or n_jobs < -1:
+        raise ValueError(f'Parameter n_jobs should be positive or -1 but {n_jobs} was passed.')
+    if min_sup >= len(transactions):
         return [], {}
 
-    tid_dict, sup_dict = get_tidlists(transactions, min_sup)
+    backend = get_tidlist(tidlist)
+    tid_dict, sup_dict = get_tidlists(transactions, min_sup, tidlist)
+    if itemsets != 'all':
+        return closed_itemsets(tid_dict, sup_dict, min_sup, tidlist, itemsets == 'maximal')
+    pairs = PairCounts.from_tidlists(tid_dict, backend) if pair_counts else None
+    if search == 'dfs':
+        return depth_first(tid_dict, sup_dict, min_sup, tidlist, diffset, n_jobs, excluded, stats, pairs)
+
     row = list(tid_dict.keys())
     if len(row) == 0:
         return [], {}
 
     frequent = [row]
-    for _ in range(len(row)):
+    for length in range(2, len(row)+2):
         prev_row = row
         row = []
+        n_candidates = n_intersections = tidlist_length = n_bounded = n_aborted = 0
+        start_time = time.perf_counter()
         for i1, itemset1 in enumerate(prev_row):
             tidlist1 = tid_dict[itemset1]
             for i2 in range(i1+1, len(prev_row)):
                 itemset2 = prev_row[i2]
                 if not (itemset1[:-1] == itemset2[:-1] and itemset1[-1] != itemset2[-1]):
                     break
+                n_candidates += 1
+                if excluded and (itemset1[-1], itemset2[-1]) in excluded:
+                    continue
+                if pairs is not None and pairs[itemset1[-1], itemset2[-1]] <= min_sup:
+                    n_bounded += 1
+                    continue
                 tidlist2 = tid_dict[itemset2]
-                tidlist = tidlist1.intersection(tidlist2)
-                if len(tidlist) > min_sup:
+                tidlist = backend.intersect_bounded(tidlist1, tidlist2, min_sup)
+                n_intersections += 1
+                if tidlist is None:
+                    n_aborted += 1
+                    continue
+                sup = backend.support(tidlist)
+                tidlist_length += sup
+                if sup > min_sup:
                     new_itemset = itemset1 + (itemset2[-1],)
                     row.append(new_itemset)
                     tid_dict.update({new_itemset: tidlist})
-                    sup_dict.update({new_itemset: len(tidlist)})
+                    sup_dict.update({new_itemset: sup})
+        if stats is not None and n_candidates > 0:
+            stats.add(length, n_candidates, n_intersections, len(row), tidlist_length,
+                      time.perf_counter() - start_time, n_bounded, n_aborted)
         if len(row) == 0:
             break
         frequent.append(row)
@@ -55,33 +170,678 @@ def frequent_itemsets(transactions: pd.DataFrame, min_sup: int) -> tuple[list[li
     return frequent, sup_dict
 
 
+def depth_first(tid_dict: dict, sup_dict: dict, min_sup: int, tidlist: str = 'set', diffset: str = 'off',
+                n_jobs: int = 1, excluded: frozenset = frozenset(), stats: LevelStats = None,
+                pairs: PairCounts = None) -> tuple[list[list[tuple]], dict]:
+    """
+    Mine frequent itemsets depth-first starting from the equivalence class of 1-itemsets.
+
+    :param tid_dict: Dictionary of tidlists of frequent 1-itemsets in mining order.
+        It is emptied, so that tidlists are released as soon as their class is mined.
+    :param sup_dict: Dictionary of supports of the 1-itemsets, extended in place.
+    :param min_sup: Itemsets with support greater than min_sup are frequent.
+    :param tidlist: Name of the representation of tidlists in tid_dict.
+    :param diffset: 'off' - classes store tidlists, 'on' - classes below the first level store diffsets (dEclat),
+        'auto' - a class switches from tidlists to diffsets when its diffsets are smaller.
+    :param n_jobs: Number of worker processes mining the 1-item prefix classes, -1 uses all CPUs.
+    :param excluded: Pairs of items that are never extended into one itemset.
+    :param stats: Counters of the search by level, updated in place if given.
+    :param pairs: Supports of pairs of the items, which prune candidates if given.
+    :return: The same pair (frequent, sup_dict) as frequent_itemsets with search='bfs'.
+    """
+    if diffset not in DIFFSET_MODES:
+        raise ValueError(f'Parameter diffset should be one of {DIFFSET_MODES} but "{diffset}" was passed.')
+    if len(tid_dict) == 0:
+        return [], {}
+    frequent = [list(tid_dict.keys())]
+    eq_class = [(itemset[-1], tids, sup_dict[itemset]) for itemset, tids in tid_dict.items()]
+    tid_dict.clear()
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    if n_jobs > 1 and len(eq_class) > 1:
+        parallel_class(eq_class, min_sup, frequent, sup_dict, tidlist, diffset, n_jobs, excluded, stats, pairs)
+    else:
+        mine_class((), eq_class, False, min_sup, frequent, sup_dict, get_tidlist(tidlist), diffset, excluded, stats,
+                   pairs)
+    return frequent, sup_dict
+
+
+def mine_class(prefix: tuple, eq_class: list[tuple], is_diff: bool, min_sup: int,
+               frequent: list[list[tuple]], sup_dict: dict, backend, diffset: str,
+               excluded: frozenset = frozenset(), stats: LevelStats = None, pairs: PairCounts = None) -> None:
+    """
+    Mine all frequent extensions of prefix from its equivalence class.
+
+    :param prefix: Itemset shared by all members of the class.
+    :param eq_class: List of triples (item, tidlist or diffset of prefix + item, support) in mining order.
+    :param is_diff: Whether the class stores diffsets d(prefix + item) = t(prefix) - t(prefix + item).
+    :param min_sup: Itemsets with support greater than min_sup are frequent.
+    :param frequent: Frequent itemsets sorted by their length, extended in place.
+    :param sup_dict: Dictionary of supports, extended in place.
+    :param backend: Tidlist representation from core.tidlist.
+    :param diffset: Diffset mode, see depth_first.
+    :param excluded: Pairs of items that are never extended into one itemset.
+    :param stats: Counters of the search by level, updated in place if given.
+    :param pairs: Supports of pairs of items, a candidate whose pair of last items is not frequent is pruned.
+    """
+    for i in range(len(eq_class)):
+        mine_prefix(prefix, eq_class, i, is_diff, min_sup, frequent, sup_dict, backend, diffset, excluded, stats,
+                    pairs)
+        eq_class[i] = None
+
+
+def mine_prefix(prefix: tuple, eq_class: list[tuple], i: int, is_diff: bool, min_sup: int,
+                frequent: list[list[tuple]], sup_dict: dict, backend, diffset: str,
+                excluded: frozenset = frozenset(), stats: LevelStats = None, pairs: PairCounts = None) -> None:
+    """
+    Mine all frequent itemsets that start with prefix + eq_class[i] item.
+
+    With X = eq_class[i] item and Y a later item of the class:
+    t(PXY) = t(PX) & t(PY), d(PXY) = t(PX) - t(PY) = d(PY) - d(PX), sup(PXY) = sup(PX) - |d(PXY)|.
+    sup(PXY) is at most sup(XY), so the supports of pairs of item X with all Y are looked up at once.
+    """
+    item1, tidlist1, sup1 = eq_class[i]
+    itemset1 = prefix + (item1,)
+    to_diff = not is_diff and diffset == 'on'
+    new_class = []
+    n_excluded = n_bounded = n_aborted = tidlist_length = 0
+    start_time = time.perf_counter() if stats is not None else 0.0
+    bounds = None if pairs is None else pairs.supports(item1, [member[0] for member in eq_class[i+1:]])
+    for i2 in range(i+1, len(eq_class)):
+        item2, tidlist2, _ = eq_class[i2]
+        if excluded and (item1, item2) in excluded:
+            n_excluded += 1
+            continue
+        if bounds is not None and bounds[i2-i-1] <= min_sup:
+            n_bounded += 1
+            continue
+        if is_diff:
+            tidlist = backend.difference(tidlist2, tidlist1)
+        elif to_diff:
+            tidlist = backend.difference(tidlist1, tidlist2)
+        else:
+            tidlist = backend.intersect_bounded(tidlist1, tidlist2, min_sup)
+            if tidlist is None:
+                n_aborted += 1
+                continue
+        size = backend.support(tidlist)
+        tidlist_length += size
+        sup = sup1 - size if is_diff or to_diff else size
+        if sup > min_sup:
+            new_itemset = itemset1 + (item2,)
+            new_class.append((item2, tidlist, sup))
+            sup_dict.update({new_itemset: sup})
+            if len(frequent) < len(new_itemset):
+                frequent.append([])
+            frequent[len(new_itemset)-1].append(new_itemset)
+    n_candidates = len(eq_class) - i - 1
+    if stats is not None and n_candidates > 0:
+        stats.add(len(itemset1)+1, n_candidates, n_candidates-n_excluded-n_bounded, len(new_class), tidlist_length,
+                  time.perf_counter() - start_time, n_bounded, n_aborted)
+    if len(new_class) == 0:
+        return
+
+    new_is_diff = is_diff or to_diff
+    if not new_is_diff and diffset == 'auto':
+        diff_size = sum(sup1 - sup for _, _, sup in new_class)
+        tid_size = sum(sup for _, _, sup in new_class)
+        if diff_size < tid_size:
+            new_class = [(item, backend.difference(tidlist1, tidlist), sup) for item, tidlist, sup in new_class]
+            new_is_diff = True
+    mine_class(itemset1, new_class, new_is_diff, min_sup, frequent, sup_dict, backend, diffset, excluded, stats,
+               pairs)
+
+
+def parallel_class(eq_class: list[tuple], min_sup: int, frequent: list[list[tuple]], sup_dict: dict,
+                   tidlist: str, diffset: str, n_jobs: int, excluded: frozenset = frozenset(),
+                   stats: LevelStats = None, pairs: PairCounts = None) -> None:
+    """
+    Mine the 1-item prefix classes of eq_class in a pool of worker processes.
+
+    Classes are submitted from the most to the least expensive, so that idle workers pick up
+    the cheap ones at the end. The cost of a class is estimated by the support of its prefix
+    times the number of items it is intersected with. Results are merged in the order of eq_class,
+    so the output does not depend on the number of workers. Workers count their own stats, which are merged.
+    """
+    costs = [sup * (len(eq_class) - i - 1) for i, (_, _, sup) in enumerate(eq_class)]
+    order = sorted(range(len(eq_class)), key=lambda i: costs[i], reverse=True)
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(eq_class, min_sup, tidlist, diffset, excluded, stats is not None, pairs)) \
+            as executor:
+        futures = {i: executor.submit(_mine_worker_prefix, i) for i in order if costs[i] > 0}
+        for i in range(len(eq_class)):
+            if i not in futures:
+                continue
+            class_frequent, class_sup_dict, class_stats = futures.pop(i).result()
+            for length, itemsets in enumerate(class_frequent[1:], start=1):
+                if len(frequent) <= length:
+                    frequent.append([])
+                frequent[length].extend(itemsets)
+            sup_dict.update(class_sup_dict)
+            if stats is not None:
+                stats.merge(class_stats)
+
+
+_worker_state = {}
+
+
+def _init_worker(eq_class: list[tuple], min_sup: int, tidlist: str, diffset: str, excluded: frozenset,
+                 with_stats: bool, pairs: Optional[PairCounts]) -> None:
+    _worker_state.update(eq_class=eq_class, min_sup=min_sup, backend=get_tidlist(tidlist), diffset=diffset,
+                         excluded=excluded, with_stats=with_stats, pairs=pairs)
+
+
+def _mine_worker_prefix(i: int) -> tuple[list[list[tuple]], dict, Optional[LevelStats]]:
+    frequent = [[]]
+    sup_dict = {}
+    stats = LevelStats() if _worker_state['with_stats'] else None
+    mine_prefix((), _worker_state['eq_class'], i, False, _worker_state['min_sup'], frequent, sup_dict,
+                _worker_state['backend'], _worker_state['diffset'], _worker_state['excluded'], stats,
+                _worker_state['pairs'])
+    return frequent, sup_dict, stats
+
+
+def closed_itemsets(tid_dict: dict, sup_dict: dict, min_sup: int, tidlist: str = 'set', maximal: bool = False) -> \
+        tuple[list[list[tuple]], ClosedSupports]:
+    """
+    Mine closed frequent itemsets with CHARM, optionally keeping only the maximal ones.
+
+    :param tid_dict: Dictionary of tidlists of frequent 1-itemsets, it is emptied.
+    :param sup_dict: Dictionary of supports of the 1-itemsets.
+    :param min_sup: Itemsets with support greater than min_sup are frequent.
+    :param tidlist: Name of the representation of tidlists in tid_dict.
+    :param maximal: Whether to return only closed itemsets that are not contained in another one.
+    :return: Closed (or maximal) itemsets sorted by their length and supports of all closed itemsets.
+    """
+    if len(tid_dict) == 0:
+        return [], ClosedSupports({})
+    eq_class = sorted(((itemset, tids, sup_dict[itemset]) for itemset, tids in tid_dict.items()),
+                      key=itemgetter(2))
+    tid_dict.clear()
+    closed = {}
+    charm_class((), eq_class, min_sup, closed, {}, get_tidlist(tidlist))
+    closed = dict(sorted(closed.items(), key=lambda pair: (len(pair[0]), pair[0])))
+    chosen = maximal_itemsets(closed) if maximal else closed
+    frequent = []
+    for itemset in chosen:
+        if len(frequent) < len(itemset):
+            frequent.extend([] for _ in range(len(itemset) - len(frequent)))
+        frequent[len(itemset)-1].append(itemset)
+    return frequent, ClosedSupports(closed)
+
+
+def charm_class(prefix: tuple, eq_class: list[tuple], min_sup: int, closed: dict, buckets: dict, backend) -> None:
+    """
+    Mine closed itemsets that extend prefix by members of its equivalence class (CHARM-Extend).
+
+    :param prefix: Items shared by all members of the class, not necessarily sorted.
+    :param eq_class: List of triples (items added to prefix, tidlist, support), it is modified in place.
+    :param min_sup: Itemsets with support greater than min_sup are frequent.
+    :param closed: Dictionary of closed itemsets and their supports, extended in place.
+    :param buckets: Closed itemsets grouped by the hash of their tidlists for subsumption checks.
+    :param backend: Tidlist representation from core.tidlist.
+
+    With X = prefix + eq_class[i] items and Y = prefix + later items, t(XY) = t(X) & t(Y) tells which
+    CHARM property holds: if t(X) is a subset of t(Y), Y's items belong to every closed itemset containing X
+    and are added to X, if t(Y) is a subset of t(X), Y is not closed and is only extended below X.
+    """
+    for i in range(len(eq_class)):
+        if eq_class[i] is None:
+            continue
+        items1, tidlist1, sup1 = eq_class[i]
+        new_class = []
+        for i2 in range(i+1, len(eq_class)):
+            if eq_class[i2] is None:
+                continue
+            items2, tidlist2, sup2 = eq_class[i2]
+            tidlist = backend.intersect(tidlist1, tidlist2)
+            sup = backend.support(tidlist)
+            if sup <= min_sup:
+                continue
+            if sup == sup1:
+                items1 += items2
+                if sup == sup2:
+                    eq_class[i2] = None
+            elif sup == sup2:
+                eq_class[i2] = None
+                new_class.append((items2, tidlist, sup))
+            else:
+                new_class.append((items2, tidlist, sup))
+        itemset = prefix + items1
+        if len(new_class) > 0:
+            charm_class(itemset, new_class, min_sup, closed, buckets, backend)
+        eq_class[i] = None
+        add_closed(itemset, backend.hash(tidlist1), sup1, closed, buckets)
+
+
+def add_closed(itemset: tuple, key: int, sup: int, closed: dict, buckets: dict) -> None:
+    """
+    Add itemset to closed unless it is subsumed by a closed superset of the same support.
+
+    Subsumed itemsets have the same tidlist as their superset, so only the bucket of that tidlist is searched.
+    """
+    items = frozenset(itemset)
+    bucket = buckets.setdefault(key, [])
+    for other, other_sup in bucket:
+        if other_sup == sup and items <= other:
+            return
+    bucket.append((items, sup))
+    closed.update({tuple(sorted(itemset)): sup})
+
+
+def maximal_itemsets(closed: dict) -> list[tuple]:
+    """
+    Closed itemsets that are not contained in another closed itemset, i.e. have no frequent superset.
+    """
+    maximal = []
+    index = {}
+    for itemset in sorted(closed, key=len, reverse=True):
+        indices = [index.get(item, set()) for item in itemset]
+        if len(set.intersection(*indices)) == 0:
+            for item in itemset:
+                index.setdefault(item, set()).add(len(maximal))
+            maximal.append(itemset)
+    return sorted(maximal, key=lambda itemset: (len(itemset), itemset))
+
+
 def rule_gen(frequent: list[list[tuple]], sup_dict: dict, min_conf: float, min_len: int, max_len: int = None) ->\
         list[AssociationRule]:
+    return list(iter_rules(frequent, sup_dict, min_conf, min_len, max_len))
+
+
+def iter_rules(frequent: list[list[tuple]], sup_dict: dict, min_conf: float, min_len: int, max_len: int = None) ->\
+        Iterator[AssociationRule]:
+    """
+    Lazily generate association rules with confidence greater than min_conf.
+
+    :param frequent: Frequent itemsets sorted by their length.
+    :param sup_dict: Dictionary of supports for each itemset.
+    :param min_conf: Rules with confidence greater than min_conf are generated.
+    :param min_len: Minimum length of itemset of a rule.
+    :param max_len: Maximum length of itemset of a rule.
+    :return: Generator of rules, parameters are validated when it is created.
+    """
+    lengths = rule_lengths(frequent, min_conf, min_len, max_len)
+    if lengths is None:
+        return iter(())
+    return _iter_rules(frequent, sup_dict, min_conf, *lengths)
+
+
+def rule_lengths(frequent: list[list[tuple]], min_conf: float, min_len: int, max_len: int = None) -> \
+        Optional[tuple[int, int]]:
+    """
+    Validate parameters of rule generation and clip lengths of itemsets of rules to the mined ones.
+
+    :return: Minimum and maximum length of itemsets that rules are generated from or None if there are none.
+    """
     if min_conf < 0.0 or min_conf > 1.0:
         raise ValueError(f'Parameter min_conf should be in [0, 1] but {min_conf} was passed.')
     if max_len is not None and min_len > max_len:
         raise ValueError(f'Parameter min_len should be less than max_len but min_len: {min_len} and max_len: {max_len}')
     if min_len > len(frequent):
-        return []
-    if max_len is None:
+        return None
+    if max_len is None or max_len > len(frequent):
         max_len = len(frequent)
+    return max(min_len, 2), max_len
+
 
-    rules = []
+def _iter_rules(frequent: list[list[tuple]], sup_dict: dict, min_conf: float, min_len: int, max_len: int) ->\
+        Iterator[AssociationRule]:
     for length in range(min_len-1, max_len):
         for itemset in frequent[length]:
-            for suc_len in range(1, len(itemset)):
-                for suc in combinations(itemset, suc_len):
-                    pred = tuple(sorted(set(itemset).difference(suc)))
-                    if pred not in sup_dict or suc not in sup_dict:
-                        continue
-                    sup = sup_dict[itemset]
-                    pred_sup = sup_dict[pred]
-                    conf = sup/pred_sup
-                    if conf <= min_conf:
-                        continue
-                    ar = AssociationRule(pred, suc, sup, conf)
-                    rules.append(ar)
-    return rules
+            yield from itemset_rules(itemset, sup_dict, min_conf)
+
+
+def rule_batches(frequent: list[list[tuple]], sup_dict: dict, min_conf: float, min_len: int, max_len: int = None,
+                 n_transactions: int = None, min_measures: dict = None, batch_size: int = RULE_BATCH_SIZE) -> \
+        Iterator[RuleSet]:
+    """
+    Lazily generate the rules of iter_rules in RuleSet batches of about batch_size rules with interestingness measures.
+
+    Supports of successors are collected while rules are generated, so measures of a whole batch
+    are computed at once, see core.measures, and rules not passing min_measures are dropped
+    before the batch is yielded.
+
+    :param n_transactions: Number of transactions, measures are computed only if it is given.
+    :param min_measures: Thresholds {measure: value}, only rules with measures greater than them are kept.
+    :return: Generator of batches, parameters are validated when it is created.
+    """
+    min_measures = {} if min_measures is None else min_measures
+    check_thresholds(min_measures)
+    if min_measures and n_transactions is None:
+        raise ValueError('Thresholds of interestingness measures require the number of transactions.')
+    lengths = rule_lengths(frequent, min_conf, min_len, max_len)
+    if lengths is None:
+        return iter(())
+    return _rule_batches(frequent, sup_dict, min_conf, *lengths, n_transactions, min_measures, batch_size)
+
+
+def _rule_batches(frequent: list[list[tuple]], sup_dict: dict, min_conf: float, min_len: int, max_len: int,
+                  n_transactions: Optional[int], min_measures: dict, batch_size: int) -> Iterator[RuleSet]:
+    batch = RuleSet()
+    suc_sups = []
+    for length in range(min_len-1, max_len):
+        for itemset in frequent[length]:
+            for pred, suc, sup, conf in _itemset_rules(itemset, sup_dict, min_conf):
+                batch.append(pred, suc, sup, conf)
+                suc_sups.append(sup_dict[suc])
+            if len(suc_sups) >= batch_size:
+                yield measured_batch(batch, suc_sups, n_transactions, min_measures)
+                batch = RuleSet()
+                suc_sups = []
+    if len(suc_sups) > 0:
+        yield measured_batch(batch, suc_sups, n_transactions, min_measures)
+
+
+def measured_batch(batch: RuleSet, suc_sups: list, n_transactions: Optional[int], min_measures: dict,
+                   keep_unknown: bool = False) -> RuleSet:
+    """
+    Set measures of batch computed from supports of its successors and keep only rules passing min_measures.
+
+    With keep_unknown, rules whose measures are NaN (unknown support of the successor) are kept too.
+    """
+    if n_transactions is None:
+        return batch
+    measures = rule_measures(batch.support, batch.confidence, np.array(suc_sups, dtype=np.float64), n_transactions)
+    batch.set_measures(measures)
+    if not min_measures:
+        return batch
+    mask = measure_mask(measures, min_measures)
+    if keep_unknown:
+        mask |= np.isnan(measures['lift'])
+    return batch.filter(mask)
+
+
+def itemset_rules(itemset: tuple, sup_dict: dict, min_conf: float) -> Iterator[AssociationRule]:
+    for pred, suc, sup, conf in _itemset_rules(itemset, sup_dict, min_conf):
+        yield AssociationRule(pred, suc, sup, conf)
+
+
+def _itemset_rules(itemset: tuple, sup_dict: dict, min_conf: float) -> Iterator[tuple]:
+    """
+    Generate rules pred -> suc with pred + suc = itemset and confidence greater than min_conf (ap-genrules).
+
+    Successors are subsets of itemset encoded as bitmasks of its positions. They are grown one item
+    at a time and only from successors that passed, because moving an item from the predecessor
+    to the successor can only lower the confidence.
+    """
+    k = len(itemset)
+    full = (1 << k) - 1
+    sup = sup_dict[itemset]
+    level = [1 << i for i in range(k)]
+    while level:
+        passed = set()
+        for suc_mask in level:
+            pred_mask = full ^ suc_mask
+            pred = subset_getter(k, pred_mask)(itemset)
+            suc = subset_getter(k, suc_mask)(itemset)
+            if pred not in sup_dict or suc not in sup_dict:
+                continue
+            conf = sup/sup_dict[pred]
+            if conf <= min_conf:
+                continue
+            passed.add(suc_mask)
+            yield pred, suc, sup, conf
+        level = grow_masks(passed, k)
+
+
+def grow_masks(masks: set, k: int) -> list[int]:
+    """
+    Join masks with m bits set into masks with m+1 bits set, all of whose m-subsets are in masks.
+    """
+    grown = []
+    for mask in sorted(masks):
+        for bit in range(mask.bit_length(), k):
+            new_mask = mask | (1 << bit)
+            if new_mask == (1 << k) - 1:
+                continue
+            if all(new_mask ^ (1 << i) in masks for i in range(k) if new_mask >> i & 1):
+                grown.append(new_mask)
+    return grown
+
+
+@lru_cache(maxsize=SUBSET_GETTERS)
+def subset_getter(k: int, mask: int) -> Callable[[tuple], tuple]:
+    """
+    Function that picks the positions set in bitmask mask from a k-tuple as a tuple.
+
+    Getters are built on demand and only the most recently used ones are kept, as there are 2^k masks of k positions.
+    """
+    positions = [i for i in range(k) if mask >> i & 1]
+    if len(positions) == 0:
+        return lambda t: ()
+    if len(positions) == 1:
+        return lambda t, i=positions[0]: (t[i],)
+    return itemgetter(*positions)
+
+
+def top_k_itemsets(transactions: Union[pd.DataFrame, VerticalData], top: TopKRules, min_len: int,
+                   max_len: int = None, tidlist: str = 'set', excluded: frozenset = frozenset()) -> \
+        tuple[list[list[tuple]], dict]:
+    """
+    Mine itemsets depth-first and offer their rules to top while mining.
+
+    The support threshold is read from top.min_sup at every step, so once top is full and ranks
+    by support, itemsets that could not produce a rule better than the worst kept one are not extended.
+
+    :param transactions: DataFrame with one transaction per row or transactions in vertical format.
+    :param top: Bounded heap of rules, its min_sup and min_conf are raised as it fills up.
+    :param min_len: Minimum length of itemset of a rule.
+    :param max_len: Maximum length of itemset of a rule, longer itemsets are not mined.
+    :param tidlist: Representation of tidlists - 'set' or 'bitset'.
+    :param excluded: Pairs of items that are never extended into one itemset.
+    :return: Mined itemsets sorted by their length and dictionary of their supports.
+    """
+    if max_len is not None and min_len > max_len:
+        raise ValueError(f'Parameter min_len should be less than max_len but min_len: {min_len} and max_len: {max_len}')
+    if top.min_sup >= len(transactions):
+        return [], {}
+    tid_dict, sup_dict = get_tidlists(transactions, top.min_sup, tidlist)
+    if len(tid_dict) == 0:
+        return [], {}
+    frequent = [list(tid_dict.keys())]
+    eq_class = [(itemset[-1], tids, sup_dict[itemset]) for itemset, tids in tid_dict.items()]
+    tid_dict.clear()
+    mine_top_k_class((), eq_class, top, frequent, sup_dict, get_tidlist(tidlist), max(min_len, 2), max_len, excluded)
+    return frequent, sup_dict
+
+
+def mine_top_k_class(prefix: tuple, eq_class: list[tuple], top: TopKRules, frequent: list[list[tuple]],
+                     sup_dict: dict, backend, min_len: int, max_len: int = None,
+                     excluded: frozenset = frozenset()) -> None:
+    """
+    Offer rules of every itemset prefix + item of eq_class to top and mine its extensions.
+
+    The class is mined from its last item to the first, so that all subsets of an itemset are
+    already in sup_dict when its rules are generated. A subset has at least the support of the itemset
+    and the threshold only grows, so no subset is pruned before the itemset itself.
+    """
+    for i in reversed(range(len(eq_class))):
+        item1, tidlist1, sup1 = eq_class[i]
+        if sup1 <= top.min_sup:
+            continue
+        itemset1 = prefix + (item1,)
+        if len(itemset1) >= min_len:
+            for rule in itemset_rules(itemset1, sup_dict, top.min_conf):
+                top.offer(rule)
+        if max_len is not None and len(itemset1) >= max_len:
+            continue
+        new_class = []
+        for i2 in range(i+1, len(eq_class)):
+            item2, tidlist2, sup2 = eq_class[i2]
+            if sup2 <= top.min_sup or excluded and (item1, item2) in excluded:
+                continue
+            tidlist = backend.intersect(tidlist1, tidlist2)
+            sup = backend.support(tidlist)
+            if sup > top.min_sup:
+                new_itemset = itemset1 + (item2,)
+                new_class.append((item2, tidlist, sup))
+                sup_dict.update({new_itemset: sup})
+                if len(frequent) < len(new_itemset):
+                    frequent.append([])
+                frequent[len(new_itemset)-1].append(new_itemset)
+        if len(new_class) > 0:
+            mine_top_k_class(itemset1, new_class, top, frequent, sup_dict, backend, min_len, max_len, excluded)
+
+
+def check_state(state_min_sup: Optional[int], min_sup: int, top_k: int = None, itemsets: str = 'all',
+                reorder: bool = False, generalized: bool = False, cache: MiningCache = None,
+                sample: Union[int, float] = None) -> None:
+    """
+    Check that rules can be generated from a mining state with the parameters of eclat,
+    before transactions are appended to the state.
+
+    :param state_min_sup: min_sup of the state or None for a state that is yet to be mined.
+    """
+    if state_min_sup is not None and min_sup != state_min_sup:
+        raise ValueError(f'Parameter min_sup should be {state_min_sup} as in the mining state '
+                         f'but {min_sup} was passed.')
+    if top_k is not None or itemsets != 'all' or reorder or generalized:
+        raise ValueError('Rules of a mining state are generated from all its frequent itemsets only.')
+    if cache is not None:
+        raise ValueError('Only all frequent itemsets of the original items of a fixed dataset are cached.')
+    if sample is not None:
+        raise ValueError('Sampling mines all frequent itemsets of transactions without top-k or cache only.')
+
+
+def mining_state(transactions: Union[pd.DataFrame, VerticalData], min_sup: int, search: str = 'dfs',
+                 tidlist: str = 'set', diffset: str = 'off', n_jobs: int = 1) -> MiningState:
+    """
+    Mine frequent itemsets into a MiningState, to which new transactions can be appended later.
+
+    Transactions should not be filtered by min_sup, since infrequent items may become frequent.
+    """
+    if not isinstance(transactions, VerticalData):
+        transactions = VerticalData.from_dataframe(transactions)
+    _, sup_dict = frequent_itemsets(transactions, min_sup, search, tidlist, diffset, n_jobs)
+    return MiningState(transactions, min_sup, sup_dict)
+
+
+def sample_itemsets(transactions: Union[pd.DataFrame, VerticalData], min_sup: int, sample: Union[int, float],
+                    seed: int = None, verify: bool = False, search: str = 'bfs', tidlist: str = 'set',
+                    diffset: str = 'off', n_jobs: int = 1, excluded: frozenset = frozenset(),
+                    stats: LevelStats = None, confidence: float = SAMPLE_CONFIDENCE) -> \
+        tuple[list[list[tuple]], Mapping]:
+    """
+    Mine frequent itemsets approximately from a uniform random sample of transactions (Toivonen).
+
+    The sample is mined with min_sup lowered by a Chernoff bound, see sampled_min_sup, so that an itemset
+    frequent in all transactions is missed with probability at most 1 - confidence.
+    Without verify, itemsets whose estimated support is greater than min_sup are returned with SampledSupports,
+    which also gives confidence intervals of the supports. With verify, the itemsets mined from the sample and
+    their negative border are counted on all transactions in one pass and the frequent ones are returned
+    with exact supports. If an itemset of the border is frequent, its supersets may have been missed,
+    which is logged as a warning.
+
+    :param transactions: DataFrame with one transaction per row or transactions in vertical format.
+    :param min_sup: Itemsets with support greater than min_sup in all transactions are frequent.
+    :param sample: Fraction of transactions in (0, 1) or number of transactions to sample.
+    :param seed: Seed of the random generator, the same seed gives the same sample.
+    :param verify: Whether to count the candidates on all transactions.
+    :param confidence: Confidence level of the lowered threshold and of the support intervals.
+    :return: Frequent itemsets sorted by their length and a mapping of their supports.
+    """
+    if not isinstance(transactions, VerticalData):
+        transactions = VerticalData.from_dataframe(transactions)
+    n_transactions = len(transactions)
+    size = get_sample_size(sample, n_transactions)
+    tids = np.sort(np.random.default_rng(seed).choice(n_transactions, size, replace=False))
+    data = transactions.sample(tids)
+    lowered = sampled_min_sup(min_sup, n_transactions, size, confidence)
+    logger.info(f'\nSampled {size} of {n_transactions} transactions - lowered min_sup: {lowered}.')
+    frequent, sample_sups = frequent_itemsets(data, lowered, search, tidlist, diffset, n_jobs, excluded=excluded,
+                                              stats=stats)
+    if verify:
+        return verify_itemsets(transactions, frequent, sample_sups, min_sup, tidlist, excluded)
+
+    supports = SampledSupports(sample_sups, size, n_transactions, confidence)
+    supports.drop_infrequent(min_sup)
+    frequent = [[itemset for itemset in row if itemset in supports] for row in frequent]
+    while frequent and len(frequent[-1]) == 0:
+        frequent.pop()
+    return frequent, supports
+
+
+def get_sample_size(sample: Union[int, float], n_transactions: int) -> int:
+    if isinstance(sample, numbers.Integral) and sample > 0:
+        return min(int(sample), n_transactions)
+    if isinstance(sample, numbers.Real) and not isinstance(sample, numbers.Integral) and 0.0 < sample < 1.0:
+        return max(1, round(float(sample) * n_transactions))
+    raise ValueError(f'Parameter sample should be a fraction in (0, 1) or a positive number of transactions '
+                     f'but {sample} was passed.')
+
+
+def sampled_min_sup(min_sup: int, n_transactions: int, sample_size: int,
+                    confidence: float = SAMPLE_CONFIDENCE) -> int:
+    """
+    Support threshold of a sample, below which an itemset frequent in all transactions falls
+    with probability at most 1 - confidence.
+
+    By the Chernoff bound P(X <= (1-e)m) <= exp(-e^2 m / 2), where X is the support in the sample
+    and m its expected value for the least frequent itemset, the threshold is m - sqrt(2 m ln(1 / (1-confidence))).
+    """
+    expected = (min_sup+1) * sample_size / n_transactions
+    return max(0, math.floor(expected - math.sqrt(2 * expected * math.log(1 / (1-confidence)))))
+
+
+def negative_border(frequent: list[list[tuple]], sup_dict: Mapping, items: list[int],
+                    excluded: frozenset = frozenset()) -> list[tuple]:
+    """
+    Itemsets that are not in sup_dict although all their subsets are, except pairs in excluded.
+    """
+    border = [(item,) for item in items if (item,) not in sup_dict]
+    for row in frequent:
+        row = sorted(row)
+        for i1, itemset1 in enumerate(row):
+            for itemset2 in row[i1+1:]:
+                if itemset1[:-1] != itemset2[:-1]:
+                    break
+                if excluded and (itemset1[-1], itemset2[-1]) in excluded:
+                    continue
+                candidate = itemset1 + (itemset2[-1],)
+                if candidate not in sup_dict and \
+                        all(candidate[:i] + candidate[i+1:] in sup_dict for i in range(len(candidate)-2)):
+                    border.append(candidate)
+    return border
+
+
+def verify_itemsets(data: VerticalData, frequent: list[list[tuple]], sample_sups: dict, min_sup: int,
+                    tidlist: str = 'set', excluded: frozenset = frozenset()) -> tuple[list[list[tuple]], dict]:
+    """
+    Count itemsets mined from a sample and their negative border on all transactions.
+
+    Candidates are visited in lexicographic order keeping only the tidlists of the prefixes
+    of the current one, every candidate costs a single intersection.
+
+    :return: Frequent candidates sorted by their length and dictionary of their exact supports.
+    """
+    backend = get_tidlist(tidlist)
+    border = negative_border(frequent, sample_sups, data.items(), excluded)
+    item_tidlists = {}
+    prefixes = []
+    sup_dict = {}
+    for itemset in sorted(itertools.chain(sample_sups, border)):
+        item = itemset[-1]
+        if item not in item_tidlists:
+            item_tidlists[item] = backend.from_tids(data.tidlists[item], data.n_transactions) \
+                if item in data.tidlists else backend.from_tids([], data.n_transactions)
+        del prefixes[len(itemset)-1:]
+        tids = item_tidlists[item] if len(itemset) == 1 else backend.intersect(prefixes[-1], item_tidlists[item])
+        prefixes.append(tids)
+        sup = backend.support(tids)
+        if sup > min_sup:
+            sup_dict[itemset] = sup
+
+    missed = sum(1 for itemset in border if itemset in sup_dict)
+    if missed > 0:
+        logger.warning(f'\n{missed} itemsets of the negative border of the sample are frequent, '
+                       f'their frequent supersets may be missing.')
+    frequent = []
+    for itemset in sorted(sup_dict, key=lambda itemset: (len(itemset), itemset)):
+        if len(frequent) < len(itemset):
+            frequent.append([])
+        frequent[-1].append(itemset)
+    return frequent, sup_dict
 
 
 def find_hierarchy(tax_dict: dict, ancestor_dict: dict, item: int) -> tuple[set, dict]:
@@ -100,7 +860,8 @@ def find_hierarchy(tax_dict: dict, ancestor_dict: dict, item: int) -> tuple[set,
     return ancestors, ancestor_dict
 
 
-def hierarchy_rule(frequent: list[list[tuple]], tax_dict: dict, sup_dict: dict) -> list[AssociationRule]:
+def hierarchy_rule(frequent: list[list[tuple]], tax_dict: dict, sup_dict: dict, ancestor_dict: dict = None) -> \
+        list[AssociationRule]:
     """
     Mine special rules based on taxonomy.
 
@@ -113,12 +874,13 @@ def hierarchy_rule(frequent: list[list[tuple]], tax_dict: dict, sup_dict: dict)
         the next element of L - l2 - stores itemsets of length 2 and so on).
     :param tax_dict: Hierarchy dictionary of elements in frequent {child: parent}.
     :param sup_dict: Dictionary of supports for each itemset.
+    :param ancestor_dict: Ancestors of items, e.g. Taxonomy.ancestor_dict, missing ones are found in tax_dict.
     :return: List of the special rules described above.
     """
     if len(frequent) < 2:
         return []
     rules = set()
-    ancestor_dict = {}
+    ancestor_dict = {} if ancestor_dict is None else ancestor_dict
     two_itemsets = frequent[1]
     for itemset in two_itemsets:
         item1 = itemset[0]
@@ -136,27 +898,231 @@ def hierarchy_rule(frequent: list[list[tuple]], tax_dict: dict, sup_dict: dict)
     return rules
 
 
-def eclat(transactions: pd.DataFrame, taxonomy: pd.DataFrame = None, min_sup: int = 1, min_conf: float = 0.5,
-          min_len: int = 1, max_len: int = None) -> list[AssociationRule]:
-    print('\nStart ECLAT.')
+def eclat(transactions: Union[pd.DataFrame, VerticalData, MiningState], taxonomy: pd.DataFrame = None, min_sup: int = 1,
+          min_conf: float = 0.5, min_len: int = 1, max_len: int = None, search: str = 'bfs', tidlist: str = 'set',
+          diffset: str = 'off', n_jobs: int = 1, lazy: bool = False, top_k: int = None,
+          rank_by: str = 'support', itemsets: str = 'all', reorder: bool = False, generalized: bool = False,
+          cache: MiningCache = None, monitor: MiningMonitor = None, sample: Union[int, float] = None,
+          seed: int = None, verify: bool = False, measures: bool = False, min_measures: dict = None) -> \
+        Union[RuleSet, Iterator[AssociationRule]]:
+    """
+    Mine association rules and, if taxonomy is given, hierarchy rules.
+
+    With lazy=True frequent itemsets are mined immediately, but rules are returned as an iterator
+    that generates them while being consumed, e.g. by a RuleWriter, so they are never all in memory.
+
+    With top_k only the top_k best rules by rank_by ('confidence' or 'support') are returned, from the best.
+    They are mined depth-first in a single pass whose min_sup or min_conf is raised to the worst kept rule,
+    so min_sup and min_conf only set a lower bound. Search, diffset and n_jobs are not used in this mode.
+    Only a raised min_sup prunes the search, the confidence of a rule gives no bound on the support
+    of the itemsets still to be mined, so with rank_by='confidence' all itemsets frequent at min_sup are mined
+    and only rule generation is pruned.
+
+    With itemsets='closed' or 'maximal' rules are generated only from closed or maximal itemsets, supports
+    of their subsets are derived from the closed itemsets. Every rule pred -> suc of the full run has
+    a rule pred -> suc' with the same support and confidence and suc' containing suc among the closed ones.
+
+    With reorder=True frequent items are re-encoded to dense ids in ascending order of support before mining,
+    see ItemEncoder, and rules are decoded to the original ids with items of each side sorted.
+
+    With generalized=True transactions are extended with ancestors of their items from taxonomy
+    and multi-level itemsets are mined directly, except itemsets with an item and its own ancestor.
+
+    If transactions are a MiningState, its frequent itemsets are used and nothing is mined,
+    min_sup has to match the state.
+
+    With cache, frequent itemsets are read from it if they were mined for the same dataset
+    with the same or lower min_sup, otherwise they are mined and stored in it.
+    Transactions may be None if the cache has them.
+
+    With sample, a fraction in (0, 1) or a number of transactions, frequent itemsets are mined approximately
+    from a random sample drawn with seed, see sample_itemsets. Rules get supports estimated from the sample,
+    or exact supports of the itemsets found in the sample with verify=True.
+
+    With measures=True rules get interestingness measures lift, leverage and conviction, computed in batches
+    while rules are generated, see rule_batches. With min_measures, e.g. {'lift': 1.2}, only rules with measures
+    greater than the thresholds are kept, weak rules never leave rule generation. Hierarchy rules are filtered
+    only if the support of the ancestor is known, i.e. in generalized mining. Not available with top_k.
+
+    Progress is logged to the 'eclat' logger. With monitor, statistics of every phase and of every level
+    of the search are also collected in it and passed to its callbacks, see MiningMonitor. Levels are counted
+    only if monitor is given, so that the search is not slowed down by instrumentation nobody reads.
+    """
+    stats = LevelStats() if monitor is not None else None
+    monitor = MiningMonitor() if monitor is None else monitor
+    logger.info('\nStart ECLAT.')
     start_time = time.time()
 
-    frequent, sup_dict = frequent_itemsets(transactions, min_sup)
-    frequent_time = time.time()
-    print(f'\nFrequent itemsets mined - number of frequent itemsets: {len(sup_dict.keys())}.'
-          f'\nCompleted in {frequent_time-start_time:.4f} sec.')
+    if isinstance(transactions, MiningState):
+        check_state(transactions.min_sup, min_sup, top_k, itemsets, reorder, generalized, cache, sample)
+    if cache is not None and (top_k is not None or itemsets != 'all' or reorder or generalized or
+                              isinstance(transactions, MiningState)):
+        raise ValueError('Only all frequent itemsets of the original items of a fixed dataset are cached.')
+    if sample is not None and (top_k is not None or itemsets != 'all' or cache is not None or
+                               isinstance(transactions, MiningState)):
+        raise ValueError('Sampling mines all frequent itemsets of transactions without top-k or cache only.')
+    min_measures = {} if min_measures is None else min_measures
+    check_thresholds(min_measures)
+    measure_names = MEASURES if measures or min_measures else ()
+    if measure_names and (top_k is not None or transactions is None):
+        raise ValueError('Interestingness measures require transactions and are not computed in top-k mode.')
+    n_transactions = len(transactions) if measure_names else None
 
-    rules = rule_gen(frequent, sup_dict, min_conf, min_len, max_len)
-    rules_time = time.time()
-    print(f'\nAssociation rules mined - number of frequent rules: {len(rules)}.'
-          f'\nCompleted in {rules_time-frequent_time:.4f} sec.')
+    tax = None if taxonomy is None else Taxonomy.from_dataframe(taxonomy)
+    excluded = frozenset()
+    if generalized:
+        if tax is None:
+            raise ValueError('Generalized mining requires a taxonomy.')
+        if not isinstance(transactions, VerticalData):
+            transactions = VerticalData.from_dataframe(transactions)
+        transactions = tax.generalize(transactions)
+        excluded = tax.excluded_pairs(transactions.items())
+        start_time = monitor.phase('generalize', start_time,
+                                   f'Transactions generalized - number of items: {len(transactions.tidlists)}.',
+                                   n_items=len(transactions.tidlists))
 
-    if taxonomy is not None:
-        tax_dict = taxonomy.set_index('child')['parent'].to_dict()
-        h_rules = hierarchy_rule(frequent, tax_dict, sup_dict)
-        rules.extend(h_rules)
-        hierarchy_time = time.time()
-        print(f'\nHierarchy rules mined - total number of rules: {len(rules)}.'
-              f'\nCompleted in {hierarchy_time-rules_time:.4f} sec.')
+    encoder = None
+    if reorder:
+        encoder = ItemEncoder.fit(transactions, min_sup)
+        transactions = encoder.encode(transactions)
+        excluded = frozenset((encoder.codes[item1], encoder.codes[item2]) for item1, item2 in excluded
+                             if item1 in encoder.codes and item2 in encoder.codes)
+        start_time = monitor.phase('encode', start_time,
+                                   f'Items re-encoded - number of frequent items: {len(encoder)}.',
+                                   n_items=len(encoder))
+
+    if top_k is not None:
+        if diffset != 'off' or n_jobs != 1 or itemsets != 'all':
+            raise ValueError('Top-K mining supports neither diffsets, parallel mining nor closed itemsets.')
+        top = TopKRules(top_k, rank_by, min_sup, min_conf)
+        frequent, sup_dict = top_k_itemsets(transactions, top, min_len, max_len, tidlist, excluded)
+        rules_time = monitor.phase('top_k', start_time,
+                                   f'Top-{top_k} rules mined - number of rules: {len(top)}, '
+                                   f'final min_sup: {top.min_sup}, final min_conf: {top.min_conf:.4f}.',
+                                   n_rules=len(top), min_sup=top.min_sup, min_conf=top.min_conf)
+        if encoder is not None:
+            decoded = TopKRules(top_k, rank_by, top.min_sup, top.min_conf)
+            for rule in encoder.decode_rules(top.rules()):
+                decoded.offer(rule)
+            frequent, sup_dict = encoder.decode_frequent(frequent, sup_dict, 2)
+            top = decoded
+        if tax is not None:
+            for rule in hierarchy_rule(frequent, tax.parents, sup_dict, tax.ancestor_dict):
+                top.offer(rule)
+            monitor.phase('hierarchy', rules_time, f'Hierarchy rules offered - number of rules: {len(top)}.',
+                          n_rules=len(top))
+        rules = top.rules()
+        return iter(rules) if lazy else rules
+
+    cached = None if cache is None else cache.get(min_sup)
+    if cached is not None:
+        frequent, sup_dict = cached
+        logger.info('\nFrequent itemsets read from cache.')
+    elif transactions is None:
+        raise ValueError(f'Frequent itemsets for min_sup {min_sup} are not cached, transactions are required.')
+    elif isinstance(transactions, MiningState):
+        frequent, sup_dict = transactions.frequent(), transactions.sup_dict
+    else:
+        if sample is not None:
+            frequent, sup_dict = sample_itemsets(transactions, min_sup, sample, seed, verify, search, tidlist,
+                                                 diffset, n_jobs, excluded, stats)
+        else:
+            frequent, sup_dict = frequent_itemsets(transactions, min_sup, search, tidlist, diffset, n_jobs,
+                                                   itemsets, excluded, stats)
+        if stats is not None:
+            monitor.level('mining', stats)
+        if cache is not None:
+            cache.put(min_sup, frequent, sup_dict)
+    n_itemsets = sum(map(len, frequent))
+    frequent_time = monitor.phase('mining', start_time,
+                                  f'Frequent itemsets mined - number of {itemsets} frequent itemsets: {n_itemsets}.',
+                                  n_itemsets=n_itemsets)
+    if isinstance(sup_dict, SampledSupports) and len(sup_dict) > 0:
+        half_width = max((high-low) / 2 for low, high in map(sup_dict.interval, sup_dict))
+        logger.info(f'\nSupports estimated from {sup_dict.sample_size} of {sup_dict.n_transactions} transactions '
+                    f'- {sup_dict.confidence:.0%} confidence intervals up to \u00b1{half_width:.0f}.')
+    if encoder is not None and itemsets == 'all':
+        n_candidates, n_original = encoder.candidates(sup_dict)
+        logger.info(f'\nItem reordering removed {n_original-n_candidates} of {n_original} candidate itemsets.')
+
+    batches = rule_batches(frequent, sup_dict, min_conf, min_len, max_len, n_transactions, min_measures)
+    # hierarchy rules come from all frequent 2-itemsets, not only the closed or maximal ones
+    h_frequent = covered_pairs(frequent) if tax is not None and itemsets != 'all' else frequent
+    if encoder is not None:
+        batches = map(encoder.decode_rules, batches)
+        h_frequent, h_sup_dict = encoder.decode_frequent(h_frequent, sup_dict, 2)
+    else:
+        h_sup_dict = sup_dict
+    if lazy:
+        return lazy_rules(batches, h_frequent, h_sup_dict, tax, monitor, n_transactions, min_measures, measure_names)
+
+    rules = RuleSet.concat(batches)
+    rules_time = monitor.phase('rules', frequent_time,
+                               f'Association rules mined - number of frequent rules: {len(rules)}.',
+                               n_rules=len(rules))
+
+    if tax is not None:
+        h_rules = hierarchy_rule_set(h_frequent, tax, h_sup_dict, n_transactions, min_measures)
+        rules = RuleSet.concat([rules, h_rules])
+        monitor.phase('hierarchy', rules_time, f'Hierarchy rules mined - total number of rules: {len(rules)}.',
+                      n_rules=len(h_rules))
 
     return rules
+
+
+def covered_pairs(frequent: list[list[tuple]]) -> list[list[tuple]]:
+    """
+    Frequent 1-itemsets and 2-itemsets contained in the closed or maximal itemsets of frequent.
+
+    Every frequent itemset is a subset of a closed and of a maximal one, so these are all frequent itemsets
+    of length up to 2, their supports are derived by ClosedSupports.
+    """
+    singles, pairs = set(frequent[0]) if frequent else set(), set()
+    for row in frequent[1:]:
+        for itemset in row:
+            singles.update((item,) for item in itemset)
+            pairs.update(itertools.combinations(itemset, 2))
+    return [sorted(singles), sorted(pairs)]
+
+
+def hierarchy_rule_set(frequent: list[list[tuple]], taxonomy: Taxonomy, sup_dict: dict,
+                       n_transactions: int = None, min_measures: dict = None) -> RuleSet:
+    """
+    Hierarchy rules as a RuleSet with interestingness measures if n_transactions is given,
+    rules with an ancestor of unknown support are kept with NaN measures.
+    """
+    h_rules = RuleSet(hierarchy_rule(frequent, taxonomy.parents, sup_dict, taxonomy.ancestor_dict))
+    suc_sups = [sup_dict.get(suc, np.nan) for suc in map(h_rules.suc, range(len(h_rules)))]
+    return measured_batch(h_rules, suc_sups, n_transactions, min_measures, keep_unknown=True)
+
+
+def lazy_rules(batches: Iterable[RuleSet], frequent: list[list[tuple]], sup_dict: dict,
+               taxonomy: Union[pd.DataFrame, Taxonomy] = None, monitor: MiningMonitor = None,
+               n_transactions: int = None, min_measures: dict = None, measures: tuple = ()) -> RuleBatches:
+    """
+    Stream batches of association rules followed by hierarchy rules, phases are recorded once they are consumed.
+    """
+    if taxonomy is not None and not isinstance(taxonomy, Taxonomy):
+        taxonomy = Taxonomy.from_dataframe(taxonomy)
+    monitor = MiningMonitor() if monitor is None else monitor
+    return RuleBatches(_lazy_batches(batches, frequent, sup_dict, taxonomy, monitor, n_transactions, min_measures),
+                       measures)
+
+
+def _lazy_batches(batches: Iterable[RuleSet], frequent: list[list[tuple]], sup_dict: dict,
+                  taxonomy: Optional[Taxonomy], monitor: MiningMonitor, n_transactions: Optional[int],
+                  min_measures: Optional[dict]) -> Iterator[RuleSet]:
+    start_time = time.time()
+    n_rules = 0
+    for batch in batches:
+        n_rules += len(batch)
+        yield batch
+    rules_time = monitor.phase('rules', start_time, f'Association rules mined - number of frequent rules: {n_rules}.',
+                               n_rules=n_rules)
+
+    if taxonomy is not None:
+        h_rules = hierarchy_rule_set(frequent, taxonomy, sup_dict, n_transactions, min_measures)
+        yield h_rules
+        monitor.phase('hierarchy', rules_time,
+                      f'Hierarchy rules mined - total number of rules: {n_rules + len(h_rules)}.',
+                      n_rules=len(h_rules))
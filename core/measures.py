@@ -0,0 +1,45 @@
+import numpy as np
+
+
+MEASURES = ('lift', 'leverage', 'conviction')
+
+
+def rule_measures(support: np.ndarray, confidence: np.ndarray, suc_support: np.ndarray,
+                  n_transactions: int) -> dict[str, np.ndarray]:
+    """
+    Interestingness measures of rules pred -> suc computed for whole arrays of rules at once.
+
+    lift = conf / P(suc), leverage = P(pred + suc) - P(pred) P(suc) and conviction = (1 - P(suc)) / (1 - conf),
+    which is infinite for rules with confidence 1. Rules with unknown support of the successor (NaN) get NaN.
+
+    :param support: Supports of pred + suc.
+    :param confidence: Confidences of the rules.
+    :param suc_support: Supports of the successors.
+    :param n_transactions: Number of transactions.
+    :return: Dictionary {measure: array of values}.
+    """
+    support = np.asarray(support, dtype=np.float64)
+    confidence = np.asarray(confidence, dtype=np.float64)
+    p_suc = np.asarray(suc_support, dtype=np.float64) / n_transactions
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lift = confidence / p_suc
+        leverage = support / n_transactions * (1.0 - p_suc / confidence)
+        conviction = (1.0 - p_suc) / (1.0 - confidence)
+    return {'lift': lift, 'leverage': leverage, 'conviction': conviction}
+
+
+def measure_mask(measures: dict[str, np.ndarray], thresholds: dict[str, float]) -> np.ndarray:
+    """
+    Mask of rules whose every measure in thresholds is greater than its threshold.
+    """
+    mask = None
+    for name, threshold in thresholds.items():
+        passed = measures[name] > threshold
+        mask = passed if mask is None else mask & passed
+    return mask
+
+
+def check_thresholds(thresholds: dict[str, float]) -> None:
+    for name in thresholds:
+        if name not in MEASURES:
+            raise ValueError(f'Measure "{name}" not found. Possible values: {", ".join(MEASURES)}.')
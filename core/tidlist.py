@@ -0,0 +1,197 @@
+import numpy as np
+from itertools import islice
+from typing import Optional, Sequence
+
+
+BOUNDED_CHUNK = 1024
+BOUNDED_RATIO = 0.5
+
+
+if hasattr(int, 'bit_count'):
+    def popcount(bits: int) -> int:
+        return bits.bit_count()
+else:
+    def popcount(bits: int) -> int:
+        return bin(bits).count('1')
+
+
+class SetTidlist:
+    """
+    Tidlist stored as a frozenset of transaction ids.
+    """
+    name = 'set'
+
+    @staticmethod
+    def from_tids(tids: Sequence[int], n_transactions: int) -> frozenset:
+        return frozenset(tids.tolist() if hasattr(tids, 'tolist') else tids)
+
+    @staticmethod
+    def to_tids(tidlist: frozenset) -> list[int]:
+        return sorted(tidlist)
+
+    @staticmethod
+    def to_array(tidlist: frozenset) -> np.ndarray:
+        return np.sort(np.fromiter(tidlist, dtype=np.int64, count=len(tidlist)))
+
+    @staticmethod
+    def intersect(tidlist1: frozenset, tidlist2: frozenset) -> frozenset:
+        return tidlist1.intersection(tidlist2)
+
+    @staticmethod
+    def intersect_bounded(tidlist1: frozenset, tidlist2: frozenset, min_sup: int) -> Optional[frozenset]:
+        """
+        Intersect chunks of the shorter tidlist with the longer one, giving up with None as soon as
+        the tids found and the tids left to check cannot exceed min_sup.
+        """
+        shorter, longer = (tidlist1, tidlist2) if len(tidlist1) <= len(tidlist2) else (tidlist2, tidlist1)
+        if not use_bounded(len(shorter), min_sup):
+            return shorter.intersection(longer)
+        tids = iter(shorter)
+        left = len(shorter)
+        chunks = []
+        n_found = 0
+        while left > 0:
+            chunk = longer.intersection(islice(tids, BOUNDED_CHUNK))
+            left -= min(left, BOUNDED_CHUNK)
+            n_found += len(chunk)
+            if left > 0 and n_found + left <= min_sup:
+                return None
+            chunks.append(chunk)
+        return frozenset().union(*chunks)
+
+    @staticmethod
+    def difference(tidlist1: frozenset, tidlist2: frozenset) -> frozenset:
+        return tidlist1.difference(tidlist2)
+
+    @staticmethod
+    def support(tidlist: frozenset) -> int:
+        return len(tidlist)
+
+    @staticmethod
+    def hash(tidlist: frozenset) -> int:
+        return hash(tidlist)
+
+
+class BitsetTidlist:
+    """
+    Tidlist stored as a packed bit vector in a Python int.
+
+    Bit t is set when transaction t contains the itemset, so an intersection is
+    a bitwise AND and the support is a popcount.
+    """
+    name = 'bitset'
+
+    @staticmethod
+    def from_tids(tids: Sequence[int], n_transactions: int) -> int:
+        bits = np.zeros(n_transactions, dtype=bool)
+        bits[np.asarray(tids, dtype=np.int64)] = True
+        return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+    @staticmethod
+    def to_tids(tidlist: int) -> list[int]:
+        packed = np.frombuffer(tidlist.to_bytes((tidlist.bit_length()+7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder='little')).tolist()
+
+    @staticmethod
+    def to_array(tidlist: int) -> np.ndarray:
+        packed = np.frombuffer(tidlist.to_bytes((tidlist.bit_length()+7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder='little'))
+
+    @staticmethod
+    def intersect(tidlist1: int, tidlist2: int) -> int:
+        return tidlist1 & tidlist2
+
+    @staticmethod
+    def intersect_bounded(tidlist1: int, tidlist2: int, min_sup: int) -> Optional[int]:
+        """
+        A bitwise AND is never given up, splitting it into chunks would cost more than it could save.
+        """
+        return tidlist1 & tidlist2
+
+    @staticmethod
+    def difference(tidlist1: int, tidlist2: int) -> int:
+        return tidlist1 & ~tidlist2
+
+    @staticmethod
+    def support(tidlist: int) -> int:
+        return popcount(tidlist)
+
+    @staticmethod
+    def hash(tidlist: int) -> int:
+        return hash(tidlist)
+
+
+class ArrayTidlist:
+    """
+    Tidlist stored as an ascending numpy array of transaction ids.
+
+    Arrays of 1-itemsets are taken as they are, so tidlists of memory-mapped vertical data
+    are read zero-copy and only the results of intersections are held in memory.
+    """
+    name = 'array'
+
+    @staticmethod
+    def from_tids(tids: Sequence[int], n_transactions: int) -> np.ndarray:
+        return np.asarray(tids)
+
+    @staticmethod
+    def to_tids(tidlist: np.ndarray) -> list[int]:
+        return tidlist.tolist()
+
+    @staticmethod
+    def to_array(tidlist: np.ndarray) -> np.ndarray:
+        return np.asarray(tidlist)
+
+    @staticmethod
+    def intersect(tidlist1: np.ndarray, tidlist2: np.ndarray) -> np.ndarray:
+        return np.intersect1d(tidlist1, tidlist2, assume_unique=True)
+
+    @staticmethod
+    def intersect_bounded(tidlist1: np.ndarray, tidlist2: np.ndarray, min_sup: int) -> Optional[np.ndarray]:
+        """
+        Look up chunks of the shorter tidlist in the longer one with binary search, giving up with None
+        as soon as the tids found and the tids left to check cannot exceed min_sup.
+        """
+        shorter, longer = (tidlist1, tidlist2) if len(tidlist1) <= len(tidlist2) else (tidlist2, tidlist1)
+        if not use_bounded(len(shorter), min_sup):
+            return np.intersect1d(shorter, longer, assume_unique=True)
+        chunks = []
+        n_found = 0
+        for start in range(0, len(shorter), BOUNDED_CHUNK):
+            chunk = shorter[start:start+BOUNDED_CHUNK]
+            found = chunk[longer[np.minimum(np.searchsorted(longer, chunk), len(longer)-1)] == chunk]
+            n_found += len(found)
+            left = len(shorter) - start - len(chunk)
+            if left > 0 and n_found + left <= min_sup:
+                return None
+            chunks.append(found)
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def difference(tidlist1: np.ndarray, tidlist2: np.ndarray) -> np.ndarray:
+        return np.setdiff1d(tidlist1, tidlist2, assume_unique=True)
+
+    @staticmethod
+    def support(tidlist: np.ndarray) -> int:
+        return len(tidlist)
+
+    @staticmethod
+    def hash(tidlist: np.ndarray) -> int:
+        return hash(tidlist.astype(np.uint32, copy=False).tobytes())
+
+
+def use_bounded(length: int, min_sup: int) -> bool:
+    """
+    Whether an intersection with a tidlist of length is worth checking in chunks. It can be given up
+    only after length - min_sup tids are missed, so chunks pay off when min_sup is close to length.
+    """
+    return length > BOUNDED_CHUNK and min_sup >= BOUNDED_RATIO * length
+
+
+TIDLISTS = {backend.name: backend for backend in (SetTidlist, BitsetTidlist, ArrayTidlist)}
+
+
+def get_tidlist(name: str):
+    if name not in TIDLISTS:
+        raise ValueError(f'Tidlist "{name}" not found. Possible values: {", ".join(TIDLISTS)}.')
+    return TIDLISTS[name]
@@ -1,40 +1,150 @@
+import os
 import time
+import logging
 import argparse
+from typing import Union
+from contextlib import nullcontext
 
-from core.eclat import eclat
-from utils.data_io import Dataset, load_predefined, load_dataset, save_rules
+from core.eclat import check_state, eclat, mining_state
+from core.MiningCache import MiningCache
+from core.MiningMonitor import MiningMonitor, logger
+from core.MiningState import MiningState
+from core.measures import MEASURES
+from utils.data_io import Dataset, predefined_paths, load_dataset, load_dataframe, read_transactions, save_rules, \
+    output_dir
+from utils.profiling import PROFILE_MODES, profiled, save_stats
+from utils.readers import INPUT_FORMATS
+from utils.rule_writer import OUTPUT_FORMATS
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument('--dataset', type=int, default=0)
     parser.add_argument('--data', type=str)
     parser.add_argument('--taxonomy', type=str)
+    parser.add_argument('--loader', type=str, default='pandas', choices=['pandas', 'stream', 'mmap'])
+    parser.add_argument('--format', type=str, default='txt', choices=list(INPUT_FORMATS))
+    parser.add_argument('--state', type=str)
+    parser.add_argument('--cache', type=str)
+    parser.add_argument('--cache_size', type=int, default=1024)
     parser.add_argument('--min_sup', type=int, default=1)
     parser.add_argument('--min_conf', type=float, default=0.5)
     parser.add_argument('--min_len', type=int, default=1)
     parser.add_argument('--max_len', type=int)
-    args = parser.parse_args()
-    print(args)
-    return args
+    parser.add_argument('--search', type=str, default='bfs', choices=['bfs', 'dfs'])
+    parser.add_argument('--tidlist', type=str, default='set', choices=['set', 'bitset', 'array'])
+    parser.add_argument('--diffset', type=str, default='off', choices=['off', 'on', 'auto'])
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--reorder', action='store_true')
+    parser.add_argument('--generalized', action='store_true')
+    parser.add_argument('--itemsets', type=str, default='all', choices=['all', 'closed', 'maximal'])
+    parser.add_argument('--top_k', type=int)
+    parser.add_argument('--sample', type=sample_arg)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--verify', action='store_true')
+    parser.add_argument('--measures', action='store_true')
+    parser.add_argument('--min_lift', type=float)
+    parser.add_argument('--min_leverage', type=float)
+    parser.add_argument('--min_conviction', type=float)
+    parser.add_argument('--rank_by', type=str, default='support', choices=['confidence', 'support'])
+    parser.add_argument('--output-format', type=str, default='csv', choices=list(OUTPUT_FORMATS))
+    parser.add_argument('--log_level', type=str, default='INFO', choices=['DEBUG', 'INFO', 'WARNING'])
+    parser.add_argument('--stats', type=str)
+    parser.add_argument('--profile', type=str, choices=list(PROFILE_MODES))
+    return parser.parse_args(argv)
+
+
+def sample_arg(value: str) -> Union[int, float]:
+    return int(value) if value.isdigit() else float(value)
 
 
 def main() -> None:
     args = parse_args()
+    logging.basicConfig(format='%(message)s', level=args.log_level)
+    logger.info(args)
+    with profiled(args.profile, output_dir) if args.profile else nullcontext():
+        run(args)
+
+
+def run(args: argparse.Namespace) -> None:
+    # infrequent items still count towards the support of their ancestors
+    load_min_sup = None if args.generalized else args.min_sup
     if args.data:
-        transactions, taxonomy = load_dataset(args.data, args.taxonomy)
+        data_path, tax_path = args.data, args.taxonomy
+    else:
+        data_path, tax_path = predefined_paths(Dataset(args.dataset))
+    min_measures = {name: getattr(args, f'min_{name}') for name in MEASURES
+                    if getattr(args, f'min_{name}') is not None}
+    measures = MEASURES if args.measures or min_measures else ()
+    cache = None
+    if args.cache:
+        cache = MiningCache.for_file(args.cache, data_path, args.cache_size * 2**20)
+    if args.state:
+        transactions, taxonomy = update_state(args, cache)
+    elif cache is not None and cache.contains(args.min_sup) and not measures:
+        # measures need the number of transactions, so only plain rules skip loading the data
+        transactions = None
+        taxonomy = load_dataframe(tax_path, is_taxonomy=True) if tax_path else None
     else:
-        transactions, taxonomy = load_predefined(Dataset(args.dataset))
+        transactions, taxonomy = load_dataset(data_path, tax_path, args.loader, load_min_sup, args.format)
+    # levels are counted only when their records are saved or logged
+    monitor = MiningMonitor() if args.stats or args.log_level == 'DEBUG' else None
     rules = eclat(transactions,
                   taxonomy=taxonomy,
                   min_sup=args.min_sup,
                   min_conf=args.min_conf,
                   min_len=args.min_len,
-                  max_len=args.max_len)
-    save_rules(rules)
+                  max_len=args.max_len,
+                  search=args.search,
+                  tidlist=args.tidlist,
+                  diffset=args.diffset,
+                  n_jobs=args.jobs,
+                  itemsets=args.itemsets,
+                  reorder=args.reorder,
+                  generalized=args.generalized,
+                  top_k=args.top_k,
+                  rank_by=args.rank_by,
+                  cache=cache,
+                  monitor=monitor,
+                  sample=args.sample,
+                  seed=args.seed,
+                  verify=args.verify,
+                  measures=bool(measures),
+                  min_measures=min_measures,
+                  lazy=True)
+    n_rules = save_rules(rules, output_format=args.output_format, measures=measures)
+    logger.info(f'\nRules saved - number of rules: {n_rules}.')
+    if args.stats:
+        save_stats(monitor, args.stats)
+
+
+def update_state(args: argparse.Namespace, cache: MiningCache = None) -> tuple[MiningState, object]:
+    """
+    Append --data to the mining state saved in --state, or mine it into a new state if there is none.
+
+    Parameters are checked against the state first, so that a run which cannot use the state leaves it unchanged.
+    """
+    if not args.data:
+        raise ValueError('Parameter --state requires --data with transactions to mine or append.')
+    exists = os.path.exists(args.state)
+    state = MiningState.load(args.state) if exists else None
+    check_state(state.min_sup if exists else None, args.min_sup, args.top_k, args.itemsets, args.reorder,
+                args.generalized, cache, args.sample)
+    if not exists:
+        transactions, taxonomy = load_dataset(args.data, args.taxonomy, 'stream', input_format=args.format)
+        state = mining_state(transactions, args.min_sup, tidlist=args.tidlist, diffset=args.diffset,
+                             n_jobs=args.jobs)
+    else:
+        start_time = time.time()
+        taxonomy = load_dataframe(args.taxonomy, is_taxonomy=True) if args.taxonomy else None
+        n_new = state.append(read_transactions(args.data, args.format))
+        logger.info(f'\nTransactions appended - number of transactions: {len(state)}, new frequent itemsets: {n_new}.'
+                    f'\nCompleted in {time.time()-start_time:.4f} sec.')
+    state.save(args.state)
+    return state, taxonomy
 
 
 if __name__ == "__main__":
     start_time = time.time()
     main()
-    print(f'\nTotal execution time: {time.time() - start_time:.4f} sec.')
+    logger.info(f'\nTotal execution time: {time.time() - start_time:.4f} sec.')
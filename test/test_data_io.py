@@ -0,0 +1,84 @@
+import io
+import os
+import logging
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from core.eclat import get_tidlists, frequent_itemsets
+from core.VerticalData import VerticalData
+from core.MappedVerticalData import MappedVerticalData
+from utils.data_io import load_dataset, load_vertical, load_dataframe, load_mapped
+
+
+class TestDataIO(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, 'transactions.txt')
+        with open(self.filepath, 'w') as f:
+            f.write('1 2 3\n'
+                    '1 2 3\n'
+                    '\n'
+                    '1 2\n'
+                    '2 3 4 4\n'
+                    '1 3 4\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_vertical(self):
+        data = load_vertical(self.filepath)
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data.items(), [1, 2, 3, 4])
+        self.assertEqual(list(data.tidlists[4]), [3, 4])
+
+    def test_load_logged(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), self.assertLogs('eclat', level=logging.INFO) as logs:
+            load_dataset(self.filepath, loader='mmap')
+
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertTrue(any('Vertical database built' in message for message in logs.output))
+        self.assertTrue(any('Dataset loaded' in message for message in logs.output))
+
+    def test_load_vertical_min_sup(self):
+        data = load_vertical(self.filepath, min_sup=2)
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data.items(), [1, 2, 3])
+
+    def test_vertical_tidlists(self):
+        data = load_vertical(self.filepath)
+        expected = get_tidlists(load_dataframe(self.filepath), 1)
+        self.assertEqual(get_tidlists(data, 1), expected)
+
+    def test_vertical_frequent(self):
+        data = load_vertical(self.filepath)
+        expected = frequent_itemsets(load_dataframe(self.filepath), 1)
+        self.assertEqual(frequent_itemsets(data, 1), expected)
+        self.assertEqual(frequent_itemsets(data, 1, search='dfs', tidlist='bitset'), expected)
+
+    def test_from_transactions(self):
+        data = VerticalData.from_transactions([[5, 1], [1], []])
+        self.assertEqual(len(data), 3)
+        self.assertEqual({item: list(tids) for item, tids in data.tidlists.items()}, {1: [0, 1], 5: [0]})
+
+    def test_load_mapped(self):
+        data = load_mapped(self.filepath)
+        expected = load_vertical(self.filepath)
+
+        self.assertIsInstance(data, MappedVerticalData)
+        self.assertTrue(os.path.exists(self.filepath + '.vdb'))
+        self.assertEqual(len(data), 5)
+        self.assertEqual({item: tids.tolist() for item, tids in data.tidlists.items()},
+                         {item: list(tids) for item, tids in expected.tidlists.items()})
+        self.assertEqual(load_mapped(self.filepath + '.vdb', min_sup=2).items(), [1, 2, 3])
+
+    def test_mapped_frequent(self):
+        data = load_mapped(self.filepath)
+        expected = frequent_itemsets(load_dataframe(self.filepath), 1)
+        for tidlist in ('set', 'bitset', 'array'):
+            self.assertEqual(frequent_itemsets(data, 1, search='dfs', tidlist=tidlist), expected)
+        self.assertEqual(frequent_itemsets(data, 1, search='dfs', tidlist='array', diffset='on'), expected)
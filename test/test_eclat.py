@@ -1,8 +1,9 @@
 import io
 import pandas as pd
 from unittest import TestCase
+from itertools import combinations
 
-from core.eclat import get_tidlists, frequent_itemsets, rule_gen, hierarchy_rule, eclat
+from core.eclat import get_tidlists, frequent_itemsets, rule_gen, iter_rules, hierarchy_rule, eclat
 from core.AssociationRule import AssociationRule
 
 
@@ -34,6 +35,91 @@ class TestEclat(TestCase):
         expected_sup = {(1,): 3, (2,): 2, (1, 2): 2}
         self.assertEqual(sup_dict, expected_sup)
 
+    def test_frequent_dfs(self):
+        s = '1 2 3\n' \
+            '1 2 3\n' \
+            '1 2\n' \
+            '2 3 4\n' \
+            '1 3 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(3))
+        expected_frequent, expected_sup = frequent_itemsets(transactions, min_sup=1)
+        frequent, sup_dict = frequent_itemsets(transactions, min_sup=1, search='dfs')
+
+        self.assertEqual(frequent, expected_frequent)
+        self.assertEqual(sup_dict, expected_sup)
+        self.assertEqual(frequent[2], [(1, 2, 3)])
+
+    def test_frequent_dfs_empty(self):
+        s = '1 2\n' \
+            '1 3'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(2))
+        frequent, sup_dict = frequent_itemsets(transactions, min_sup=2, search='dfs')
+
+        self.assertEqual(frequent, [])
+        self.assertEqual(sup_dict, {})
+
+    def test_frequent_diffset(self):
+        data = [('1 2\n1 2\n1 3', 2, 1),
+                ('1 2\n1 2\n1 3', 2, 0),
+                ('1 2\n1 2\n1 2 3\n2 3', 3, 2),
+                ('1 2 3\n1 2 3\n1 2\n2 3 4\n1 3 4', 3, 1),
+                ('1 2 3 4\n1 2 3 4\n1 2 3 4\n1 2 3\n2 3 4', 4, 0)]
+        for s, n_columns, min_sup in data:
+            file = io.StringIO(s)
+            transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(n_columns))
+            expected = frequent_itemsets(transactions, min_sup=min_sup)
+            for diffset in ('on', 'auto'):
+                for tidlist in ('set', 'bitset'):
+                    result = frequent_itemsets(transactions, min_sup=min_sup, search='dfs', tidlist=tidlist,
+                                               diffset=diffset)
+                    self.assertEqual(result, expected)
+
+    def test_frequent_diffset_bfs(self):
+        s = '1 2\n' \
+            '1 3'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(2))
+        self.assertRaises(ValueError, frequent_itemsets, transactions, 0, diffset='on')
+
+    def test_frequent_parallel(self):
+        s = '1 2 3 4\n' \
+            '1 2 3 4\n' \
+            '1 2 3\n' \
+            '2 3 4\n' \
+            '1 3 4\n' \
+            '1 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(4))
+        expected = frequent_itemsets(transactions, min_sup=1)
+        for n_jobs in (2, 3):
+            result = frequent_itemsets(transactions, min_sup=1, search='dfs', diffset='auto', n_jobs=n_jobs)
+            self.assertEqual(result, expected)
+
+    def test_frequent_closed(self):
+        data = [('1 2\n1 2\n1 3', 2, 0),
+                ('1 2\n1 2\n1 2 3\n2 3', 3, 0),
+                ('1 2 3\n1 2 3\n1 2\n2 3 4\n1 3 4', 3, 1),
+                ('1 2 3 4\n1 2 3 4\n1 2 3 4\n1 2 3\n2 3 4\n1 4\n2 4', 4, 0)]
+        for s, n_columns, min_sup in data:
+            file = io.StringIO(s)
+            transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(n_columns))
+            _, expected_sup = frequent_itemsets(transactions, min_sup=min_sup)
+            expected_closed = {itemset for itemset, sup in expected_sup.items()
+                               if not any(set(itemset) < set(other) and sup == other_sup
+                                          for other, other_sup in expected_sup.items())}
+            expected_maximal = {itemset for itemset in expected_sup
+                                if not any(set(itemset) < set(other) for other in expected_sup)}
+            for tidlist in ('set', 'bitset'):
+                closed, sup_dict = frequent_itemsets(transactions, min_sup=min_sup, tidlist=tidlist, itemsets='closed')
+                maximal, _ = frequent_itemsets(transactions, min_sup=min_sup, tidlist=tidlist, itemsets='maximal')
+
+                self.assertEqual({itemset for row in closed for itemset in row}, expected_closed)
+                self.assertEqual({itemset for row in maximal for itemset in row}, expected_maximal)
+                self.assertEqual({itemset: sup_dict[itemset] for itemset in expected_sup}, expected_sup)
+                self.assertNotIn((5,), sup_dict)
+
     def test_rule_gen(self):
         s = '1 2\n' \
             '1 2\n' \
@@ -59,6 +145,39 @@ class TestEclat(TestCase):
         expected = AssociationRule((2,), (1,), 2, 2/2)
         self.assertEqual(set(rules), {expected})
 
+    def test_rule_gen_all_successors(self):
+        s = '1 2 3 4\n' \
+            '1 2 3 4\n' \
+            '1 2 3\n' \
+            '2 3 4\n' \
+            '1 3 4\n' \
+            '1 4\n' \
+            '2 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(4))
+        frequent, sup_dict = frequent_itemsets(transactions, min_sup=0)
+        for min_conf in (0.0, 0.4, 0.6, 0.8):
+            expected = set()
+            for itemset in sup_dict:
+                for suc_len in range(1, len(itemset)):
+                    for suc in combinations(itemset, suc_len):
+                        pred = tuple(item for item in itemset if item not in suc)
+                        conf = sup_dict[itemset]/sup_dict[pred]
+                        if conf > min_conf:
+                            expected.add((pred, suc, sup_dict[itemset], conf))
+            rules = rule_gen(frequent, sup_dict, min_conf=min_conf, min_len=1)
+            self.assertEqual({(r._pred, r._suc, r._sup, r._conf) for r in rules}, expected)
+            self.assertEqual(len(rules), len(expected))
+
+    def test_iter_rules(self):
+        frequent = [[(1,), (2,)], [(1, 2)]]
+        sup_dict = {(1,): 3, (2,): 2, (1, 2): 2}
+        rules = iter_rules(frequent, sup_dict, min_conf=0.9, min_len=1)
+
+        self.assertEqual(next(rules), AssociationRule((2,), (1,), 2, 2/2))
+        self.assertRaises(StopIteration, next, rules)
+        self.assertRaises(ValueError, iter_rules, frequent, sup_dict, 1.5, 1)
+
     def test_hierarchy_rule(self):
         s = '1 2\n' \
             '1 2\n' \
@@ -127,3 +246,94 @@ class TestEclat(TestCase):
         expected5 = AssociationRule((1,), (22,), 3, 3/3)
         expected6 = AssociationRule((2,), (22,), 4, 4/4)
         self.assertEqual(set(rules), {expected1, expected2, expected3, expected4, expected5, expected6})
+
+    def test_eclat_lazy(self):
+        s = '1 2\n' \
+            '1 2\n' \
+            '1 2 3\n' \
+            '2 3'
+        t = '1,11\n' \
+            '2,11\n' \
+            '3,33\n' \
+            '11,22'
+        file = io.StringIO(s)
+        tax_file = io.StringIO(t)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(3))
+        taxonomy = pd.read_csv(tax_file, sep=',', header=None, names=['child', 'parent'])
+        expected = eclat(transactions, taxonomy, min_sup=2, min_conf=0.7, min_len=1)
+        rules = eclat(transactions, taxonomy, min_sup=2, min_conf=0.7, min_len=1, lazy=True)
+
+        self.assertNotIsInstance(rules, list)
+        self.assertEqual(list(rules), list(expected))
+
+    def test_eclat_closed(self):
+        s = '1 2 3 4\n' \
+            '1 2 3 4\n' \
+            '1 2 3\n' \
+            '2 3 4\n' \
+            '1 3 4\n' \
+            '1 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(4))
+        all_rules = eclat(transactions, min_sup=0, min_conf=0.5, min_len=1)
+        rules = eclat(transactions, min_sup=0, min_conf=0.5, min_len=1, itemsets='closed')
+
+        closed_rules = {(r._pred, r._suc): (r._sup, r._conf) for r in rules}
+        for rule in rules:
+            self.assertIn(rule, all_rules)
+        for rule in all_rules:
+            self.assertTrue(any(pred == rule._pred and set(rule._suc) <= set(suc) and value == (rule._sup, rule._conf)
+                                for (pred, suc), value in closed_rules.items()))
+
+    def test_eclat_closed_hierarchy(self):
+        s = '1 2 3\n' \
+            '1 2 3\n' \
+            '1 2 3\n' \
+            '1 4\n' \
+            '2 4'
+        t = '1,11\n' \
+            '2,11\n' \
+            '4,44'
+        transactions = pd.read_csv(io.StringIO(s), index_col=None, sep=' ', names=range(3))
+        taxonomy = pd.read_csv(io.StringIO(t), sep=',', header=None, names=['child', 'parent'])
+        expected = {rule for rule in eclat(transactions, taxonomy, min_sup=0, min_conf=0.5) if rule._suc == (11,)}
+
+        self.assertEqual(len(expected), 2)
+        for itemsets in ('closed', 'maximal'):
+            for reorder in (False, True):
+                rules = eclat(transactions, taxonomy, min_sup=0, min_conf=0.5, itemsets=itemsets, reorder=reorder)
+                self.assertEqual({rule for rule in rules if rule._suc == (11,)}, expected)
+
+    def test_eclat_top_k(self):
+        s = '1 2 3 4\n' \
+            '1 2 3 4\n' \
+            '1 2 3\n' \
+            '2 3 4\n' \
+            '1 3 4\n' \
+            '1 4\n' \
+            '2 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(4))
+        all_rules = eclat(transactions, min_sup=0, min_conf=0.0, min_len=1)
+        for rank_by in ('confidence', 'support'):
+            for top_k in (1, 5, 12, 1000):
+                for tidlist in ('set', 'bitset'):
+                    rules = eclat(transactions, min_sup=0, min_conf=0.0, min_len=1, top_k=top_k, rank_by=rank_by,
+                                  tidlist=tidlist)
+                    if rank_by == 'confidence':
+                        keys = sorted(((r._conf, r._sup) for r in all_rules), reverse=True)
+                        result = [(r._conf, r._sup) for r in rules]
+                    else:
+                        keys = sorted(((r._sup, r._conf) for r in all_rules), reverse=True)
+                        result = [(r._sup, r._conf) for r in rules]
+                    self.assertEqual(result, keys[:top_k])
+                    self.assertTrue(set(rules) <= set(all_rules))
+
+    def test_eclat_top_k_invalid(self):
+        s = '1 2\n' \
+            '1 3'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(2))
+        self.assertRaises(ValueError, eclat, transactions, top_k=0)
+        self.assertRaises(ValueError, eclat, transactions, top_k=1, rank_by='lift')
+        self.assertRaises(ValueError, eclat, transactions, top_k=1, search='dfs', diffset='on')
@@ -0,0 +1,62 @@
+import io
+import pandas as pd
+from unittest import TestCase
+
+from core.eclat import frequent_itemsets, eclat
+from core.AssociationRule import AssociationRule
+from core.ItemEncoder import ItemEncoder
+from core.RuleSet import RuleSet
+from core.VerticalData import VerticalData
+
+
+class TestItemEncoder(TestCase):
+
+    def setUp(self):
+        s = '30 10 20\n' \
+            '30 10 20\n' \
+            '30 10\n' \
+            '10 20 40\n' \
+            '30 20 40\n' \
+            '30 50'
+        self.transactions = pd.read_csv(io.StringIO(s), index_col=None, sep=' ', names=range(3))
+
+    def test_fit(self):
+        encoder = ItemEncoder.fit(self.transactions, min_sup=1)
+        vertical = VerticalData.from_transactions([[30, 10, 20], [30, 10, 20], [30, 10], [10, 20, 40], [30, 20, 40],
+                                                   [30, 50]])
+
+        self.assertEqual(encoder.items.tolist(), [40, 10, 20, 30])
+        self.assertEqual(ItemEncoder.fit(vertical, min_sup=1).items.tolist(), [40, 10, 20, 30])
+        self.assertEqual(encoder.encode(vertical).tidlists[0].tolist(), [3, 4])
+
+    def test_encode_decode(self):
+        encoder = ItemEncoder.fit(self.transactions, min_sup=1)
+        frequent, sup_dict = frequent_itemsets(encoder.encode(self.transactions), min_sup=1)
+        _, expected_sup = frequent_itemsets(self.transactions, min_sup=1)
+
+        self.assertEqual({encoder.decode(itemset): sup for itemset, sup in sup_dict.items()}, expected_sup)
+        rules = RuleSet([AssociationRule((3, 0), (1,), 2, 1.0), AssociationRule((2,), (3, 1), 2, 0.5)])
+        decoded = [(rule._pred, rule._suc) for rule in encoder.decode_rules(rules)]
+        self.assertEqual(decoded, [((30, 40), (10,)), ((20,), (10, 30))])
+        self.assertEqual(encoder.decode_rule(rules[1]), AssociationRule((20,), (10, 30), 2, 0.5))
+
+    def test_candidates(self):
+        encoder = ItemEncoder.fit(self.transactions, min_sup=0)
+        _, sup_dict = frequent_itemsets(encoder.encode(self.transactions), min_sup=0)
+        n_candidates, n_original = encoder.candidates(sup_dict)
+
+        self.assertEqual(n_original, 10 + 3 + 1 + 1 + 1)
+        self.assertLessEqual(n_candidates, n_original)
+
+    def test_eclat_reorder(self):
+        t = '10,11\n' \
+            '20,11\n' \
+            '40,33\n' \
+            '11,22\n' \
+            '30,22'
+        taxonomy = pd.read_csv(io.StringIO(t), sep=',', header=None, names=['child', 'parent'])
+        for kwargs in ({}, {'lazy': True}, {'itemsets': 'closed'}, {'search': 'dfs', 'diffset': 'auto'}):
+            expected = eclat(self.transactions, taxonomy, min_sup=0, min_conf=0.3, **kwargs)
+            rules = eclat(self.transactions, taxonomy, min_sup=0, min_conf=0.3, reorder=True, **kwargs)
+            self.assertEqual({(r._pred, r._suc, r._sup, r._conf) for r in rules},
+                             {(r._pred, r._suc, r._sup, r._conf) for r in expected})
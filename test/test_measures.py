@@ -0,0 +1,150 @@
+import io
+import os
+import math
+import tempfile
+import importlib.util
+import numpy as np
+import pandas as pd
+from unittest import TestCase, skipUnless
+
+from core.eclat import eclat
+from core.measures import MEASURES, rule_measures, measure_mask, check_thresholds
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+from utils.rule_writer import RuleWriter
+
+has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+
+
+class TestMeasures(TestCase):
+
+    def setUp(self):
+        s = '1 2 3\n' \
+            '1 2\n' \
+            '1 2 4\n' \
+            '2 3\n' \
+            '3 4\n' \
+            '1 3 4'
+        t = '1,11\n' \
+            '2,11\n' \
+            '3,33\n' \
+            '4,33'
+        self.transactions = pd.read_csv(io.StringIO(s), index_col=None, sep=' ', names=range(3))
+        self.taxonomy = pd.read_csv(io.StringIO(t), sep=',', header=None, names=['child', 'parent'])
+
+    def support(self, itemset: tuple) -> int:
+        rows = [set(row) for row in self.transactions.itertuples(index=False)]
+        return sum(set(itemset) <= row for row in rows)
+
+    def test_rule_measures(self):
+        measures = rule_measures(np.array([3, 2]), np.array([0.75, 1.0]), np.array([4, 2]), 6)
+
+        np.testing.assert_allclose(measures['lift'], [0.75 / (4/6), 1.0 / (2/6)])
+        np.testing.assert_allclose(measures['leverage'], [3/6 - 4/6 * 4/6, 2/6 - 2/6 * 2/6])
+        np.testing.assert_allclose(measures['conviction'], [(1 - 4/6) / 0.25, math.inf])
+
+    def test_measure_mask(self):
+        measures = {'lift': np.array([0.5, 1.5, 2.0]), 'leverage': np.array([0.1, -0.1, 0.2])}
+        mask = measure_mask(measures, {'lift': 1.0, 'leverage': 0.0})
+
+        self.assertEqual(mask.tolist(), [False, False, True])
+
+    def test_check_thresholds(self):
+        check_thresholds({'lift': 1.0})
+        with self.assertRaises(ValueError):
+            check_thresholds({'interest': 1.0})
+
+    def test_eclat_measures(self):
+        rules = eclat(self.transactions, min_sup=1, min_conf=0.5, measures=True)
+
+        self.assertEqual(tuple(rules.measures), MEASURES)
+        p_suc = np.array([self.support(rules.suc(i)) for i in range(len(rules))]) / 6
+        conf = rules.confidence
+        np.testing.assert_allclose(rules.measures['lift'], conf / p_suc)
+        np.testing.assert_allclose(rules.measures['leverage'], rules.support / 6 - rules.support / conf / 6 * p_suc)
+        with np.errstate(divide='ignore'):
+            np.testing.assert_allclose(rules.measures['conviction'], (1 - p_suc) / (1 - conf))
+
+    def test_eclat_min_measures(self):
+        all_rules = eclat(self.transactions, min_sup=1, min_conf=0.3, measures=True)
+        expected = all_rules.filter((all_rules.measures['lift'] > 1.0) & (all_rules.measures['leverage'] > 0.0))
+        rules = eclat(self.transactions, min_sup=1, min_conf=0.3, min_measures={'lift': 1.0, 'leverage': 0.0})
+
+        self.assertGreater(len(all_rules), len(rules))
+        self.assertEqual(list(rules), list(expected))
+        np.testing.assert_allclose(rules.measures['conviction'], expected.measures['conviction'])
+
+    def test_eclat_lazy_measures(self):
+        expected = eclat(self.transactions, self.taxonomy, min_sup=1, min_conf=0.5, measures=True)
+        rules = eclat(self.transactions, self.taxonomy, min_sup=1, min_conf=0.5, measures=True, lazy=True)
+        batches = list(rules.batches())
+
+        self.assertEqual(rules.measures, MEASURES)
+        self.assertEqual(list(RuleSet.concat(batches)), list(expected))
+        np.testing.assert_allclose(RuleSet.concat(batches).measures['lift'], expected.measures['lift'])
+
+    def test_eclat_hierarchy_measures(self):
+        rules = eclat(self.transactions, self.taxonomy, min_sup=1, min_conf=0.5, min_measures={'lift': 10.0})
+
+        # ancestors are not mined without generalized, their rules are kept with unknown measures
+        self.assertTrue(len(rules) > 0)
+        self.assertTrue(all(rules.suc(i)[0] in (11, 33) for i in range(len(rules))))
+        self.assertTrue(np.isnan(rules.measures['lift']).all())
+
+    def test_eclat_generalized_measures(self):
+        rules = eclat(self.transactions, self.taxonomy, min_sup=1, min_conf=0.5, generalized=True, measures=True)
+
+        self.assertFalse(np.isnan(rules.measures['lift']).any())
+
+    def test_eclat_measures_invalid(self):
+        with self.assertRaises(ValueError):
+            eclat(self.transactions, min_sup=1, min_measures={'interest': 1.0})
+        with self.assertRaises(ValueError):
+            eclat(self.transactions, min_sup=1, measures=True, top_k=3)
+
+    def test_writer_measures(self):
+        rules = eclat(self.transactions, min_sup=1, min_conf=0.5, measures=True, lazy=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'rules.csv')
+            with RuleWriter(filepath, 'csv', batch_size=2, measures=MEASURES) as writer:
+                n_rules = writer.write(rules)
+            with open(filepath) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(lines[0], 'predecessor;successor;support;confidence;lift;leverage;conviction')
+        self.assertEqual(len(lines), n_rules + 1)
+        self.assertTrue(all(len(line.split(';')) == 7 for line in lines[1:]))
+
+    def test_writer_missing_measures(self):
+        rules = RuleSet([AssociationRule((1,), (2,), 3, 0.75)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'rules.csv')
+            with RuleWriter(filepath, 'csv', measures=('lift',)) as writer:
+                writer.write(rules)
+            with open(filepath) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(lines[1], '1;2;3;0.7500;nan')
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_parquet_measures(self):
+        import pyarrow.parquet as pq
+        rules = eclat(self.transactions, min_sup=1, min_conf=0.5, measures=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'rules.parquet')
+            with RuleWriter(filepath, 'parquet', batch_size=2, measures=MEASURES) as writer:
+                writer.write(rules)
+            table = pq.read_table(filepath)
+
+        self.assertEqual(table.column_names[-3:], list(MEASURES))
+        np.testing.assert_allclose(table.column('lift').to_numpy(), rules.measures['lift'])
+
+    def test_rule_set_concat(self):
+        first = RuleSet([AssociationRule((1,), (2,), 3, 0.75)])
+        first.set_measures({'lift': np.array([1.5])})
+        second = RuleSet([AssociationRule((1, 2), (3,), 2, 1.0), AssociationRule((3,), (1, 2), 2, 0.5)])
+        rules = RuleSet.concat([first, second])
+
+        self.assertEqual(list(rules), list(first) + list(second))
+        self.assertEqual(rules.measures['lift'][0], 1.5)
+        self.assertTrue(np.isnan(rules.measures['lift'][1:]).all())
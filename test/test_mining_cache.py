@@ -0,0 +1,77 @@
+import os
+import tempfile
+import pandas as pd
+from unittest import TestCase, mock
+
+from core.eclat import frequent_itemsets, eclat
+from core.MiningCache import MiningCache, file_fingerprint
+
+
+class TestMiningCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, 'transactions.txt')
+        with open(self.filepath, 'w') as f:
+            f.write('1 2 3\n'
+                    '1 2 3\n'
+                    '1 2\n'
+                    '2 3 4\n'
+                    '1 3 4\n')
+        self.transactions = pd.read_csv(self.filepath, index_col=None, sep=' ', names=range(3))
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+        cache = MiningCache.for_file(self.cache_dir, self.filepath)
+        self.assertIsNone(cache.get(0))
+        cache.put(0, *frequent_itemsets(self.transactions, 0))
+
+        self.assertEqual(cache.get(0), frequent_itemsets(self.transactions, 0))
+        for min_sup in (1, 2, 3):
+            expected_frequent, expected_sup = frequent_itemsets(self.transactions, min_sup)
+            frequent, sup_dict = cache.get(min_sup)
+            self.assertEqual(sup_dict, expected_sup)
+            self.assertEqual([sorted(row) for row in frequent], [sorted(row) for row in expected_frequent])
+        self.assertFalse(MiningCache(self.cache_dir, 'other').contains(5))
+
+    def test_fingerprint(self):
+        fingerprint = file_fingerprint(self.filepath)
+        with open(self.filepath, 'a') as f:
+            f.write('1 4\n')
+        self.assertNotEqual(file_fingerprint(self.filepath), fingerprint)
+
+    def test_eviction(self):
+        cache = MiningCache(self.cache_dir, 'data', max_size=1)
+        cache.put(1, *frequent_itemsets(self.transactions, 1))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+        cache = MiningCache(self.cache_dir, 'data')
+        cache.put(1, *frequent_itemsets(self.transactions, 1))
+        cache.put(0, *frequent_itemsets(self.transactions, 0))
+        size = os.path.getsize(os.path.join(self.cache_dir, 'data_0.pkl'))
+        os.utime(os.path.join(self.cache_dir, 'data_1.pkl'), (0, 0))
+        MiningCache(self.cache_dir, 'data', max_size=size).put(0, *frequent_itemsets(self.transactions, 0))
+        self.assertEqual(os.listdir(self.cache_dir), ['data_0.pkl'])
+
+    def test_put_interrupted(self):
+        cache = MiningCache(self.cache_dir, 'data')
+        cache.put(1, *frequent_itemsets(self.transactions, 1))
+        with mock.patch('core.MiningCache.pickle.dump', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, cache.put, 1, *frequent_itemsets(self.transactions, 0))
+
+        self.assertEqual(os.listdir(self.cache_dir), ['data_1.pkl'])
+        self.assertEqual(cache.get(1), frequent_itemsets(self.transactions, 1))
+
+    def test_eclat_cache(self):
+        cache = MiningCache.for_file(self.cache_dir, self.filepath)
+        expected = eclat(self.transactions, min_sup=1, min_conf=0.5, cache=cache)
+        rules = eclat(None, min_sup=1, min_conf=0.5, cache=cache)
+
+        self.assertEqual(list(rules), list(expected))
+        self.assertEqual(set(eclat(None, min_sup=2, min_conf=0.7, cache=cache)),
+                         set(eclat(self.transactions, min_sup=2, min_conf=0.7)))
+        self.assertRaises(ValueError, eclat, None, min_sup=0, cache=cache)
+        self.assertRaises(ValueError, eclat, self.transactions, min_sup=1, cache=cache, reorder=True)
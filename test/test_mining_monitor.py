@@ -0,0 +1,82 @@
+import io
+import logging
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import TestCase, mock
+
+from core.eclat import eclat, frequent_itemsets
+from core.MiningMonitor import LevelStats, MiningMonitor
+from core.VerticalData import VerticalData
+from utils.synthetic import quest_transactions
+
+
+class TestMiningMonitor(TestCase):
+
+    def setUp(self):
+        self.data = VerticalData.from_transactions(quest_transactions(n_transactions=500, n_items=30, avg_len=6))
+
+    def mine_stats(self, **kwargs) -> list[dict]:
+        stats = LevelStats()
+        frequent, _ = frequent_itemsets(self.data, 10, stats=stats, **kwargs)
+        records = stats.records()
+        self.assertEqual([record['length'] for record in records][:len(frequent)-1], list(range(2, len(frequent)+1)))
+        for record, itemsets in zip(records, frequent[1:]):
+            self.assertEqual(record['candidates'] - record['pruned'], len(itemsets))
+        return records
+
+    def test_level_stats(self):
+        counts = ('candidates', 'pruned', 'bounded', 'intersections')
+        bfs = self.mine_stats(search='bfs')
+        self.assertGreater(len(bfs), 1)
+        for search, kwargs in [('dfs', {}), ('dfs', dict(n_jobs=2)), ('dfs', dict(tidlist='array'))]:
+            dfs = self.mine_stats(search=search, **kwargs)
+            self.assertEqual([[record[key] for key in counts] for record in dfs],
+                             [[record[key] for key in counts] for record in bfs])
+        for record in bfs:
+            self.assertEqual(record['candidates'], record['intersections'] + record['bounded'])
+            self.assertGreaterEqual(record['elapsed'], 0.0)
+            self.assertGreaterEqual(record['avg_tidlist_length'], 0.0)
+        self.mine_stats(search='dfs', diffset='auto')
+
+    def test_pair_counts_stats(self):
+        records = self.mine_stats(search='dfs', pair_counts=False)
+        self.assertTrue(all(record['bounded'] == 0 for record in records))
+        bounded = self.mine_stats(search='dfs')
+        self.assertGreater(bounded[0]['bounded'], 0)
+        self.assertEqual(bounded[0]['intersections'], bounded[0]['candidates'] - bounded[0]['pruned'])
+
+    def test_excluded(self):
+        stats = LevelStats()
+        frequent_itemsets(self.data, 10, excluded=frozenset({(0, 1), (1, 0)}), stats=stats)
+        record = stats.records()[0]
+        self.assertEqual(record['candidates'] - record['intersections'] - record['bounded'], 1)
+
+    def test_opt_in_stats(self):
+        with mock.patch('core.MiningMonitor.peak_rss', return_value=None) as rss, \
+                mock.patch.object(LevelStats, 'add') as add:
+            eclat(self.data, min_sup=10, search='dfs')
+        self.assertEqual(add.call_count, 0)
+        # once for each of the mining and rules phases
+        self.assertEqual(rss.call_count, 2)
+
+        with mock.patch('core.MiningMonitor.peak_rss', return_value=None) as rss:
+            records = self.mine_stats(search='dfs')
+        self.assertEqual(rss.call_count, len(records))
+
+    def test_monitor(self):
+        records = []
+        monitor = MiningMonitor(callbacks=[records.append])
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            rules = eclat(self.data, min_sup=10, min_conf=0.5, search='dfs', monitor=monitor)
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertEqual(stderr.getvalue(), '')
+        self.assertEqual([record['phase'] for record in monitor.phases], ['mining', 'rules'])
+        self.assertEqual(monitor.phases[1]['n_rules'], len(rules))
+        self.assertTrue(all(record['phase'] == 'mining' and 'length' in record for record in monitor.levels))
+        self.assertEqual(records, monitor.levels + monitor.phases)
+
+        monitor = MiningMonitor()
+        with self.assertLogs('eclat', level=logging.INFO) as logs:
+            n_rules = sum(1 for _ in eclat(self.data, min_sup=10, lazy=True, monitor=monitor))
+        self.assertEqual(monitor.phases[-1]['n_rules'], n_rules)
+        self.assertTrue(any('Frequent itemsets mined' in message for message in logs.output))
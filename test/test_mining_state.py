@@ -0,0 +1,58 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from core.eclat import frequent_itemsets, mining_state, eclat
+from core.MiningState import MiningState
+from core.VerticalData import VerticalData
+from main import parse_args, update_state
+
+
+class TestMiningState(TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.transactions = [rng.sample(range(8), rng.randint(1, 5)) for _ in range(60)]
+        self.transactions += [[8, 9, 1]] * 6
+
+    def test_append(self):
+        for min_sup in (2, 5, 10):
+            _, expected = frequent_itemsets(VerticalData.from_transactions(self.transactions), min_sup)
+            state = mining_state(VerticalData.from_transactions(self.transactions[:20]), min_sup)
+            state.append(self.transactions[20:45])
+            state.append(self.transactions[45:])
+
+            self.assertEqual(len(state), len(self.transactions))
+            self.assertEqual(state.sup_dict, expected)
+            for itemset, sup in state.border.items():
+                self.assertLessEqual(sup, min_sup)
+                for i in range(len(itemset)):
+                    self.assertTrue(len(itemset) == 1 or itemset[:i] + itemset[i+1:] in expected)
+
+    def test_save_load(self):
+        state = mining_state(VerticalData.from_transactions(self.transactions[:30]), 3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'state.pkl')
+            state.save(filepath)
+            loaded = MiningState.load(filepath)
+        loaded.append(self.transactions[30:])
+        expected = eclat(VerticalData.from_transactions(self.transactions), min_sup=3, min_conf=0.6)
+
+        self.assertEqual(set(eclat(loaded, min_sup=3, min_conf=0.6)), set(expected))
+        self.assertRaises(ValueError, eclat, loaded, min_sup=2)
+
+    def test_update_state_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = os.path.join(tmp_dir, 'state.pkl')
+            data_path = os.path.join(tmp_dir, 'batch.txt')
+            with open(data_path, 'w') as f:
+                f.write(''.join(' '.join(map(str, transaction)) + '\n' for transaction in self.transactions[:6]))
+            mining_state(VerticalData.from_transactions(self.transactions[:6]), 1).save(state_path)
+            for argv in (['--min_sup', '2'], ['--min_sup', '1', '--reorder'], ['--min_sup', '1', '--top_k', '5'],
+                         ['--min_sup', '1', '--sample', '0.5']):
+                args = parse_args(['--data', data_path, '--state', state_path] + argv)
+                self.assertRaises(ValueError, update_state, args)
+                self.assertEqual(len(MiningState.load(state_path)), 6)
+            update_state(parse_args(['--data', data_path, '--state', state_path, '--min_sup', '1']))
+            self.assertEqual(len(MiningState.load(state_path)), 12)
@@ -0,0 +1,122 @@
+import os
+import gzip
+import tempfile
+import importlib.util
+import numpy as np
+from unittest import TestCase, skipUnless
+
+from core.eclat import frequent_itemsets
+from core.VerticalData import VerticalData
+from utils.data_io import load_dataset, load_vertical, load_mapped
+from utils.readers import read_transactions, read_vertical, pairs_to_transactions
+
+has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+
+
+class TestReaders(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.transactions = [[1, 2, 3], [1, 2, 3], [1, 2], [2, 3, 4], [1, 3, 4]]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename: str, content: str) -> str:
+        filepath = os.path.join(self.tmp_dir.name, filename)
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filepath, 'wt') as f:
+            f.write(content)
+        return filepath
+
+    def write_long(self, filename: str) -> str:
+        lines = ['transaction_id,item,quantity']
+        for tid, transaction in enumerate(self.transactions):
+            lines += [f'order{tid},{item},2' for item in transaction]
+        lines += ['order0,5,-1', 'order9,5,0']
+        return self.write(filename, '\n'.join(lines) + '\n')
+
+    def assertVertical(self, data: VerticalData):
+        expected = VerticalData.from_transactions(self.transactions)
+        self.assertEqual(len(data), len(expected))
+        self.assertEqual({item: list(tids) for item, tids in data.tidlists.items()},
+                         {item: list(tids) for item, tids in expected.tidlists.items()})
+
+    def test_read_gzip(self):
+        filepath = self.write('transactions.txt.gz', '1 2 3\n1 2 3\n\n1 2\n2 3 4\n1 3 4\n')
+
+        self.assertEqual(list(read_transactions(filepath)), self.transactions)
+        self.assertVertical(load_vertical(filepath))
+
+    def test_read_spmf(self):
+        filepath = self.write('transactions.txt', '@CONVERTED_FROM_TEXT\n'
+                                                  '# comment\n'
+                                                  '1 2 3:6:1 2 3\n'
+                                                  '1 2 3 5:6:1 2 3 0\n'
+                                                  '1 2:3:1 2\n'
+                                                  '2 3 4\n'
+                                                  '1 3 4:8:1 3 4\n')
+
+        self.assertEqual(list(read_transactions(filepath, 'spmf')), self.transactions)
+        self.assertVertical(read_vertical(filepath, 'spmf'))
+
+    def test_from_pairs(self):
+        tids = np.array([3, 1, 3, 1, 1, 7])
+        items = np.array([2, 1, 1, 2, 2, 1])
+        data = VerticalData.from_pairs(tids, items)
+
+        self.assertEqual(len(data), 3)
+        self.assertEqual({item: list(tids) for item, tids in data.tidlists.items()}, {1: [0, 1, 2], 2: [0, 1]})
+        self.assertEqual(VerticalData.from_pairs(tids, items, min_sup=2).items(), [1])
+        with self.assertRaises(ValueError):
+            VerticalData.from_pairs(tids, np.array(['a'] * 6))
+
+    def test_pairs_to_transactions(self):
+        transactions = pairs_to_transactions(np.array([3, 1, 3, 1]), np.array([2, 1, 1, 2]))
+        self.assertEqual(list(transactions), [[1, 2], [2, 1]])
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_read_csv(self):
+        for filename in ('orders.csv', 'orders.csv.gz'):
+            filepath = self.write_long(filename)
+
+            self.assertEqual(list(read_transactions(filepath, 'csv')), self.transactions)
+            self.assertVertical(read_vertical(filepath, 'csv'))
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_read_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tids = [tid for tid, transaction in enumerate(self.transactions) for _ in transaction]
+        items = [item for transaction in self.transactions for item in transaction]
+        filepath = os.path.join(self.tmp_dir.name, 'orders.parquet')
+        pq.write_table(pa.table({'transaction_id': tids, 'item': items}), filepath)
+
+        self.assertEqual(list(read_transactions(filepath, 'parquet')), self.transactions)
+        self.assertVertical(read_vertical(filepath, 'parquet'))
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_read_csv_missing_column(self):
+        filepath = self.write('orders.csv', 'order,item\n1,2\n')
+        with self.assertRaises(ValueError):
+            read_vertical(filepath, 'csv')
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_load_dataset_formats(self):
+        filepath = self.write_long('orders.csv')
+        expected = frequent_itemsets(VerticalData.from_transactions(self.transactions), 1)
+        for loader in ('pandas', 'stream', 'mmap'):
+            transactions, _ = load_dataset(filepath, loader=loader, input_format='csv')
+            self.assertIsInstance(transactions, VerticalData)
+            self.assertEqual(frequent_itemsets(transactions, 1), expected)
+
+    def test_load_mapped_spmf(self):
+        filepath = self.write('transactions.txt', '@CONVERTED_FROM_TEXT\n1 2 3\n1 2 3\n1 2\n2 3 4\n1 3 4\n')
+        data = load_mapped(filepath, input_format='spmf')
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(frequent_itemsets(data, 1), frequent_itemsets(read_vertical(filepath, 'spmf'), 1))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            read_transactions('transactions.txt', 'xml')
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import numpy as np
+from unittest import TestCase
+
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+
+
+class TestRuleSet(TestCase):
+
+    def setUp(self):
+        self.rules = [AssociationRule((1,), (2,), 3, 0.75),
+                      AssociationRule((1, 2), (3,), 2, 1.0),
+                      AssociationRule((3,), (1, 2), 2, 0.5)]
+
+    def test_iteration(self):
+        rule_set = RuleSet(self.rules)
+
+        self.assertEqual(len(rule_set), 3)
+        self.assertEqual(list(rule_set), self.rules)
+        rule = rule_set[-1]
+        self.assertEqual((rule._pred, rule._suc, rule._sup, rule._conf), ((3,), (1, 2), 2, 0.5))
+        self.assertRaises(IndexError, rule_set.__getitem__, 3)
+
+    def test_growth(self):
+        rule_set = RuleSet()
+        for i in range(100):
+            rule_set.append((i,), (i+1, i+2), i, i/100)
+
+        self.assertEqual(len(rule_set), 100)
+        self.assertEqual(rule_set.suc(99), (100, 101))
+        np.testing.assert_array_equal(rule_set.support, np.arange(100))
+
+    def test_filter_and_sort(self):
+        rule_set = RuleSet(self.rules)
+        filtered = rule_set.filter(rule_set.confidence > 0.6)
+        ordered = rule_set.sort_by_confidence()
+
+        self.assertEqual(list(filtered), self.rules[:2])
+        self.assertEqual(list(ordered), [self.rules[1], self.rules[0], self.rules[2]])
+        ascending = ordered.sort_by_confidence(descending=False)
+        self.assertEqual(list(ascending), [self.rules[2], self.rules[0], self.rules[1]])
+
+    def test_extend(self):
+        rule_set = RuleSet(self.rules[:1])
+        rule_set.extend(RuleSet(self.rules[1:]))
+        rule_set.add(AssociationRule((4,), (5,), 1, 0.1))
+
+        self.assertEqual(list(rule_set), self.rules + [AssociationRule((4,), (5,), 1, 0.1)])
+
+    def test_to_csv(self):
+        rule_set = RuleSet(self.rules)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'rules.csv')
+            rule_set.to_csv(filepath)
+            with open(filepath) as f:
+                lines = f.readlines()
+
+        self.assertEqual(lines[0], 'predecessor;successor;support;confidence\n')
+        self.assertEqual(lines[1:], [rule.csv_format() for rule in self.rules])
+
+    def test_rule_hash(self):
+        self.assertEqual(hash(AssociationRule((1,), (2,), 3, 0.75)), hash(AssociationRule((1,), (2,), 1, 0.1)))
+        self.assertFalse(hasattr(self.rules[0], '__dict__'))
@@ -0,0 +1,75 @@
+import os
+import gzip
+import tempfile
+import importlib.util
+from unittest import TestCase, skipUnless
+
+from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+from utils.rule_writer import RuleWriter
+
+has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+has_zstandard = importlib.util.find_spec('zstandard') is not None
+
+
+class TestRuleWriter(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rules = [AssociationRule((1,), (2,), 3, 0.75),
+                      AssociationRule((1, 2), (3,), 2, 1.0),
+                      AssociationRule((3,), (1, 2), 2, 0.5)]
+        self.csv = 'predecessor;successor;support;confidence\n' + ''.join(r.csv_format() for r in self.rules)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, output_format: str, rules) -> str:
+        filepath = os.path.join(self.tmp_dir.name, f'rules.{output_format}')
+        with RuleWriter(filepath, output_format, batch_size=2) as writer:
+            n_rules = writer.write(rules)
+        self.assertEqual(n_rules, len(self.rules))
+        return filepath
+
+    def test_csv(self):
+        filepath = self.write('csv', iter(self.rules))
+        with open(filepath) as f:
+            self.assertEqual(f.read(), self.csv)
+
+    def test_csv_rule_set(self):
+        filepath = self.write('csv', RuleSet(self.rules))
+        with open(filepath) as f:
+            self.assertEqual(f.read(), self.csv)
+
+    def test_csv_gz(self):
+        filepath = self.write('csv.gz', iter(self.rules))
+        with gzip.open(filepath, 'rt') as f:
+            self.assertEqual(f.read(), self.csv)
+
+    @skipUnless(has_zstandard, 'zstandard is not installed')
+    def test_csv_zst(self):
+        import zstandard
+        filepath = self.write('csv.zst', iter(self.rules))
+        with open(filepath, 'rb') as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        self.assertEqual(data.decode(), self.csv)
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_parquet(self):
+        import pyarrow.parquet as pq
+        filepath = self.write('parquet', iter(self.rules))
+        table = pq.read_table(filepath)
+        self.assertEqual(table.column('predecessor').to_pylist(), [[1], [1, 2], [3]])
+        self.assertEqual(table.column('successor').to_pylist(), [[2], [3], [1, 2]])
+        self.assertEqual(table.column('support').to_pylist(), [3, 2, 2])
+
+    @skipUnless(has_pyarrow, 'pyarrow is not installed')
+    def test_arrow(self):
+        import pyarrow as pa
+        filepath = self.write('arrow', RuleSet(self.rules))
+        with pa.memory_map(filepath) as source:
+            table = pa.ipc.open_file(source).read_all()
+        self.assertEqual(table.column('confidence').to_pylist(), [0.75, 1.0, 0.5])
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, RuleWriter, os.path.join(self.tmp_dir.name, 'rules'), 'xlsx')
@@ -0,0 +1,83 @@
+import numpy as np
+from unittest import TestCase
+
+from core.eclat import eclat, frequent_itemsets, get_sample_size, negative_border, sample_itemsets, sampled_min_sup
+from core.SampledSupports import SampledSupports
+from core.VerticalData import VerticalData
+from utils.synthetic import quest_transactions
+
+
+class TestSampling(TestCase):
+
+    def setUp(self):
+        self.transactions = quest_transactions(n_transactions=2000, n_items=40, avg_len=6, seed=3)
+        self.data = VerticalData.from_transactions(self.transactions)
+        self.min_sup = 60
+        self.frequent, self.sup_dict = frequent_itemsets(self.data, self.min_sup)
+
+    def test_vertical_sample(self):
+        tids = [1, 5, 6, 100]
+        sample = self.data.sample(tids)
+        expected = VerticalData.from_transactions(self.transactions[tid] for tid in tids)
+        self.assertEqual(len(sample), 4)
+        self.assertEqual({item: list(tids) for item, tids in sample.tidlists.items()},
+                         {item: list(tids) for item, tids in expected.tidlists.items()})
+
+    def test_sampled_min_sup(self):
+        self.assertLess(sampled_min_sup(99, 10000, 1000), 10)
+        self.assertLessEqual(sampled_min_sup(99, 10000, 1000, confidence=0.99), sampled_min_sup(99, 10000, 1000))
+        self.assertEqual(sampled_min_sup(0, 10000, 100), 0)
+
+    def test_sample_size(self):
+        self.assertEqual(get_sample_size(0.25, 1000), 250)
+        self.assertEqual(get_sample_size(np.float32(0.25), 1000), 250)
+        self.assertEqual(get_sample_size(np.int64(300), 1000), 300)
+        self.assertEqual(get_sample_size(5000, 1000), 1000)
+        for sample in (0, 1.0, 1.5, np.int64(-3), '0.5'):
+            self.assertRaises(ValueError, get_sample_size, sample, 1000)
+
+    def test_estimates(self):
+        frequent, sups = sample_itemsets(self.data, self.min_sup, 0.5, seed=0)
+        self.assertIsInstance(sups, SampledSupports)
+        self.assertEqual(sum(map(len, frequent)), len(sups))
+        self.assertEqual(frequent, sample_itemsets(self.data, self.min_sup, 1000, seed=0)[0])
+        found = set(sups) & set(self.sup_dict)
+        self.assertGreater(len(found), 0.8 * len(self.sup_dict))
+        covered = sum(1 for itemset in found if sups.interval(itemset)[0] <= self.sup_dict[itemset] <=
+                      sups.interval(itemset)[1])
+        self.assertGreater(covered, 0.85 * len(found))
+        for itemset in sups:
+            low, high = sups.interval(itemset)
+            self.assertLessEqual(low, sups[itemset])
+            self.assertLessEqual(sups[itemset], high)
+
+        frequent, sups = sample_itemsets(self.data, self.min_sup, len(self.data), seed=0)
+        self.assertEqual(dict(sups), self.sup_dict)
+        self.assertTrue(all(sups.interval(itemset) == (sup, sup) for itemset, sup in self.sup_dict.items()))
+
+    def test_verify(self):
+        for search, tidlist in [('bfs', 'set'), ('dfs', 'bitset'), ('dfs', 'array')]:
+            frequent, sup_dict = sample_itemsets(self.data, self.min_sup, 0.2, seed=1, verify=True, search=search,
+                                                 tidlist=tidlist)
+            self.assertEqual(sup_dict, self.sup_dict)
+            self.assertEqual(frequent, [sorted(row) for row in self.frequent])
+
+    def test_negative_border(self):
+        sup_dict = {(1,): 3, (2,): 3, (3,): 3, (1, 2): 2, (1, 3): 2}
+        frequent = [[(1,), (2,), (3,)], [(1, 2), (1, 3)]]
+        self.assertEqual(sorted(negative_border(frequent, sup_dict, [1, 2, 3, 4])), [(2, 3), (4,)])
+        self.assertEqual(sorted(negative_border(frequent, sup_dict, [1, 2, 3], frozenset({(2, 3)}))), [])
+        sup_dict[(2, 3)] = 2
+        frequent[1].append((2, 3))
+        self.assertEqual(sorted(negative_border(frequent, sup_dict, [1, 2, 3])), [(1, 2, 3)])
+
+    def test_eclat(self):
+        rules = eclat(self.data, min_sup=self.min_sup, min_conf=0.3, sample=0.5, seed=0)
+        self.assertGreater(len(rules), 0)
+        exact = eclat(self.data, min_sup=self.min_sup, min_conf=0.3)
+        verified = eclat(self.data, min_sup=self.min_sup, min_conf=0.3, sample=0.5, seed=0, verify=True)
+        self.assertEqual(set(verified), set(exact))
+        with self.assertRaises(ValueError):
+            eclat(self.data, min_sup=self.min_sup, sample=0.5, top_k=10)
+        with self.assertRaises(ValueError):
+            eclat(self.data, min_sup=self.min_sup, sample=1.5)
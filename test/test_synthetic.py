@@ -0,0 +1,49 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from core.Taxonomy import Taxonomy
+from utils.data_io import read_transactions
+from utils.synthetic import quest_transactions, random_taxonomy, write_transactions
+
+
+class TestSynthetic(TestCase):
+
+    def test_quest_transactions(self):
+        transactions = quest_transactions(n_transactions=2000, n_items=100, avg_len=8, seed=1)
+        self.assertEqual(len(transactions), 2000)
+        self.assertEqual(transactions, quest_transactions(n_transactions=2000, n_items=100, avg_len=8, seed=1))
+        self.assertNotEqual(transactions, quest_transactions(n_transactions=2000, n_items=100, avg_len=8, seed=2))
+        for transaction in transactions:
+            self.assertGreater(len(transaction), 0)
+            self.assertEqual(transaction, sorted(set(transaction)))
+            self.assertTrue(all(0 <= item < 100 for item in transaction))
+        avg_len = sum(map(len, transactions)) / len(transactions)
+        self.assertAlmostEqual(avg_len, 8, delta=2)
+
+    def test_density(self):
+        transactions = quest_transactions(n_transactions=1000, n_items=50, density=0.3, seed=0)
+        avg_len = sum(map(len, transactions)) / len(transactions)
+        self.assertAlmostEqual(avg_len / 50, 0.3, delta=0.06)
+
+    def test_high_density(self):
+        # 5 patterns supply fewer distinct items than a basket of 90% of the items needs
+        transactions = quest_transactions(n_transactions=200, n_items=50, density=0.9, n_patterns=5, seed=0)
+        avg_len = sum(map(len, transactions)) / len(transactions)
+        self.assertAlmostEqual(avg_len / 50, 0.9, delta=0.06)
+        self.assertTrue(all(len(transaction) <= 50 for transaction in transactions))
+
+    def test_random_taxonomy(self):
+        taxonomy = random_taxonomy(range(100), fanout=10, depth=2)
+        self.assertEqual(len(taxonomy), 100 + 10)
+        tax = Taxonomy.from_dataframe(taxonomy)
+        for item in range(100):
+            self.assertEqual(len(tax.ancestors(item)), 2)
+            self.assertTrue(all(ancestor >= 100 for ancestor in tax.ancestors(item)))
+
+    def test_write_transactions(self):
+        transactions = quest_transactions(n_transactions=100, n_items=20, avg_len=4)
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'transactions.txt')
+            write_transactions(transactions, filepath)
+            self.assertEqual(list(read_transactions(filepath)), transactions)
@@ -0,0 +1,59 @@
+import io
+import pandas as pd
+from unittest import TestCase
+
+from core.eclat import frequent_itemsets, eclat
+from core.AssociationRule import AssociationRule
+from core.Taxonomy import Taxonomy
+from core.VerticalData import VerticalData
+
+
+class TestTaxonomy(TestCase):
+
+    def setUp(self):
+        t = '1,11\n' \
+            '2,11\n' \
+            '3,33\n' \
+            '11,22\n' \
+            '33,22'
+        self.taxonomy_df = pd.read_csv(io.StringIO(t), sep=',', header=None, names=['child', 'parent'])
+        self.taxonomy = Taxonomy.from_dataframe(self.taxonomy_df)
+        self.baskets = [[1, 2], [1, 4], [1, 2, 3], [3, 4], [2]]
+
+    def test_ancestors(self):
+        self.assertEqual(self.taxonomy.ancestors(1), {11, 22})
+        self.assertEqual(self.taxonomy.ancestors(33), {22})
+        self.assertEqual(self.taxonomy.ancestors(4), set())
+        chain = Taxonomy({i: i+1 for i in range(5000)})
+        self.assertEqual(chain.ancestors(0), set(range(1, 5001)))
+
+    def test_generalize(self):
+        data = self.taxonomy.generalize(VerticalData.from_transactions(self.baskets))
+
+        self.assertEqual(data.items(), [1, 2, 3, 4, 11, 22, 33])
+        self.assertEqual(list(data.tidlists[11]), [0, 1, 2, 4])
+        self.assertEqual(list(data.tidlists[22]), [0, 1, 2, 3, 4])
+        self.assertEqual(self.taxonomy.excluded_pairs([1, 4, 22]), frozenset({(1, 22), (22, 1)}))
+
+    def test_eclat_generalized(self):
+        extended = [sorted(set(basket).union(*(self.taxonomy.ancestors(item) for item in basket)))
+                    for basket in self.baskets]
+        _, expected_sup = frequent_itemsets(VerticalData.from_transactions(extended), min_sup=0)
+        expected = {itemset for itemset in expected_sup
+                    if not any(self.taxonomy.ancestors(item) & set(itemset) for item in itemset)}
+        data = self.taxonomy.generalize(VerticalData.from_transactions(self.baskets))
+        for search in ('bfs', 'dfs'):
+            _, sup_dict = frequent_itemsets(data, min_sup=0, search=search,
+                                            excluded=self.taxonomy.excluded_pairs(data.items()))
+            self.assertEqual(sup_dict, {itemset: expected_sup[itemset] for itemset in expected})
+
+        transactions = pd.DataFrame(self.baskets)
+        for kwargs in ({}, {'search': 'dfs', 'diffset': 'on'}, {'reorder': True}):
+            rules = eclat(transactions, self.taxonomy_df, min_sup=0, min_conf=0.0, generalized=True, **kwargs)
+            itemsets = {tuple(sorted(rule._pred + rule._suc)) for rule in rules if rule._conf < 1.0 or
+                        not set(rule._suc) <= self.taxonomy.ancestors(rule._pred[0])}
+
+            self.assertTrue(itemsets <= expected)
+            self.assertIn((4, 11), itemsets)
+            self.assertIn(AssociationRule((1,), (11,), 3, 1.0), rules)
+        self.assertRaises(ValueError, eclat, transactions, generalized=True)
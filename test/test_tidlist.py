@@ -0,0 +1,107 @@
+import io
+import numpy as np
+import pandas as pd
+from unittest import TestCase, mock
+
+from itertools import combinations
+
+from core.eclat import get_tidlists, frequent_itemsets
+from core.PairCounts import PairCounts
+from core.VerticalData import VerticalData
+from core.tidlist import SetTidlist, BitsetTidlist, ArrayTidlist, BOUNDED_CHUNK, get_tidlist
+from utils.synthetic import quest_transactions
+
+
+class TestTidlist(TestCase):
+
+    def test_bitset(self):
+        tidlist1 = BitsetTidlist.from_tids([0, 2, 3, 70], 71)
+        tidlist2 = BitsetTidlist.from_tids([2, 70], 71)
+        self.assertEqual(tidlist1, 1 | 1 << 2 | 1 << 3 | 1 << 70)
+        self.assertEqual(BitsetTidlist.support(tidlist1), 4)
+        self.assertEqual(BitsetTidlist.to_tids(BitsetTidlist.intersect(tidlist1, tidlist2)), [2, 70])
+
+    def test_set(self):
+        tidlist1 = SetTidlist.from_tids([0, 2, 3], 4)
+        tidlist2 = SetTidlist.from_tids([2, 3], 4)
+        self.assertEqual(SetTidlist.intersect(tidlist1, tidlist2), frozenset({2, 3}))
+        self.assertEqual(SetTidlist.support(tidlist1), 3)
+
+    def test_array(self):
+        tids = np.array([0, 2, 3, 70], dtype=np.uint32)
+        tidlist1 = ArrayTidlist.from_tids(tids, 71)
+        tidlist2 = ArrayTidlist.from_tids([2, 70], 71)
+        self.assertIs(tidlist1, tids)
+        self.assertEqual(ArrayTidlist.to_tids(ArrayTidlist.intersect(tidlist1, tidlist2)), [2, 70])
+        self.assertEqual(ArrayTidlist.to_tids(ArrayTidlist.difference(tidlist1, tidlist2)), [0, 3])
+        self.assertEqual(ArrayTidlist.support(tidlist1), 4)
+
+    def test_get_tidlist(self):
+        self.assertIs(get_tidlist('bitset'), BitsetTidlist)
+        self.assertRaises(ValueError, get_tidlist, 'list')
+
+    def test_tidlists_bitset(self):
+        s = '1 2\n' \
+            '1 2\n' \
+            '1 3'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(2))
+        tid_dict, sup_dict = get_tidlists(transactions, 1, tidlist='bitset')
+
+        self.assertEqual(tid_dict, {(1,): 0b111, (2,): 0b011})
+        self.assertEqual(sup_dict, {(1,): 3, (2,): 2})
+
+    def test_frequent_bitset(self):
+        s = '1 2 3\n' \
+            '1 2 3\n' \
+            '1 2\n' \
+            '2 3 4\n' \
+            '1 3 4'
+        file = io.StringIO(s)
+        transactions = pd.read_csv(file, index_col=None, sep=' ', names=range(3))
+        expected = frequent_itemsets(transactions, min_sup=1)
+        for search in ('bfs', 'dfs'):
+            self.assertEqual(frequent_itemsets(transactions, min_sup=1, search=search, tidlist='bitset'), expected)
+
+    def test_intersect_bounded(self):
+        n = 4 * BOUNDED_CHUNK
+        tids1 = np.arange(n, dtype=np.uint32)
+        # the first half of tids1 is missed, so the intersection can be given up halfway
+        tids2 = np.arange(n // 2, 2*n, dtype=np.uint32)
+        for backend in (SetTidlist, BitsetTidlist, ArrayTidlist):
+            tidlist1, tidlist2 = backend.from_tids(tids1, 2*n), backend.from_tids(tids2, 2*n)
+            expected = backend.to_tids(backend.intersect(tidlist1, tidlist2))
+            for min_sup in (0, n // 2 - 1):
+                tidlist = backend.intersect_bounded(tidlist1, tidlist2, min_sup)
+                self.assertEqual(sorted(backend.to_tids(tidlist)), expected)
+            if backend is not BitsetTidlist:
+                self.assertIsNone(backend.intersect_bounded(tidlist1, tidlist2, n // 2))
+            self.assertEqual(backend.to_tids(backend.intersect_bounded(tidlist1, backend.from_tids([], 2*n), 0)), [])
+
+    def test_pair_counts(self):
+        transactions = quest_transactions(n_transactions=300, n_items=20, avg_len=5)
+        tid_dict, _ = get_tidlists(VerticalData.from_transactions(transactions), 0)
+        pairs = PairCounts.from_tidlists(tid_dict, SetTidlist)
+        items = [itemset[0] for itemset in tid_dict]
+        for item1, item2 in combinations(items, 2):
+            expected = sum(item1 in transaction and item2 in transaction for transaction in transactions)
+            self.assertEqual(pairs[item1, item2], expected)
+            self.assertEqual(pairs[item2, item1], expected)
+        self.assertEqual(pairs.supports(items[3], items[:3] + items[4:6]),
+                         [pairs[items[3], item] for item in items[:3] + items[4:6]])
+        self.assertIsNone(PairCounts.from_tidlists(tid_dict, SetTidlist, max_pairs=10))
+
+    def test_pair_counts_ranges(self):
+        data = VerticalData.from_transactions(quest_transactions(n_transactions=300, n_items=20, avg_len=5))
+        expected = PairCounts.from_tidlists(get_tidlists(data, 0)[0], SetTidlist).counts
+        for name in ('set', 'bitset', 'array'):
+            tid_dict, _ = get_tidlists(data, 0, name)
+            with mock.patch('core.PairCounts.CHUNK_TIDS', 50):
+                self.assertEqual(PairCounts.from_tidlists(tid_dict, get_tidlist(name)).counts, expected)
+
+    def test_frequent_pair_counts(self):
+        data = VerticalData.from_transactions(quest_transactions(n_transactions=500, n_items=40, avg_len=6))
+        expected = frequent_itemsets(data, 5, pair_counts=False)
+        for kwargs in [dict(search='bfs'), dict(search='dfs', tidlist='bitset'), dict(search='dfs', tidlist='array'),
+                       dict(search='dfs', diffset='auto'), dict(search='dfs', n_jobs=2)]:
+            self.assertEqual(frequent_itemsets(data, 5, **kwargs), expected)
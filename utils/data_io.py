@@ -3,10 +3,19 @@ import time
 import pathlib
 import pandas as pd
 from enum import Enum
+from typing import Iterable, Union
 
 from core.AssociationRule import AssociationRule
+from core.RuleSet import RuleSet
+from utils.rule_writer import RuleWriter, DEFAULT_BATCH_SIZE
+from core.VerticalData import VerticalData
+from core.MappedVerticalData import MappedVerticalData
+from core.MiningMonitor import logger, peak_rss
+from utils.readers import read_transactions, read_vertical, open_text
 
 
+VDB_SUFFIX = '.vdb'
+
 data_dir = os.path.join(pathlib.Path(__file__).parent.parent, 'data')
 output_dir = os.path.join(pathlib.Path(__file__).parent.parent, 'output')
 
@@ -18,7 +27,17 @@ class Dataset(Enum):
     Liquor = 2
 
 
-def load_predefined(dataset: Dataset) -> tuple[pd.DataFrame, pd.DataFrame]:
+def load_predefined(dataset: Dataset, loader: str = 'pandas', min_sup: int = None) -> \
+        tuple[Union[pd.DataFrame, VerticalData], pd.DataFrame]:
+    filepath, tax_filepath = predefined_paths(dataset)
+    transactions, taxonomy = load_dataset(filepath, tax_filepath, loader, min_sup)
+    return transactions, taxonomy
+
+
+def predefined_paths(dataset: Dataset) -> tuple[str, str]:
+    """
+    Paths to the transactions and taxonomy files of a predefined dataset.
+    """
     if dataset == Dataset.Test:
         filepath = os.path.join(data_dir, 'test/test.txt')
         tax_filepath = os.path.join(data_dir, 'test/taxonomy.txt')
@@ -33,19 +52,39 @@ def load_predefined(dataset: Dataset) -> tuple[pd.DataFrame, pd.DataFrame]:
         tax_filepath = os.path.join(data_dir, 'liquor/taxonomy.txt')
     else:
         raise ValueError(f'Dataset "{dataset}" not found.')
-
-    transactions, taxonomy = load_dataset(filepath, tax_filepath)
-    return transactions, taxonomy
-
-
-def load_dataset(filepath: str, taxonomy_path: str = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return filepath, tax_filepath
+
+
+def load_dataset(filepath: str, taxonomy_path: str = None, loader: str = 'pandas', min_sup: int = None,
+                 input_format: str = 'txt') -> tuple[Union[pd.DataFrame, VerticalData], pd.DataFrame]:
+    """
+    Load transactions and optional taxonomy.
+
+    :param filepath: Path to the file with transactions in input_format.
+    :param taxonomy_path: Path to the file with child,parent pairs.
+    :param loader: 'pandas' - transactions are loaded to a wide DataFrame,
+        'stream' - the file is streamed line by line straight to vertical format,
+        'mmap' - the file is converted once to a binary vertical database next to it, which is memory-mapped.
+    :param min_sup: Items with support not greater than min_sup are dropped by the 'stream' and 'mmap' loaders.
+    :param input_format: One of utils.readers.INPUT_FORMATS. Formats other than 'txt' are always read
+        straight to vertical format without an intermediate DataFrame, 'pandas' loader reads them as 'stream'.
+    """
     start_time = time.time()
-    transactions = load_dataframe(filepath)
+    if loader == 'pandas' and input_format != 'txt':
+        loader = 'stream'
+    if loader == 'pandas':
+        transactions = load_dataframe(filepath)
+    elif loader == 'stream':
+        transactions = load_vertical(filepath, min_sup, input_format)
+    elif loader == 'mmap':
+        transactions = load_mapped(filepath, min_sup, input_format)
+    else:
+        raise ValueError(f'Loader "{loader}" not found.')
     taxonomy = None
     if taxonomy_path:
         taxonomy = load_dataframe(taxonomy_path, is_taxonomy=True)
-    print(f'\nDataset loaded - number of transactions: {len(transactions.index)}.'
-          f'\nCompleted in {time.time()-start_time:.4f} sec.')
+    logger.info(f'\nDataset loaded - number of transactions: {len(transactions)}.'
+                f'\nCompleted in {time.time()-start_time:.4f} sec.{peak_memory_info()}')
     return transactions, taxonomy
 
 
@@ -60,9 +99,51 @@ def load_dataframe(filepath: str, is_taxonomy: bool = False) -> pd.DataFrame:
     return dataframe
 
 
+def load_vertical(filepath: str, min_sup: int = None, input_format: str = 'txt') -> VerticalData:
+    """
+    Stream transactions from file straight to vertical format without building a DataFrame.
+    """
+    return read_vertical(filepath, input_format, min_sup)
+
+
+def load_mapped(filepath: str, min_sup: int = None, input_format: str = 'txt') -> VerticalData:
+    """
+    Memory-map the binary vertical database of a transactions file, building it first if it is missing or outdated.
+
+    :param filepath: Path to the file with transactions in input_format or to a binary vertical database (.vdb).
+    :param min_sup: If given, items with support not greater than min_sup are dropped.
+    :param input_format: One of utils.readers.INPUT_FORMATS.
+    """
+    vdb_path = filepath if filepath.endswith(VDB_SUFFIX) else filepath + VDB_SUFFIX
+    if vdb_path != filepath and (not os.path.exists(vdb_path) or
+                                 os.path.getmtime(vdb_path) < os.path.getmtime(filepath)):
+        build_mapped(filepath, vdb_path, input_format)
+    data = MappedVerticalData(vdb_path)
+    if min_sup is not None:
+        data = data.filter(min_sup)
+    return data
+
+
+def build_mapped(filepath: str, vdb_path: str, input_format: str = 'txt') -> None:
+    """
+    Convert a file with transactions to a binary vertical database.
+    """
+    start_time = time.time()
+    MappedVerticalData.write(lambda: read_transactions(filepath, input_format), vdb_path)
+    logger.info(f'\nVertical database built - {vdb_path}.'
+                f'\nCompleted in {time.time()-start_time:.4f} sec.')
+
+
+def peak_memory_info() -> str:
+    peak = peak_rss()
+    if peak is None:
+        return ''
+    return f'\nPeak memory usage: {peak/2**20:.1f} MB.'
+
+
 def find_longest(filepath: str) -> int:
     max_len = 0
-    with open(filepath, newline='') as f:
+    with open_text(filepath) as f:
         for line in f:
             transaction = line.split()
             max_len = max(max_len, len(transaction))
@@ -76,15 +157,20 @@ def display_files() -> None:
             print(os.path.join(dirname, filename))
 
 
-def save_rules(rules: list[AssociationRule], filename: str = f'results_{time.strftime("%Y%m%d-%H%M%S")}.csv'):
-    filepath = os.path.join(output_dir, filename)
-    with open(filepath, 'w') as f:
-        f.write(';'.join(['predecessor', 'successor', 'support', 'confidence']) + '\n')
-        for rule in rules:
-            f.writelines(rule.csv_format())
-
-
-def save_test(result: pd.DataFrame, test_type: str):
-    filename = f'test_{test_type}_{time.strftime("%Y%m%d-%H%M%S")}.csv'
+def save_rules(rules: Union[RuleSet, Iterable[AssociationRule]], filename: str = None, output_format: str = 'csv',
+               batch_size: int = DEFAULT_BATCH_SIZE, measures: tuple = ()) -> int:
+    """
+    Write rules to output directory as they are consumed.
+
+    :param rules: RuleSet, list or lazy iterator of rules.
+    :param filename: Name of the output file, by default results_<timestamp>.<output_format>.
+    :param output_format: One of utils.rule_writer.OUTPUT_FORMATS.
+    :param batch_size: Number of rules formatted and written at once.
+    :param measures: Names of interestingness measures written as extra columns, see core.measures.MEASURES.
+    :return: Number of rules written.
+    """
+    if filename is None:
+        filename = f'results_{time.strftime("%Y%m%d-%H%M%S")}.{output_format}'
     filepath = os.path.join(output_dir, filename)
-    result.to_csv(filepath)
+    with RuleWriter(filepath, output_format, batch_size, measures) as writer:
+        return writer.write(rules)
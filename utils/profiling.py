@@ -0,0 +1,60 @@
+import io
+import os
+import time
+import json
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+from core.MiningMonitor import MiningMonitor
+
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+TOP_ENTRIES = 20
+
+
+@contextmanager
+def profiled(mode: str, output_dir: str) -> Iterator[None]:
+    """
+    Profile the enclosed code and print a summary of where it spent its time or memory.
+
+    :param mode: 'cprofile' - function call statistics, also dumped to profile_<timestamp>.prof in output_dir
+        for pstats or snakeviz, 'tracemalloc' - peak traced memory and lines that allocated the most of it.
+    :param output_dir: Directory of the dumped profile.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f'Parameter mode should be one of {PROFILE_MODES} but "{mode}" was passed.')
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(output_dir, exist_ok=True)
+            filepath = os.path.join(output_dir, f'profile_{time.strftime("%Y%m%d-%H%M%S")}.prof')
+            profiler.dump_stats(filepath)
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(TOP_ENTRIES)
+            print(f'\nProfile saved - {filepath}.\n{stream.getvalue()}')
+    else:
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'\nPeak traced memory: {peak/2**20:.1f} MB. Largest allocations still alive:')
+            for stat in snapshot.statistics('lineno')[:TOP_ENTRIES]:
+                print(stat)
+
+
+def save_stats(monitor: MiningMonitor, filepath: str) -> None:
+    """
+    Write the phase and level records of monitor to a JSON file.
+    """
+    with open(filepath, 'w') as f:
+        json.dump({'phases': monitor.phases, 'levels': monitor.levels}, f, indent=2)
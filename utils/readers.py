@@ -0,0 +1,132 @@
+import io
+import gzip
+import importlib
+import numpy as np
+from typing import Iterator, TextIO
+
+from core.VerticalData import VerticalData
+
+
+INPUT_FORMATS = ('txt', 'spmf', 'csv', 'parquet')
+LONG_FORMATS = ('csv', 'parquet')
+TRANSACTION_COLUMN = 'transaction_id'
+ITEM_COLUMN = 'item'
+QUANTITY_COLUMN = 'quantity'
+SPMF_COMMENTS = ('@', '#', '%')
+
+
+def read_transactions(filepath: str, input_format: str = 'txt') -> Iterator[list[int]]:
+    """
+    Read transactions one by one, each as a list of item ids.
+
+    :param filepath: Path to the file, text formats may be gzip compressed (.gz).
+    :param input_format: One of INPUT_FORMATS:
+        'txt' - space separated item ids, one transaction per line,
+        'spmf' - SPMF transaction database, optionally with utilities (items:total utility:item utilities),
+        'csv', 'parquet' - long format with a transaction_id,item row per item and an optional quantity column,
+        see read_pairs.
+    """
+    check_format(input_format)
+    if input_format == 'txt':
+        return read_text(filepath)
+    if input_format == 'spmf':
+        return read_spmf(filepath)
+    return pairs_to_transactions(*read_pairs(filepath, input_format))
+
+
+def read_vertical(filepath: str, input_format: str = 'txt', min_sup: int = None) -> VerticalData:
+    """
+    Read transactions straight to vertical format, long formats are grouped by item in numpy.
+    """
+    check_format(input_format)
+    if input_format in LONG_FORMATS:
+        return VerticalData.from_pairs(*read_pairs(filepath, input_format), min_sup)
+    return VerticalData.from_transactions(read_transactions(filepath, input_format), min_sup)
+
+
+def read_text(filepath: str) -> Iterator[list[int]]:
+    with open_text(filepath) as f:
+        for line in f:
+            transaction = line.split()
+            if transaction:
+                yield list(map(int, transaction))
+
+
+def read_spmf(filepath: str) -> Iterator[list[int]]:
+    """
+    Read an SPMF transaction database, skipping metadata and comment lines.
+
+    In the utility format "1 3 4:9:1 3 5" items are followed by the total utility of the transaction
+    and utilities (quantities) of the items, items with utility not greater than zero are left out.
+    """
+    with open_text(filepath) as f:
+        for line in f:
+            if line.startswith(SPMF_COMMENTS):
+                continue
+            fields = line.split(':')
+            transaction = list(map(int, fields[0].split()))
+            if len(fields) == 3:
+                utilities = fields[2].split()
+                transaction = [item for item, utility in zip(transaction, utilities) if float(utility) > 0]
+            if transaction:
+                yield transaction
+
+
+def read_pairs(filepath: str, input_format: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read (transaction id, item) pairs of a long format file with pyarrow.
+
+    The file has columns transaction_id and item and an optional quantity column, rows with quantity
+    not greater than zero, e.g. returns, are left out. A gzip compressed csv (.csv.gz) is decompressed on the fly.
+
+    :return: Arrays of transaction ids and item ids.
+    """
+    if input_format == 'csv':
+        csv = import_optional('pyarrow.csv', input_format)
+        table = csv.read_csv(filepath)
+    elif input_format == 'parquet':
+        pq = import_optional('pyarrow.parquet', input_format)
+        names = pq.read_schema(filepath).names
+        table = pq.read_table(filepath, columns=[name for name in (TRANSACTION_COLUMN, ITEM_COLUMN, QUANTITY_COLUMN)
+                                                 if name in names])
+    else:
+        raise ValueError(f'Parameter input_format should be one of {LONG_FORMATS} but "{input_format}" was passed.')
+    for name in (TRANSACTION_COLUMN, ITEM_COLUMN):
+        if name not in table.column_names:
+            raise ValueError(f'Column "{name}" not found in {filepath}. Columns: {", ".join(table.column_names)}.')
+    tids = table.column(TRANSACTION_COLUMN).to_numpy(zero_copy_only=False)
+    items = table.column(ITEM_COLUMN).to_numpy(zero_copy_only=False)
+    if QUANTITY_COLUMN in table.column_names:
+        kept = table.column(QUANTITY_COLUMN).to_numpy(zero_copy_only=False) > 0
+        tids, items = tids[kept], items[kept]
+    return tids, items
+
+
+def pairs_to_transactions(tids: np.ndarray, items: np.ndarray) -> Iterator[list[int]]:
+    """
+    Group (transaction id, item) pairs to transactions in ascending order of transaction ids.
+    """
+    order = np.argsort(tids, kind='stable')
+    tids, items = tids[order], items[order]
+    starts = np.flatnonzero(np.r_[True, tids[1:] != tids[:-1]]) if len(tids) > 0 else []
+    for transaction in np.split(items, starts[1:]):
+        if len(transaction) > 0:
+            yield transaction.tolist()
+
+
+def open_text(filepath: str) -> TextIO:
+    if filepath.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(filepath, 'rb'), newline='')
+    return open(filepath, newline='')
+
+
+def check_format(input_format: str) -> None:
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f'Input format "{input_format}" not found. Possible values: {", ".join(INPUT_FORMATS)}.')
+
+
+def import_optional(module: str, input_format: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f'Input format "{input_format}" requires {module.split(".")[0]} package.') from None
@@ -0,0 +1,138 @@
+import io
+import gzip
+import importlib
+import numpy as np
+from typing import Iterable, Iterator, Union
+
+from core.AssociationRule import AssociationRule
+from core.RuleBatches import RuleBatches
+from core.RuleSet import RuleSet, csv_header
+
+
+OUTPUT_FORMATS = ('csv', 'csv.gz', 'csv.zst', 'parquet', 'arrow')
+DEFAULT_BATCH_SIZE = 100000
+
+
+class RuleWriter:
+    """
+    Write rules to a file in batches as they are produced.
+
+    Possible formats: 'csv', 'csv.gz' and 'csv.zst' (requires zstandard) write the same
+    semicolon separated text as save_rules, 'parquet' and 'arrow' (Arrow IPC file, both require pyarrow)
+    write columns predecessor (list of items), successor (list of items), support and confidence.
+    Interestingness measures, e.g. ('lift',), are written as additional float columns, NaN for rules without them.
+    """
+    def __init__(self, filepath: str, output_format: str = 'csv', batch_size: int = DEFAULT_BATCH_SIZE,
+                 measures: tuple = ()):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f'Output format "{output_format}" not found. '
+                             f'Possible values: {", ".join(OUTPUT_FORMATS)}.')
+        self.filepath = filepath
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.measures = tuple(measures)
+        self.n_rules = 0
+        self._stream = None
+        self._arrow_writer = None
+        if output_format in ('parquet', 'arrow'):
+            self._open_arrow()
+        else:
+            self._open_csv()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, rules: Union[RuleSet, Iterable[AssociationRule]]) -> int:
+        """
+        Consume rules and write them in batches of batch_size.
+
+        :return: Number of rules written.
+        """
+        n_rules = self.n_rules
+        for batch in iter_batches(rules, self.batch_size):
+            self.write_batch(batch)
+        return self.n_rules - n_rules
+
+    def write_batch(self, batch: RuleSet) -> None:
+        if len(batch) == 0:
+            return
+        batch = batch.select_measures(self.measures)
+        if self._arrow_writer is not None:
+            self._arrow_writer.write_batch(to_record_batch(batch, self.measures))
+        else:
+            self._stream.write(''.join(batch.csv_lines()))
+        self.n_rules += len(batch)
+
+    def close(self) -> None:
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+            self._arrow_writer = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _open_csv(self) -> None:
+        if self.output_format == 'csv':
+            self._stream = open(self.filepath, 'w', newline='')
+        elif self.output_format == 'csv.gz':
+            self._stream = gzip.open(self.filepath, 'wt', compresslevel=6, newline='')
+        else:
+            zstd = import_optional('zstandard', self.output_format)
+            binary = open(self.filepath, 'wb')
+            compressed = zstd.ZstdCompressor().stream_writer(binary, closefd=True)
+            self._stream = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+        self._stream.write(csv_header(self.measures))
+
+    def _open_arrow(self) -> None:
+        pa = import_optional('pyarrow', self.output_format)
+        if self.output_format == 'parquet':
+            pq = import_optional('pyarrow.parquet', self.output_format)
+            self._arrow_writer = pq.ParquetWriter(self.filepath, arrow_schema(pa, self.measures))
+        else:
+            self._arrow_writer = pa.ipc.new_file(self.filepath, arrow_schema(pa, self.measures))
+
+
+def iter_batches(rules: Union[RuleSet, Iterable[AssociationRule]], batch_size: int) -> Iterator[RuleSet]:
+    if isinstance(rules, RuleBatches):
+        for batch in rules.batches():
+            yield from iter_batches(batch, batch_size)
+        return
+    if isinstance(rules, RuleSet):
+        for start in range(0, len(rules), batch_size):
+            yield rules.take(np.arange(start, min(start+batch_size, len(rules))))
+        return
+    batch = RuleSet()
+    for rule in rules:
+        batch.add(rule)
+        if len(batch) == batch_size:
+            yield batch
+            batch = RuleSet()
+    if len(batch) > 0:
+        yield batch
+
+
+def arrow_schema(pa, measures: tuple = ()):
+    return pa.schema([('predecessor', pa.list_(pa.int64())),
+                      ('successor', pa.list_(pa.int64())),
+                      ('support', pa.int64()),
+                      ('confidence', pa.float64())] +
+                     [(name, pa.float64()) for name in measures])
+
+
+def to_record_batch(batch: RuleSet, measures: tuple = ()):
+    pa = import_optional('pyarrow', 'arrow')
+    pred = pa.ListArray.from_arrays(pa.array(batch.pred_offsets, pa.int32()), pa.array(batch.pred_items))
+    suc = pa.ListArray.from_arrays(pa.array(batch.suc_offsets, pa.int32()), pa.array(batch.suc_items))
+    columns = [pred, suc, pa.array(batch.support), pa.array(batch.confidence)]
+    columns.extend(pa.array(batch.measures[name]) for name in measures)
+    return pa.RecordBatch.from_arrays(columns, schema=arrow_schema(pa, measures))
+
+
+def import_optional(module: str, output_format: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f'Output format "{output_format}" requires {module.split(".")[0]} package.') from None
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+
+MAX_DRAWS = 10
+
+
+def quest_transactions(n_transactions: int = 10000, n_items: int = 1000, avg_len: float = 10,
+                       n_patterns: int = 200, avg_pattern_len: float = 4, correlation: float = 0.5,
+                       corruption: float = 0.5, density: float = None, seed: int = 0) -> list[list[int]]:
+    """
+    Generate baskets in the style of the IBM Quest generator.
+
+    Transactions are built from a pool of potentially frequent patterns picked with exponentially
+    distributed weights, so the data has itemsets frequent at many levels of support, unlike uniform noise.
+    Lengths are clipped to n_items and once MAX_DRAWS patterns per item of a transaction do not fill it,
+    the rest is filled with uniformly random items.
+
+    :param n_transactions: Number of transactions.
+    :param n_items: Number of distinct items, ids are 0..n_items-1.
+    :param avg_len: Average length of a transaction (Poisson distributed).
+    :param n_patterns: Number of potentially frequent patterns.
+    :param avg_pattern_len: Average length of a pattern (Poisson distributed).
+    :param correlation: Average fraction of items a pattern shares with the previous one.
+    :param corruption: Average probability of dropping items of a pattern put into a transaction.
+    :param density: If given, average fraction of all items in a transaction, overrides avg_len.
+    :param seed: Seed of the random generator, the same parameters and seed give the same transactions.
+    :return: Transactions as ascending lists of item ids.
+    """
+    rng = np.random.default_rng(seed)
+    if density is not None:
+        avg_len = density * n_items
+    patterns = []
+    for _ in range(n_patterns):
+        size = min(max(1, rng.poisson(avg_pattern_len)), n_items)
+        items = set()
+        if patterns:
+            n_shared = min(int(rng.exponential(correlation) * size), size, len(patterns[-1]))
+            items.update(rng.choice(patterns[-1], n_shared, replace=False).tolist())
+        while len(items) < size:
+            items.add(int(rng.integers(n_items)))
+        patterns.append(np.array(sorted(items)))
+    weights = np.cumsum(rng.exponential(1.0, n_patterns))
+    weights /= weights[-1]
+    corruptions = np.clip(rng.normal(corruption, 0.1, n_patterns), 0.0, 1.0)
+
+    transactions = []
+    for size in np.clip(rng.poisson(avg_len, n_transactions), 1, n_items).tolist():
+        transaction = set()
+        n_draws = 0
+        while len(transaction) < size:
+            if n_draws == MAX_DRAWS * size:
+                # patterns cannot supply enough distinct items, e.g. at a high density
+                others = np.setdiff1d(np.arange(n_items), np.fromiter(transaction, dtype=np.int64))
+                transaction.update(rng.choice(others, size - len(transaction), replace=False).tolist())
+                break
+            n_draws += 1
+            i = min(int(weights.searchsorted(rng.random())), n_patterns - 1)
+            pattern = patterns[i]
+            kept = pattern[rng.random(len(pattern)) >= corruptions[i]].tolist()
+            if transaction and len(transaction) + len(kept) > size and rng.random() < 0.5:
+                break
+            transaction.update(kept)
+        transactions.append(sorted(transaction))
+    return transactions
+
+
+def random_taxonomy(items: Iterable[int], fanout: int = 10, depth: int = 2, seed: int = 0) -> pd.DataFrame:
+    """
+    Taxonomy with depth levels of categories above items, every category having about fanout children.
+
+    Categories get ids above the largest item id.
+    """
+    rng = np.random.default_rng(seed)
+    level = sorted(items)
+    next_id = max(level, default=-1) + 1
+    children = []
+    parents = []
+    for _ in range(depth):
+        n_parents = max(1, len(level) // fanout)
+        assignment = rng.integers(n_parents, size=len(level))
+        children.extend(level)
+        parents.extend((assignment + next_id).tolist())
+        level = list(range(next_id, next_id + n_parents))
+        next_id += n_parents
+    return pd.DataFrame({'child': children, 'parent': parents})
+
+
+def write_transactions(transactions: Iterable[Iterable[int]], filepath: str) -> None:
+    """
+    Write transactions in the text format of load_dataset, space separated item ids, one transaction per line.
+    """
+    with open(filepath, 'w') as f:
+        for transaction in transactions:
+            f.write(' '.join(map(str, transaction)) + '\n')